@@ -2,35 +2,108 @@
 """
 SQLite 기반 키워드 추출 결과 캐시 매니저
 시작일자, 끝일자, 기관명을 복합 키로 사용하여 결과를 캐시합니다.
+스레드마다 연결을 하나씩 재사용하고(WAL 모드), 캐시 히트의 접근 통계는
+메모리에 모았다가 백그라운드에서 한 번에 기록하므로 조회 경로는 읽기만 합니다.
 """
 
 import sqlite3
 import json
 import os
 import logging
+import threading
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import hashlib
 
 logger = logging.getLogger(__name__)
 
+# 접근 통계 기록 주기 (초)
+ACCESS_FLUSH_SECONDS = float(os.getenv('CACHE_ACCESS_FLUSH_SECONDS', '5'))
+
+# 연결당 보관할 준비된 문장(prepared statement) 수
+STATEMENT_CACHE_SIZE = 64
+
+# 잠금 대기 시간 (밀리초)
+BUSY_TIMEOUT_MS = 5000
+
+# 자주 쓰는 SQL (같은 문자열을 재사용해야 연결의 문장 캐시에서 재사용됨)
+SELECT_RESULT_SQL = "SELECT result_data, access_count FROM keyword_cache WHERE cache_key = ?"
+INSERT_RESULT_SQL = """
+    INSERT OR IGNORE INTO keyword_cache
+    (cache_key, company_name, start_date, end_date, top_keywords,
+     use_ai_filter, result_data, created_at, accessed_at, access_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1)
+"""
+# 사전 계산 결과는 같은 키의 이전 결과(원본 수집 전에 계산된 결과 등)를 덮어씀 (접근 통계는 유지)
+REPLACE_RESULT_SQL = """
+    INSERT INTO keyword_cache
+    (cache_key, company_name, start_date, end_date, top_keywords,
+     use_ai_filter, result_data, created_at, accessed_at, access_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 0)
+    ON CONFLICT(cache_key) DO UPDATE SET result_data = excluded.result_data, created_at = CURRENT_TIMESTAMP
+"""
+UPDATE_ACCESS_SQL = """
+    UPDATE keyword_cache
+    SET accessed_at = MAX(accessed_at, ?), access_count = access_count + ?
+    WHERE cache_key = ?
+"""
+
 class CacheManager:
     """SQLite 기반 캐시 매니저"""
     
-    def __init__(self, db_path: str = "keyword_cache.db"):
+    def __init__(self, db_path: str = "keyword_cache.db", flush_interval: Optional[float] = None):
         """
         캐시 매니저 초기화
         
         Args:
             db_path: SQLite 데이터베이스 파일 경로
+            flush_interval: 접근 통계 기록 주기 (기본값: CACHE_ACCESS_FLUSH_SECONDS 또는 5초)
         """
         self.db_path = db_path
+        self.flush_interval = flush_interval if flush_interval is not None else ACCESS_FLUSH_SECONDS
+        
+        # 스레드별 연결 (종료 시 모두 닫기 위해 목록도 보관)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        
+        # 기록 대기 중인 접근 통계: cache_key → (증가할 접근 횟수, 마지막 접근 시각)
+        self._pending_access: Dict[str, Tuple[int, str]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        
         self.init_database()
+        
+        # 접근 통계 백그라운드 기록 스레드
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_loop, name="cache-access-flush", daemon=True)
+        self._flush_thread.start()
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 반환 (없으면 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 종료 시 다른 스레드에서 닫을 수 있도록 check_same_thread=False (사용은 생성한 스레드에서만)
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
     
     def init_database(self):
         """데이터베이스 테이블 초기화"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            conn = self._get_connection()
+            with conn:
                 cursor = conn.cursor()
                 
                 # 키워드 캐시 테이블 생성
@@ -58,14 +131,13 @@ class CacheManager:
                     CREATE INDEX IF NOT EXISTS idx_company_date ON keyword_cache(company_name, start_date, end_date)
                 """)
                 
-                conn.commit()
-                logger.info(f"✅ 캐시 데이터베이스 초기화 완료: {self.db_path}")
-                
+                logger.info(f"✅ 캐시 데이터베이스 초기화 완료: {self.db_path} (WAL 모드)")
+        
         except Exception as e:
             logger.error(f"❌ 캐시 데이터베이스 초기화 실패: {e}")
             raise
     
-    def _generate_cache_key(self, company_name: str, start_date: str, end_date: str, 
+    def _generate_cache_key(self, company_name: str, start_date: str, end_date: str,
                            top_keywords: int, use_ai_filter: bool) -> str:
         """
         캐시 키 생성 (복합 키의 해시값)
@@ -76,14 +148,66 @@ class CacheManager:
             end_date: 끝일자
             top_keywords: 상위 키워드 개수
             use_ai_filter: AI 필터링 사용 여부
-            
+        
         Returns:
             캐시 키 (해시값)
         """
         key_string = f"{company_name}|{start_date}|{end_date}|{top_keywords}|{use_ai_filter}"
         return hashlib.md5(key_string.encode('utf-8')).hexdigest()
     
-    def get_cached_result(self, company_name: str, start_date: str, end_date: str, 
+    def _record_access(self, cache_key: str) -> int:
+        """
+        캐시 히트를 메모리에 기록 (DB 기록은 백그라운드에서 일괄 처리)
+        
+        Returns:
+            아직 기록되지 않은 접근 횟수
+        """
+        # SQLite CURRENT_TIMESTAMP와 같은 UTC 'YYYY-MM-DD HH:MM:SS' 형식
+        accessed_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        with self._pending_lock:
+            count, _ = self._pending_access.get(cache_key, (0, accessed_at))
+            self._pending_access[cache_key] = (count + 1, accessed_at)
+            return count + 1
+    
+    def flush_access_stats(self) -> int:
+        """
+        대기 중인 접근 통계를 한 트랜잭션으로 기록
+        
+        Returns:
+            기록된 캐시 항목 개수
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                if not self._pending_access:
+                    return 0
+                pending = self._pending_access
+                self._pending_access = {}
+            
+            try:
+                conn = self._get_connection()
+                with conn:
+                    conn.executemany(UPDATE_ACCESS_SQL, [
+                        (accessed_at, count, cache_key)
+                        for cache_key, (count, accessed_at) in pending.items()
+                    ])
+                logger.debug(f"캐시 접근 통계 기록: {len(pending)}개 항목")
+                return len(pending)
+            
+            except Exception as e:
+                # 기록 실패 시 다음 주기에 다시 시도하도록 되돌림
+                with self._pending_lock:
+                    for cache_key, (count, accessed_at) in pending.items():
+                        newer_count, newer_at = self._pending_access.get(cache_key, (0, accessed_at))
+                        self._pending_access[cache_key] = (count + newer_count, max(accessed_at, newer_at))
+                logger.error(f"❌ 캐시 접근 통계 기록 실패: {e}")
+                return 0
+    
+    def _flush_loop(self):
+        """접근 통계 주기적 기록 (백그라운드 스레드)"""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush_access_stats()
+    
+    def get_cached_result(self, company_name: str, start_date: str, end_date: str,
                          top_keywords: int, use_ai_filter: bool) -> Optional[Dict[str, Any]]:
         """
         캐시된 결과 조회
@@ -94,51 +218,38 @@ class CacheManager:
             end_date: 끝일자
             top_keywords: 상위 키워드 개수
             use_ai_filter: AI 필터링 사용 여부
-            
+        
         Returns:
             캐시된 결과 데이터 또는 None
         """
         try:
-            cache_key = self._generate_cache_key(company_name, start_date, end_date, 
+            cache_key = self._generate_cache_key(company_name, start_date, end_date,
                                                top_keywords, use_ai_filter)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # 캐시 조회
-                cursor.execute("""
-                    SELECT result_data, access_count FROM keyword_cache 
-                    WHERE cache_key = ?
-                """, (cache_key,))
+            # 캐시 조회 (읽기만 수행, 쓰기 잠금을 잡지 않음)
+            result = self._get_connection().execute(SELECT_RESULT_SQL, (cache_key,)).fetchone()
+            
+            if result:
+                # 접근 시간 및 횟수는 메모리에 모았다가 일괄 기록
+                pending_count = self._record_access(cache_key)
                 
-                result = cursor.fetchone()
+                # JSON 데이터 파싱
+                cached_data = json.loads(result[0])
+                access_count = result[1] + pending_count
                 
-                if result:
-                    # 접근 시간 및 횟수 업데이트
-                    cursor.execute("""
-                        UPDATE keyword_cache 
-                        SET accessed_at = CURRENT_TIMESTAMP, access_count = access_count + 1
-                        WHERE cache_key = ?
-                    """, (cache_key,))
-                    
-                    conn.commit()
-                    
-                    # JSON 데이터 파싱
-                    cached_data = json.loads(result[0])
-                    access_count = result[1] + 1
-                    
-                    logger.info(f"🎯 캐시 히트: {company_name} ({start_date}-{end_date}) - 접근횟수: {access_count}")
-                    return cached_data
-                else:
-                    logger.info(f"❌ 캐시 미스: {company_name} ({start_date}-{end_date})")
-                    return None
-                    
+                logger.info(f"🎯 캐시 히트: {company_name} ({start_date}-{end_date}) - 접근횟수: {access_count}")
+                return cached_data
+            else:
+                logger.info(f"❌ 캐시 미스: {company_name} ({start_date}-{end_date})")
+                return None
+        
         except Exception as e:
             logger.error(f"❌ 캐시 조회 실패: {e}")
             return None
     
-    def save_result(self, company_name: str, start_date: str, end_date: str, 
-                   top_keywords: int, use_ai_filter: bool, result_data: Dict[str, Any]) -> bool:
+    def save_result(self, company_name: str, start_date: str, end_date: str,
+                   top_keywords: int, use_ai_filter: bool, result_data: Dict[str, Any],
+                   replace: bool = False) -> bool:
         """
         결과를 캐시에 저장
         
@@ -149,38 +260,32 @@ class CacheManager:
             top_keywords: 상위 키워드 개수
             use_ai_filter: AI 필터링 사용 여부
             result_data: 저장할 결과 데이터
-            
+            replace: 같은 키가 있으면 덮어쓰기 (기본값: 무시)
+        
         Returns:
             저장 성공 여부
         """
         try:
-            cache_key = self._generate_cache_key(company_name, start_date, end_date, 
+            cache_key = self._generate_cache_key(company_name, start_date, end_date,
                                                top_keywords, use_ai_filter)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # JSON 데이터 직렬화
-                json_data = json.dumps(result_data, ensure_ascii=False, indent=2)
-                
-                # 캐시 저장 (중복 시 무시)
-                cursor.execute("""
-                    INSERT OR IGNORE INTO keyword_cache 
-                    (cache_key, company_name, start_date, end_date, top_keywords, 
-                     use_ai_filter, result_data, created_at, accessed_at, access_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1)
-                """, (cache_key, company_name, start_date, end_date, top_keywords, 
-                      use_ai_filter, json_data))
-                
-                conn.commit()
-                
-                if cursor.rowcount > 0:
-                    logger.info(f"💾 캐시 저장 완료: {company_name} ({start_date}-{end_date})")
-                    return True
-                else:
-                    logger.info(f"⚠️ 캐시 이미 존재: {company_name} ({start_date}-{end_date})")
-                    return False
-                    
+            # JSON 데이터 직렬화 (잠금을 잡기 전에 수행)
+            json_data = json.dumps(result_data, ensure_ascii=False, indent=2)
+            
+            conn = self._get_connection()
+            with conn:
+                # 캐시 저장 (중복 시 무시, replace면 덮어씀)
+                cursor = conn.execute(REPLACE_RESULT_SQL if replace else INSERT_RESULT_SQL,
+                                      (cache_key, company_name, start_date, end_date,
+                                       top_keywords, use_ai_filter, json_data))
+            
+            if cursor.rowcount > 0:
+                logger.info(f"💾 캐시 저장 완료: {company_name} ({start_date}-{end_date})")
+                return True
+            else:
+                logger.info(f"⚠️ 캐시 이미 존재: {company_name} ({start_date}-{end_date})")
+                return False
+        
         except Exception as e:
             logger.error(f"❌ 캐시 저장 실패: {e}")
             return False
@@ -193,47 +298,53 @@ class CacheManager:
             캐시 통계 데이터
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # 전체 캐시 개수
-                cursor.execute("SELECT COUNT(*) FROM keyword_cache")
-                total_caches = cursor.fetchone()[0]
-                
-                # 총 접근 횟수
-                cursor.execute("SELECT SUM(access_count) FROM keyword_cache")
-                total_accesses = cursor.fetchone()[0] or 0
-                
-                # 최근 생성된 캐시 (7일 이내)
-                cursor.execute("""
-                    SELECT COUNT(*) FROM keyword_cache 
-                    WHERE created_at >= datetime('now', '-7 days')
-                """)
-                recent_caches = cursor.fetchone()[0]
-                
-                # 가장 많이 접근된 캐시 Top 5
-                cursor.execute("""
-                    SELECT company_name, start_date, end_date, access_count 
-                    FROM keyword_cache 
-                    ORDER BY access_count DESC 
-                    LIMIT 5
-                """)
-                top_caches = cursor.fetchall()
-                
-                return {
-                    "total_caches": total_caches,
-                    "total_accesses": total_accesses,
-                    "recent_caches_7days": recent_caches,
-                    "top_accessed_caches": [
-                        {
-                            "company": row[0],
-                            "period": f"{row[1]}-{row[2]}",
-                            "access_count": row[3]
-                        }
-                        for row in top_caches
-                    ]
-                }
-                
+            # 대기 중인 접근 통계를 먼저 반영
+            self.flush_access_stats()
+            
+            cursor = self._get_connection().cursor()
+            
+            # 전체 캐시 개수
+            cursor.execute("SELECT COUNT(*) FROM keyword_cache")
+            total_caches = cursor.fetchone()[0]
+            
+            # 총 접근 횟수
+            cursor.execute("SELECT SUM(access_count) FROM keyword_cache")
+            total_accesses = cursor.fetchone()[0] or 0
+            
+            # 최근 생성된 캐시 (7일 이내)
+            cursor.execute("""
+                SELECT COUNT(*) FROM keyword_cache
+                WHERE created_at >= datetime('now', '-7 days')
+            """)
+            recent_caches = cursor.fetchone()[0]
+            
+            # 가장 많이 접근된 캐시 Top 5
+            cursor.execute("""
+                SELECT company_name, start_date, end_date, access_count
+                FROM keyword_cache
+                ORDER BY access_count DESC
+                LIMIT 5
+            """)
+            top_caches = cursor.fetchall()
+            
+            with self._connections_lock:
+                open_connections = len(self._connections)
+            
+            return {
+                "total_caches": total_caches,
+                "total_accesses": total_accesses,
+                "recent_caches_7days": recent_caches,
+                "top_accessed_caches": [
+                    {
+                        "company": row[0],
+                        "period": f"{row[1]}-{row[2]}",
+                        "access_count": row[3]
+                    }
+                    for row in top_caches
+                ],
+                "open_connections": open_connections
+            }
+        
         except Exception as e:
             logger.error(f"❌ 캐시 통계 조회 실패: {e}")
             return {}
@@ -244,33 +355,23 @@ class CacheManager:
         
         Args:
             days: 삭제할 캐시의 일수 (기본값: 30일)
-            
+        
         Returns:
             삭제된 캐시 개수
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # 삭제 전 개수 확인
-                cursor.execute("""
-                    SELECT COUNT(*) FROM keyword_cache 
-                    WHERE created_at < datetime('now', '-{} days')
-                """.format(days))
-                
-                delete_count = cursor.fetchone()[0]
-                
+            conn = self._get_connection()
+            with conn:
                 # 오래된 캐시 삭제
-                cursor.execute("""
-                    DELETE FROM keyword_cache 
-                    WHERE created_at < datetime('now', '-{} days')
-                """.format(days))
-                
-                conn.commit()
-                
-                logger.info(f"🗑️ 오래된 캐시 삭제 완료: {delete_count}개 (>{days}일)")
-                return delete_count
-                
+                cursor = conn.execute("""
+                    DELETE FROM keyword_cache
+                    WHERE created_at < datetime('now', ?)
+                """, (f"-{int(days)} days",))
+                delete_count = cursor.rowcount
+            
+            logger.info(f"🗑️ 오래된 캐시 삭제 완료: {delete_count}개 (>{days}일)")
+            return delete_count
+        
         except Exception as e:
             logger.error(f"❌ 캐시 삭제 실패: {e}")
             return 0
@@ -278,8 +379,23 @@ class CacheManager:
     def cleanup(self):
         """캐시 매니저 정리"""
         try:
+            # 백그라운드 기록 중지 후 남은 접근 통계 기록
+            self._stop_event.set()
+            self._flush_thread.join(timeout=self.flush_interval + 1)
+            self.flush_access_stats()
+            
             # 데이터베이스 연결 정리
+            with self._connections_lock:
+                connections = self._connections
+                self._connections = []
+            for conn in connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.debug(f"캐시 DB 연결 종료 실패: {e}")
+            self._local = threading.local()
+            
             if os.path.exists(self.db_path):
-                logger.info(f"✅ 캐시 매니저 정리 완료: {self.db_path}")
+                logger.info(f"✅ 캐시 매니저 정리 완료: {self.db_path} (연결 {len(connections)}개 종료)")
         except Exception as e:
             logger.error(f"❌ 캐시 매니저 정리 실패: {e}")
@@ -2,30 +2,131 @@
 """
 CSV 파일 디스크 캐시 매니저
 S3에서 읽은 CSV 파일을 로컬 디스크에 저장하고 재사용
+(용량 한도 + LRU/LFU 제거, 원자적 저장, 원본 ETag/크기 검증, 매니페스트 기반 통계)
 """
 
 import os
+import json
+import fcntl
 import hashlib
 import logging
+import numpy as np
 import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
+import pyarrow as pa
+import threading
 import time
-from typing import Optional
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
 from pathlib import Path
 
+from date_utils import find_date_column, to_date_key
+from memory_table_cache import get_memory_table_cache
+
 logger = logging.getLogger(__name__)
 
+# 매니페스트 파일 이름 / 버전
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 2
+
+# 캐시 파일 구조 버전 (날짜 정렬/내부 컬럼 구성이 바뀌면 올려서 기존 항목을 다시 저장하도록 함)
+CACHE_LAYOUT_VERSION = 2
+
+# 캐시 파일에만 있는 내부 컬럼 (원본 행 순서, 정수형 날짜 YYYYMMDD)
+ROW_ORDER_COLUMN = '__row_order'
+CACHE_DATE_KEY_COLUMN = '__date_key'
+HIDDEN_COLUMNS = [ROW_ORDER_COLUMN, CACHE_DATE_KEY_COLUMN]
+
+# 제거 정책
+EVICTION_LRU = "lru"
+EVICTION_LFU = "lfu"
+
+# 조회 기록(최근 사용 시각/히트 수)을 매니페스트에 반영하는 최소 간격 (초)
+ACCESS_FLUSH_SECONDS = 30.0
+
+# 메모리 테이블 캐시에서 CSV 캐시 테이블을 구분하는 이름
+MEMORY_CACHE_KIND = "csv_cache"
+
+# 캐시 파일 형식 (parquet: snappy 압축, ipc: 압축하지 않은 Arrow IPC(Feather V2), 메모리 맵으로 읽음)
+FORMAT_PARQUET = "parquet"
+FORMAT_IPC = "ipc"
+FORMAT_AUTO = "auto"
+FORMAT_SUFFIXES = {FORMAT_PARQUET: '.parquet', FORMAT_IPC: '.arrow'}
+DATASET_FORMATS = {FORMAT_PARQUET: 'parquet', FORMAT_IPC: 'ipc'}
+
+# Parquet 행 그룹 / IPC 배치 크기 (행 수, 기간 조건으로 건너뛸 수 있는 단위)
+ROW_GROUP_ROWS = int(os.getenv('CSV_CACHE_ROW_GROUP_ROWS', '50000'))
+
 class CSVCacheManager:
     """CSV 파일 디스크 캐시 관리"""
     
-    def __init__(self, cache_dir: str = "./csv_cache"):
+    def __init__(self, cache_dir: str = "./csv_cache", max_bytes: Optional[int] = None, eviction_policy: Optional[str] = None,
+                 cache_format: Optional[str] = None):
+        """
+        초기화
+        
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_bytes: 캐시 용량 한도 (기본값: CSV_CACHE_MAX_MB 또는 2048MB, 0이면 무제한)
+            eviction_policy: 용량 초과 시 제거 정책 lru/lfu (기본값: CSV_CACHE_EVICTION 또는 lru)
+            cache_format: 저장 형식 parquet/ipc/auto (기본값: CSV_CACHE_FORMAT 또는 auto)
+                auto는 작은 파일과 자주 읽는 파일만 IPC로 저장하여 같은 호스트의 워커들이
+                페이지 캐시를 공유하고, 나머지는 디스크를 덜 쓰는 Parquet으로 저장합니다.
+        """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('CSV_CACHE_MAX_MB', '2048')) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.eviction_policy = (eviction_policy or os.getenv('CSV_CACHE_EVICTION', EVICTION_LRU)).lower()
+        if self.eviction_policy not in (EVICTION_LRU, EVICTION_LFU):
+            logger.warning(f"알 수 없는 캐시 제거 정책: {self.eviction_policy}, lru를 사용합니다.")
+            self.eviction_policy = EVICTION_LRU
+        
+        self.cache_format = (cache_format or os.getenv('CSV_CACHE_FORMAT', FORMAT_AUTO)).lower()
+        if self.cache_format not in (FORMAT_PARQUET, FORMAT_IPC, FORMAT_AUTO):
+            logger.warning(f"알 수 없는 캐시 형식: {self.cache_format}, auto를 사용합니다.")
+            self.cache_format = FORMAT_AUTO
+        # auto 기준: 이 크기 이하면 처음부터 IPC, 이 크기 이하이면서 조회 수가 기준 이상이면 IPC로 변환 (메모리 상 테이블 크기)
+        self.ipc_small_bytes = int(float(os.getenv('CSV_CACHE_IPC_SMALL_MB', '64')) * 1024 * 1024)
+        self.ipc_max_bytes = int(float(os.getenv('CSV_CACHE_IPC_MAX_MB', '512')) * 1024 * 1024)
+        self.ipc_promote_hits = int(os.getenv('CSV_CACHE_IPC_PROMOTE_HITS', '3'))
+        
+        # 원본 ETag/크기 조회용 S3 카탈로그 (KeywordExtractor가 주입, 없으면 호출자가 준 값만 검증)
+        self.catalog = None
+        
+        # 디스크 캐시 위의 메모리 테이블 캐시 (프로세스 내 공유)
+        self.memory_cache = get_memory_table_cache()
+        
         # 캐시 통계
         self.cache_hits = 0
         self.cache_misses = 0
+        self.memory_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.promotions = 0
         
-        logger.info(f"CSV 캐시 디렉토리 초기화: {self.cache_dir.absolute()}")
+        # 매니페스트 (캐시 키 → 항목 정보), 디스크에 반영하지 않은 조회 기록
+        self.manifest_path = self.cache_dir / MANIFEST_FILE
+        self.lock_path = self.cache_dir / f"{MANIFEST_FILE}.lock"
+        self._entries: Dict[str, Dict] = {}
+        self._dirty_access: Dict[str, Dict] = {}
+        self._last_access_flush = time.time()
+        self._lock = threading.RLock()
+        
+        self._remove_stale_tmp_files()
+        self._load_manifest()
+        
+        logger.info(f"CSV 캐시 디렉토리 초기화: {self.cache_dir.absolute()} "
+                    f"(한도: {self._format_limit()}, 정책: {self.eviction_policy}, 항목: {len(self._entries)}개)")
+    
+    def _format_limit(self) -> str:
+        """용량 한도 표시 문자열"""
+        return f"{self.max_bytes / (1024*1024):.0f}MB" if self.max_bytes > 0 else "무제한"
     
     def _get_cache_key(self, s3_path: str) -> str:
         """S3 경로를 기반으로 캐시 키 생성"""
@@ -38,121 +139,587 @@ class CSVCacheManager:
         """캐시 파일 경로 반환"""
         return self.cache_dir / cache_key
     
-    def is_cached(self, s3_path: str) -> bool:
-        """파일이 캐시되어 있는지 확인"""
-        cache_key = self._get_cache_key(s3_path)
-        cache_path = self._get_cache_path(cache_key)
-        return cache_path.exists()
+    def _get_data_path(self, cache_key: str, cache_format: str = FORMAT_PARQUET) -> Path:
+        """캐시 데이터 파일 경로 반환 (형식별 확장자)"""
+        return self._get_cache_path(cache_key).with_suffix(FORMAT_SUFFIXES[cache_format])
+    
+    def _choose_format(self, table_bytes: int, hits: int = 0) -> str:
+        """테이블 크기와 조회 수로 저장 형식 선택"""
+        if self.cache_format != FORMAT_AUTO:
+            return self.cache_format
+        if table_bytes <= self.ipc_small_bytes:
+            return FORMAT_IPC
+        if hits >= self.ipc_promote_hits and table_bytes <= self.ipc_max_bytes:
+            return FORMAT_IPC
+        return FORMAT_PARQUET
+    
+    def _write_table(self, table: pa.Table, data_path: Path, cache_format: str):
+        """테이블을 임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 교체"""
+        tmp_path = data_path.with_name(f"{data_path.name}.tmp.{os.getpid()}")
+        try:
+            if cache_format == FORMAT_IPC:
+                # 메모리 맵으로 바로 쓸 수 있도록 압축하지 않음
+                feather.write_feather(table, tmp_path, compression='uncompressed', chunksize=ROW_GROUP_ROWS)
+            else:
+                # Parquet 형식으로 저장 (압축률과 속도 최적화, 행 그룹별 min/max 통계 포함)
+                pq.write_table(table, tmp_path, compression='snappy', row_group_size=ROW_GROUP_ROWS, write_statistics=True)
+            os.replace(tmp_path, data_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
+    def _read_table(self, data_path: Path, cache_format: str, columns: Optional[List[str]] = None) -> pa.Table:
+        """캐시 파일 읽기 (columns를 주면 해당 컬럼만, IPC는 메모리 맵으로 버퍼가 페이지 캐시를 직접 가리킴)"""
+        if cache_format == FORMAT_IPC:
+            return feather.read_table(str(data_path), columns=columns, memory_map=True)
+        return pq.read_table(data_path, columns=columns)
     
-    def save_to_cache(self, s3_path: str, df: pd.DataFrame) -> bool:
-        """DataFrame을 캐시에 저장"""
+    def _remove_stale_tmp_files(self):
+        """중단된 저장 작업이 남긴 임시 파일 정리"""
+        for tmp_path in self.cache_dir.glob('*.tmp.*'):
+            try:
+                pid = int(tmp_path.name.rsplit('.', 1)[-1])
+                os.kill(pid, 0)  # 저장 중인 프로세스가 살아 있으면 건드리지 않음
+            except (ValueError, ProcessLookupError):
+                tmp_path.unlink(missing_ok=True)
+            except PermissionError:
+                pass
+    
+    @contextmanager
+    def _manifest_lock(self):
+        """여러 프로세스(uvicorn 워커, 멀티프로세스 엔진)가 매니페스트를 함께 갱신할 때 사용하는 파일 락"""
+        with self._lock, open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _read_manifest(self) -> Optional[Dict[str, Dict]]:
+        """디스크의 매니페스트 항목 (없거나 손상/버전 불일치면 None)"""
         try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        
+        if manifest.get('version') != MANIFEST_VERSION:
+            return None
+        return manifest.get('entries', {})
+    
+    def _write_manifest(self, entries: Dict[str, Dict]):
+        """매니페스트를 임시 파일에 쓰고 이름을 바꿔 원자적으로 교체"""
+        tmp_path = self.manifest_path.with_name(f"{MANIFEST_FILE}.tmp.{os.getpid()}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def _load_manifest(self):
+        """
+        매니페스트 로드 (없거나 이전 버전이면 새로 생성)
+        매니페스트에 없는 기존 캐시 파일은 원본 경로(캐시 키)와 원본 버전, 저장 형식 버전을 알 수 없어
+        조회에 쓸 수 없으므로 등록하지 않고 삭제합니다.
+        """
+        try:
+            with self._manifest_lock():
+                entries = self._read_manifest()
+                if entries is None:
+                    entries = {}
+                    removed = 0
+                    for suffix in FORMAT_SUFFIXES.values():
+                        for file_path in self.cache_dir.glob(f'*{suffix}'):
+                            file_path.unlink(missing_ok=True)
+                            removed += 1
+                    self._write_manifest(entries)
+                    if removed:
+                        logger.info(f"📋 캐시 매니페스트 생성: 매니페스트에 없던 기존 파일 {removed}개 삭제")
+                self._entries = entries
+        
+        except Exception as e:
+            logger.error(f"❌ 캐시 매니페스트 로드 실패: {e}")
+            self._entries = {}
+    
+    def _commit_manifest(self, updated: Iterable[str] = (), removed: Iterable[str] = (), keep_key: Optional[str] = None):
+        """
+        변경된 항목만 디스크의 최신 매니페스트에 병합하여 저장합니다.
+        (다른 프로세스가 추가한 항목도 함께 반영하고, keep_key를 주면 병합 결과 기준으로 용량 한도 적용)
+        """
+        updated = set(updated)
+        removed = set(removed)
+        
+        with self._manifest_lock():
+            entries = self._read_manifest() or {}
+            for cache_key in removed:
+                entries.pop(cache_key, None)
+            for cache_key in updated - removed:
+                if cache_key in self._entries:
+                    entries[cache_key] = self._entries[cache_key]
+            
+            # 조회 기록만 바뀐 항목은 디스크 항목에 조회 기록만 합침
+            for cache_key, access in self._dirty_access.items():
+                if cache_key in updated or cache_key not in entries:
+                    continue
+                disk_entry = entries[cache_key]
+                disk_entry["last_access"] = max(disk_entry.get("last_access", 0), access["last_access"])
+                disk_entry["hits"] = disk_entry.get("hits", 0) + access["hits"]
+            
+            self._entries = entries
+            self._dirty_access = {}
+            if keep_key is not None:
+                self._evict(keep_key)
+            self._write_manifest(self._entries)
+        
+        self._last_access_flush = time.time()
+    
+    def _record_access(self, cache_key: str):
+        """조회 기록 갱신 (매니페스트에는 일정 간격으로 모아서 반영)"""
+        with self._lock:
+            now = time.time()
+            entry = self._entries[cache_key]
+            entry["last_access"] = now
+            entry["hits"] = entry.get("hits", 0) + 1
+            
+            access = self._dirty_access.setdefault(cache_key, {"last_access": now, "hits": 0})
+            access["last_access"] = now
+            access["hits"] += 1
+            
+            if now - self._last_access_flush >= ACCESS_FLUSH_SECONDS:
+                try:
+                    self._commit_manifest()
+                except Exception as e:
+                    logger.warning(f"캐시 조회 기록 저장 실패: {e}")
+    
+    def _get_source_info(self, s3_path: str, source_etag: Optional[str], source_size: Optional[int]):
+        """검증에 사용할 원본 ETag/크기 (인자로 주지 않으면 S3 카탈로그에서 조회)"""
+        if source_etag is None and source_size is None and self.catalog is not None:
+            entry = self.catalog.get_entry(s3_path)
+            if entry is not None:
+                return entry.etag, entry.size
+        return source_etag, source_size
+    
+    def _is_valid(self, entry: Dict, source_etag: Optional[str], source_size: Optional[int]) -> bool:
+        """캐시 항목이 현재 원본과 같은 버전인지 확인 (비교할 정보가 없으면 유효로 간주)"""
+        if entry.get("layout") != CACHE_LAYOUT_VERSION:
+            return False
+        if source_etag and entry.get("source_etag") and entry["source_etag"] != source_etag:
+            return False
+        if source_size is not None and entry.get("source_size") is not None and entry["source_size"] != source_size:
+            return False
+        return True
+    
+    def _remove_entry(self, cache_key: str):
+        """캐시 파일 삭제 (매니페스트 반영은 호출자가 처리)"""
+        for cache_format in FORMAT_SUFFIXES:
+            self._get_data_path(cache_key, cache_format).unlink(missing_ok=True)
+        self._entries.pop(cache_key, None)
+        self._dirty_access.pop(cache_key, None)
+    
+    def _find_entry(self, s3_path: str, source_etag: Optional[str] = None, source_size: Optional[int] = None) -> Optional[str]:
+        """
+        유효한 캐시 항목의 키를 반환합니다.
+        원본이 바뀐 항목은 삭제하고, 다른 프로세스가 저장한 항목은 매니페스트를 다시 읽어 확인합니다.
+        """
+        with self._lock:
             cache_key = self._get_cache_key(s3_path)
-            cache_path = self._get_cache_path(cache_key)
+            
+            if cache_key not in self._entries:
+                # 다른 프로세스가 저장했을 수 있으므로 디스크 매니페스트 확인
+                disk_entries = self._read_manifest() or {}
+                if cache_key not in disk_entries:
+                    return None
+                self._entries[cache_key] = disk_entries[cache_key]
+            
+            source_etag, source_size = self._get_source_info(s3_path, source_etag, source_size)
+            if not self._is_valid(self._entries[cache_key], source_etag, source_size):
+                logger.info(f"♻️ 원본 또는 캐시 형식이 변경되어 캐시 무효화: {os.path.basename(s3_path)}")
+                self._remove_entry(cache_key)
+                self.invalidations += 1
+                try:
+                    self._commit_manifest(removed=[cache_key])
+                except Exception as e:
+                    logger.warning(f"캐시 매니페스트 갱신 실패: {e}")
+                return None
+            
+            return cache_key
+    
+    def is_cached(self, s3_path: str, source_etag: Optional[str] = None, source_size: Optional[int] = None) -> bool:
+        """파일이 캐시되어 있는지 확인 (매니페스트 기준, 원본이 바뀌었으면 False)"""
+        return self._find_entry(s3_path, source_etag, source_size) is not None
+    
+    def _evict(self, keep_key: str):
+        """용량 한도를 넘으면 정책에 따라 항목을 제거합니다. (방금 저장한 항목은 유지, 매니페스트 락 안에서 호출)"""
+        if self.max_bytes <= 0:
+            return
+        
+        total_size = sum(entry.get("size_bytes", 0) for entry in self._entries.values())
+        if total_size <= self.max_bytes:
+            return
+        
+        if self.eviction_policy == EVICTION_LFU:
+            victim_order = lambda key: (self._entries[key].get("hits", 0), self._entries[key].get("last_access", 0))
+        else:
+            victim_order = lambda key: self._entries[key].get("last_access", 0)
+        
+        removed = []
+        for cache_key in sorted((key for key in self._entries if key != keep_key), key=victim_order):
+            if total_size <= self.max_bytes:
+                break
+            total_size -= self._entries[cache_key].get("size_bytes", 0)
+            self._remove_entry(cache_key)
+            removed.append(cache_key)
+        
+        if removed:
+            self.evictions += len(removed)
+            logger.info(f"🧹 캐시 용량 한도 초과로 {len(removed)}개 항목 제거 ({self.eviction_policy}, "
+                        f"현재 {total_size / (1024*1024):.2f}MB / {self._format_limit()})")
+    
+    def _prepare_table(self, df: pd.DataFrame):
+        """
+        저장용 테이블 생성: 원본 행 순서(__row_order)와 정수형 날짜(__date_key) 컬럼을 추가합니다.
+        
+        Returns:
+            Tuple[pa.Table, Optional[str]]: (저장할 테이블, 날짜 컬럼명)
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.append_column(ROW_ORDER_COLUMN, pa.array(np.arange(len(df), dtype=np.int64)))
+        
+        date_column = find_date_column(df.columns)
+        if date_column is None:
+            return table, None
+        
+        date_keys = to_date_key(df[date_column].reset_index(drop=True))
+        table = table.append_column(CACHE_DATE_KEY_COLUMN, pa.array(date_keys, type=pa.int32(), from_pandas=True))
+        return table, date_column
+    
+    def save_to_cache(self, s3_path: str, df: pd.DataFrame, source_etag: Optional[str] = None, source_size: Optional[int] = None) -> bool:
+        """DataFrame을 캐시에 저장 (임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 교체)"""
+        try:
+            cache_key = self._get_cache_key(s3_path)
+            source_etag, source_size = self._get_source_info(s3_path, source_etag, source_size)
             
             start_time = time.time()
             
-            # Parquet 형식으로 저장 (압축률과 속도 최적화)
-            parquet_path = cache_path.with_suffix('.parquet')
-            df.to_parquet(
-                parquet_path,
-                engine='pyarrow',
-                compression='snappy',
-                index=False
-            )
+            table, date_column = self._prepare_table(df)
+            cache_format = self._choose_format(table.nbytes)
+            
+            # Parquet은 날짜순으로 정렬하여 행 그룹 통계만으로 기간 밖 행 그룹을 건너뛸 수 있게 함
+            # (안정 정렬이라 같은 날짜는 원본 순서 유지, IPC는 메모리 맵 그대로 쓰도록 원본 순서로 저장)
+            sorted_by_date = cache_format == FORMAT_PARQUET and date_column is not None
+            if sorted_by_date:
+                table = table.sort_by([(CACHE_DATE_KEY_COLUMN, "ascending")])
+            
+            data_path = self._get_data_path(cache_key, cache_format)
+            self._write_table(table, data_path, cache_format)
             
             save_time = time.time() - start_time
-            file_size = parquet_path.stat().st_size / (1024*1024)  # MB
+            size_bytes = data_path.stat().st_size
             
-            logger.info(f"💾 캐시 저장 완료: {os.path.basename(s3_path)}")
-            logger.info(f"   📁 크기: {file_size:.2f}MB, 시간: {save_time:.3f}초")
+            now = time.time()
+            with self._lock:
+                # 다른 형식으로 저장되어 있던 이전 파일 정리
+                for other_format in FORMAT_SUFFIXES:
+                    if other_format != cache_format:
+                        self._get_data_path(cache_key, other_format).unlink(missing_ok=True)
+                
+                self._entries[cache_key] = {
+                    "source": s3_path,
+                    "layout": CACHE_LAYOUT_VERSION,
+                    "format": cache_format,
+                    "columns": list(df.columns),
+                    "date_column": date_column,
+                    "sorted_by_date": sorted_by_date,
+                    "row_count": len(df),
+                    "size_bytes": size_bytes,
+                    "table_bytes": table.nbytes,
+                    "source_etag": source_etag,
+                    "source_size": source_size,
+                    "created_at": now,
+                    "last_access": now,
+                    "hits": 0,
+                }
+                self._dirty_access.pop(cache_key, None)
+                self._commit_manifest(updated=[cache_key], keep_key=cache_key)
             
-            return True
+            logger.info(f"💾 캐시 저장 완료: {os.path.basename(s3_path)} ({cache_format})")
+            logger.info(f"   📁 크기: {size_bytes / (1024*1024):.2f}MB, 시간: {save_time:.3f}초")
             
+            return True
+        
         except Exception as e:
             logger.error(f"❌ 캐시 저장 실패 ({s3_path}): {e}")
             return False
     
-    def load_from_cache(self, s3_path: str) -> Optional[pd.DataFrame]:
-        """캐시에서 DataFrame 로드"""
+    def _should_promote(self, cache_key: str, entry: Dict) -> bool:
+        """
+        Parquet 항목을 IPC로 변환할지 조회 수와 항목 크기로 판단합니다.
+        (IPC는 압축하지 않으므로 변환 후 크기를 메모리 상 테이블 크기로 보고, 혼자서 용량 한도를 넘으면 변환하지 않음)
+        """
+        if entry.get("format", FORMAT_PARQUET) != FORMAT_PARQUET:
+            return False
+        
+        table_bytes = entry.get("table_bytes", 0)
+        if self.max_bytes > 0 and table_bytes > self.max_bytes:
+            return False
+        
+        with self._lock:
+            hits = self._entries.get(cache_key, {}).get("hits", 0)
+        return self._choose_format(table_bytes, hits) == FORMAT_IPC
+    
+    def _promote_to_ipc(self, s3_path: str, cache_key: str, entry: Dict):
+        """
+        자주 읽는 Parquet 캐시를 IPC 형식으로 다시 저장 (원본 행 순서로, 이후 메모리 맵으로 읽음)
+        조회는 필요한 컬럼만 읽으므로 변환할 때 전체 컬럼을 한 번 따로 읽습니다.
+        """
         try:
-            cache_key = self._get_cache_key(s3_path)
-            cache_path = self._get_cache_path(cache_key)
-            parquet_path = cache_path.with_suffix('.parquet')
+            start_time = time.time()
+            parquet_path = self._get_data_path(cache_key, FORMAT_PARQUET)
+            table = self._restore_order(self._read_table(parquet_path, FORMAT_PARQUET), entry)
+            
+            data_path = self._get_data_path(cache_key, FORMAT_IPC)
+            self._write_table(table, data_path, FORMAT_IPC)
+            
+            with self._lock:
+                entry = self._entries.get(cache_key)
+                if entry is None:
+                    data_path.unlink(missing_ok=True)
+                    return
+                parquet_path.unlink(missing_ok=True)
+                entry["format"] = FORMAT_IPC
+                entry["sorted_by_date"] = False
+                entry["size_bytes"] = data_path.stat().st_size
+                entry["table_bytes"] = table.nbytes
+                # 압축하지 않은 IPC 파일은 Parquet보다 크므로 바뀐 크기로 용량 한도를 다시 적용 (변환한 항목은 유지)
+                self._commit_manifest(updated=[cache_key], keep_key=cache_key)
+            
+            self.promotions += 1
+            logger.info(f"🔁 자주 읽는 캐시를 IPC로 변환: {os.path.basename(s3_path)} ({time.time() - start_time:.3f}초)")
+        
+        except Exception as e:
+            logger.warning(f"IPC 변환 실패 ({s3_path}): {e}")
+    
+    def _build_filter(self, entry: Dict, start_date: Optional[str], end_date: Optional[str], company_name: Optional[str]):
+        """
+        조회 조건을 데이터셋 필터 식으로 변환합니다. (조건이 없으면 None)
+        기간 조건은 날짜순 정렬된 Parquet의 행 그룹 통계로 행 그룹 단위로 건너뛰고,
+        기관 조건은 부분 문자열 검색이라 통계로는 건너뛸 수 없으므로 스캔 중 배치 단위로 적용합니다.
+        """
+        expression = None
+        
+        if entry.get("date_column") and (start_date or end_date):
+            date_key = ds.field(CACHE_DATE_KEY_COLUMN)
+            if start_date:
+                expression = date_key >= int(start_date)
+            if end_date:
+                end_condition = date_key <= int(end_date)
+                expression = end_condition if expression is None else expression & end_condition
+        
+        if company_name and '기관' in entry.get("columns", []):
+            company_condition = pc.match_substring(ds.field('기관'), company_name)
+            expression = company_condition if expression is None else expression & company_condition
+        
+        return expression
+    
+    def _fits_memory(self, entry: Dict) -> bool:
+        """항목을 메모리 캐시에 올릴 수 있는지 확인 (저장 시 전체 테이블 크기 기준)"""
+        return self.memory_cache.is_enabled() and entry.get("table_bytes", 0) <= self.memory_cache.max_bytes
+    
+    def _restore_order(self, table: pa.Table, entry: Dict) -> pa.Table:
+        """날짜순으로 저장된 행을 원본 행 순서로 되돌립니다."""
+        if not entry.get("sorted_by_date") or ROW_ORDER_COLUMN not in table.column_names:
+            return table
+        return table.sort_by([(ROW_ORDER_COLUMN, "ascending")])
+    
+    def _project(self, table: pa.Table, columns: Optional[List[str]]) -> pa.Table:
+        """요청한 원본 컬럼만 남깁니다. (내부 컬럼 제거, 없는 컬럼은 무시)"""
+        if columns is None:
+            columns = [name for name in table.column_names if name not in HIDDEN_COLUMNS]
+        return table.select([name for name in columns if name in table.column_names])
+    
+    def load_table_from_cache(self, s3_path: str, source_etag: Optional[str] = None, source_size: Optional[int] = None,
+                              columns: Optional[List[str]] = None,
+                              start_date: Optional[str] = None, end_date: Optional[str] = None,
+                              company_name: Optional[str] = None) -> Optional[pa.Table]:
+        """
+        캐시에서 Arrow 테이블 로드 (메모리 캐시 우선, 원본이 바뀌었거나 파일이 없으면 None)
+        메모리 캐시에서 찾은 테이블은 복사 없이 같은 버퍼를 반환합니다.
+        
+        Args:
+            s3_path: 원본 S3 경로
+            source_etag, source_size: 원본 검증 정보 (없으면 S3 카탈로그에서 조회)
+            columns: 읽을 원본 컬럼 (기본값: 전체)
+            start_date, end_date: 기간 조건 (YYYYMMDD, 날짜 컬럼이 없는 파일은 적용하지 않음)
+            company_name: 기관 컬럼에 포함되어야 하는 기업명
+        
+        Returns:
+            pa.Table: 조건에 맞는 행 (원본 행 순서 유지)
+        """
+        try:
+            cache_key = self._find_entry(s3_path, source_etag, source_size)
+            with self._lock:
+                entry = self._entries.get(cache_key) if cache_key else None
+            
+            if entry is None:
+                self.cache_misses += 1
+                return None
+            
+            row_filter = self._build_filter(entry, start_date, end_date, company_name)
+            read_columns = None
+            if columns is not None:
+                read_columns = [name for name in columns if name in entry.get("columns", [])]
+            
+            # 1. 메모리 캐시 (같은 저장 시점, 같은 컬럼 구성의 원본 순서 테이블만 사용, 조건은 메모리에서 적용)
+            version = (entry.get("created_at"), entry.get("source_etag"))
+            memory_kind = (MEMORY_CACHE_KIND, tuple(read_columns) if read_columns is not None else None)
+            table = self.memory_cache.get(s3_path, version, memory_kind)
+            if table is not None:
+                if row_filter is not None:
+                    table = table.filter(row_filter)
+                table = self._project(table, read_columns)
+                
+                self.cache_hits += 1
+                self.memory_hits += 1
+                self._record_access(cache_key)
+                logger.info(f"⚡ 메모리 캐시에서 로드: {os.path.basename(s3_path)} ({table.num_rows:,}행)")
+                return table
             
-            if not parquet_path.exists():
+            # 2. 디스크 캐시
+            cache_format = entry.get("format", FORMAT_PARQUET)
+            data_path = self._get_data_path(cache_key, cache_format)
+            if not data_path.exists():
+                # 다른 프로세스가 제거한 항목
+                with self._lock:
+                    self._entries.pop(cache_key, None)
+                    self._dirty_access.pop(cache_key, None)
                 self.cache_misses += 1
                 return None
             
             start_time = time.time()
-            df = pd.read_parquet(parquet_path, engine='pyarrow')
+            scan_columns = None
+            if read_columns is not None:
+                # 행 순서 복원/기간 조건에 쓰는 내부 컬럼은 함께 읽음 (날짜 컬럼이 없는 파일에는 __date_key가 없음)
+                hidden_columns = [ROW_ORDER_COLUMN] + ([CACHE_DATE_KEY_COLUMN] if entry.get("date_column") else [])
+                scan_columns = read_columns + [name for name in hidden_columns if name not in read_columns]
+            
+            if cache_format == FORMAT_IPC:
+                # 메모리 맵으로 필요한 컬럼만 복사 없이 읽고 조건은 메모리에서 적용
+                # (IPC는 페이지 캐시를 직접 가리키므로 메모리 캐시에 따로 보관하지 않음)
+                table = self._read_table(data_path, cache_format, scan_columns)
+                if row_filter is not None:
+                    table = table.filter(row_filter)
+            elif self._fits_memory(entry):
+                # 요청 컬럼의 전체 행을 원본 순서로 메모리 캐시에 올린 뒤 조건 적용 (같은 컬럼 조회는 다음부터 메모리에서)
+                table = self._restore_order(self._read_table(data_path, cache_format, scan_columns), entry)
+                self.memory_cache.put(s3_path, version, table, memory_kind)
+                if row_filter is not None:
+                    table = table.filter(row_filter)
+            else:
+                # 메모리에 올릴 수 없으면 필요한 컬럼만 읽고 조건에 맞지 않는 행 그룹은 건너뜀
+                dataset = ds.dataset(str(data_path), format=DATASET_FORMATS[cache_format])
+                table = self._restore_order(dataset.to_table(columns=scan_columns, filter=row_filter), entry)
             load_time = time.time() - start_time
             
             self.cache_hits += 1
+            self._record_access(cache_key)
+            
+            if self._should_promote(cache_key, entry):
+                self._promote_to_ipc(s3_path, cache_key, entry)
             
-            logger.info(f"📂 캐시에서 로드: {os.path.basename(s3_path)}")
-            logger.info(f"   📊 행 수: {len(df):,}개, 시간: {load_time:.3f}초")
+            table = self._project(table, read_columns)
             
-            return df
+            logger.info(f"📂 캐시에서 로드: {os.path.basename(s3_path)} ({cache_format})")
+            logger.info(f"   📊 행 수: {table.num_rows:,}개 / {entry.get('row_count', 0):,}개, 컬럼: {table.num_columns}개, 시간: {load_time:.3f}초")
             
+            return table
+        
         except Exception as e:
             logger.error(f"❌ 캐시 로드 실패 ({s3_path}): {e}")
             self.cache_misses += 1
             return None
     
+    def load_from_cache(self, s3_path: str, source_etag: Optional[str] = None, source_size: Optional[int] = None,
+                        columns: Optional[List[str]] = None,
+                        start_date: Optional[str] = None, end_date: Optional[str] = None,
+                        company_name: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """캐시에서 DataFrame 로드 (원본이 바뀌었거나 파일이 없으면 None, 조건은 load_table_from_cache와 동일)"""
+        table = self.load_table_from_cache(s3_path, source_etag, source_size, columns, start_date, end_date, company_name)
+        if table is None:
+            return None
+        
+        try:
+            return table.to_pandas()
+        except Exception as e:
+            logger.error(f"❌ 캐시 변환 실패 ({s3_path}): {e}")
+            return None
+    
     def get_cache_stats(self) -> dict:
-        """캐시 통계 반환"""
+        """캐시 통계 반환 (디렉토리를 스캔하지 않고 매니페스트 기준으로 계산)"""
         total_requests = self.cache_hits + self.cache_misses
         hit_rate = (self.cache_hits / total_requests * 100) if total_requests > 0 else 0
         
-        # 캐시 디렉토리 크기 계산
-        total_size = 0
-        file_count = 0
-        for file_path in self.cache_dir.glob('*.parquet'):
-            total_size += file_path.stat().st_size
-            file_count += 1
+        with self._lock:
+            entries = list(self._entries.values())
+        cached_files = len(entries)
+        total_size = sum(entry.get("size_bytes", 0) for entry in entries)
         
         return {
             "cache_hits": self.cache_hits,
             "cache_misses": self.cache_misses,
             "hit_rate": f"{hit_rate:.1f}%",
-            "cached_files": file_count,
-            "total_size_mb": f"{total_size / (1024*1024):.2f}MB"
+            "memory_hits": self.memory_hits,
+            "cache_format": self.cache_format,
+            "ipc_files": sum(1 for entry in entries if entry.get("format") == FORMAT_IPC),
+            "ipc_promotions": self.promotions,
+            "cached_files": cached_files,
+            "total_size_mb": f"{total_size / (1024*1024):.2f}MB",
+            "max_size_mb": self._format_limit(),
+            "eviction_policy": self.eviction_policy,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "memory_cache": self.memory_cache.get_stats()
         }
     
     def clear_cache(self) -> bool:
         """캐시 디렉토리 정리"""
         try:
-            deleted_count = 0
-            for file_path in self.cache_dir.glob('*.parquet'):
-                file_path.unlink()
-                deleted_count += 1
+            with self._manifest_lock():
+                deleted_count = 0
+                for suffix in FORMAT_SUFFIXES.values():
+                    for file_path in self.cache_dir.glob(f'*{suffix}'):
+                        file_path.unlink()
+                        deleted_count += 1
+                
+                self._write_manifest({})
+                self._entries = {}
+                self._dirty_access = {}
             
             logger.info(f"🗑️ 캐시 정리 완료: {deleted_count}개 파일 삭제")
             return True
-            
+        
         except Exception as e:
             logger.error(f"❌ 캐시 정리 실패: {e}")
             return False
     
     def cleanup_old_cache(self, max_age_days: int = 7) -> int:
-        """오래된 캐시 파일 정리"""
+        """오래된 캐시 파일 정리 (저장 시각 기준)"""
         try:
             current_time = time.time()
             max_age_seconds = max_age_days * 24 * 3600
-            deleted_count = 0
             
-            for file_path in self.cache_dir.glob('*.parquet'):
-                file_age = current_time - file_path.stat().st_mtime
-                if file_age > max_age_seconds:
-                    file_path.unlink()
-                    deleted_count += 1
+            with self._lock:
+                old_keys = [
+                    cache_key for cache_key, entry in self._entries.items()
+                    if current_time - entry.get("created_at", current_time) > max_age_seconds
+                ]
+                for cache_key in old_keys:
+                    self._remove_entry(cache_key)
             
+            deleted_count = len(old_keys)
             if deleted_count > 0:
+                self._commit_manifest(removed=old_keys)
                 logger.info(f"🗑️ 오래된 캐시 정리: {deleted_count}개 파일 삭제 ({max_age_days}일 이상)")
             
             return deleted_count
-            
+        
         except Exception as e:
             logger.error(f"❌ 오래된 캐시 정리 실패: {e}")
             return 0
@@ -162,7 +729,7 @@ class CSVCacheManager:
         stats = self.get_cache_stats()
         logger.info("📊 === CSV 캐시 통계 ===")
         logger.info(f"   🎯 캐시 적중률: {stats['hit_rate']}")
-        logger.info(f"   ✅ 캐시 히트: {stats['cache_hits']}회")
+        logger.info(f"   ✅ 캐시 히트: {stats['cache_hits']}회 (메모리 {stats['memory_hits']}회)")
         logger.info(f"   ❌ 캐시 미스: {stats['cache_misses']}회")
         logger.info(f"   📁 캐시된 파일: {stats['cached_files']}개")
-        logger.info(f"   💾 총 크기: {stats['total_size_mb']}")
+        logger.info(f"   💾 총 크기: {stats['total_size_mb']} / {stats['max_size_mb']} ({stats['eviction_policy']}, 제거 {stats['evictions']}회)")
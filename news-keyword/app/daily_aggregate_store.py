@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+기업별 일 단위 키워드 부분 집계 저장소
+(기업, 날짜)마다 뉴스 개수, 키워드 빈도(처음 등장 위치 포함), 기사 요약과 기사별 키워드 색인을 SQLite에 보관합니다.
+임의의 기간 요청은 저장된 일별 키워드 빈도를 합쳐 처리하고, 없는 날짜만 새로 계산합니다.
+상위 기사는 기간의 상위 키워드가 정해진 뒤 기사별 키워드 색인으로 SQLite에서 점수를 매겨 상위 N개만 읽습니다.
+(점수가 기간 전체의 상위 키워드에 따라 달라지므로 날짜별 상위 후보만 저장해서는 정확히 고를 수 없음)
+각 일별 항목은 그 날짜를 포함하는 원본 파일들의 ETag로 만든 버전을 함께 저장해,
+원본이 바뀌면 다시 계산합니다.
+
+동률 순서는 PandasAnalyzer와 같도록 원본 위치(원본 경로, 파일 내 행 번호, 행 내 키워드 순서)로 정합니다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher
+from news_store import KEYWORD_LIST_COLUMN
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식 버전 (집계 방식이 바뀌면 올려서 기존 항목을 무효화)
+AGGREGATE_VERSION = 2
+
+# 기사 요약 컬럼 (원본 위치 + PandasAnalyzer.extract_top_news_articles 입력 형식)
+ARTICLE_COLUMNS = ['source', 'row_id', '제목', '일자', 'URL', KEYWORD_LIST_COLUMN]
+
+# 원본 위치 (원본 경로, 파일 내 행 번호, 행 내 키워드 순서) - 파일 키 순서로 읽은 행 순서와 같음
+Position = Tuple[str, int, int]
+
+# 일별 집계 계산 시 행마다 붙이는 원본 경로 컬럼
+SOURCE_COLUMN = '_source'
+
+# 한 번에 조회할 날짜 수 (SQLite 바인딩 변수 한도 이내)
+QUERY_CHUNK_DAYS = 500
+
+# 잠금 대기 시간 (초)
+BUSY_TIMEOUT_SECONDS = 5
+
+
+@dataclass
+class DailyPartial:
+    """기업 하나의 하루치 부분 집계"""
+    date_key: int                                                        # YYYYMMDD 정수
+    news_count: int = 0
+    keyword_counts: Dict[str, int] = field(default_factory=dict)         # 처음 등장한 순서 유지
+    keyword_positions: Dict[str, Position] = field(default_factory=dict) # 키워드 → 처음 등장한 원본 위치
+    articles: List[List] = field(default_factory=list)                  # ARTICLE_COLUMNS 순서 (저장할 때만 사용, 조회 시 비어 있음)
+
+
+def iter_date_keys(start_date: str, end_date: str) -> List[int]:
+    """기간 내 모든 날짜의 YYYYMMDD 정수 목록"""
+    current = datetime.strptime(start_date, "%Y%m%d")
+    end = datetime.strptime(end_date, "%Y%m%d")
+    date_keys = []
+    while current <= end:
+        date_keys.append(int(current.strftime("%Y%m%d")))
+        current += timedelta(days=1)
+    return date_keys
+
+
+def group_consecutive_days(date_keys: Iterable[int]) -> List[Tuple[str, str]]:
+    """날짜 목록을 연속 구간 [(시작일, 종료일), ...]으로 묶습니다."""
+    ranges = []
+    run_start = run_end = None
+    for date_key in sorted(date_keys):
+        day = datetime.strptime(str(date_key), "%Y%m%d")
+        if run_end is not None and day - run_end == timedelta(days=1):
+            run_end = day
+            continue
+        if run_start is not None:
+            ranges.append((run_start.strftime("%Y%m%d"), run_end.strftime("%Y%m%d")))
+        run_start = run_end = day
+    if run_start is not None:
+        ranges.append((run_start.strftime("%Y%m%d"), run_end.strftime("%Y%m%d")))
+    return ranges
+
+
+def merge_daily_partials(partials: List[DailyPartial]) -> Tuple[int, Dict[str, int]]:
+    """
+    일별 부분 집계를 합칩니다.
+    키워드는 빈도 내림차순, 동률은 기간 전체에서 처음 등장한 원본 위치 순으로 정렬합니다.
+    (원본 파일을 키 순서로 이어 읽은 PandasAnalyzer의 Counter.most_common 순서와 같음)
+    
+    Returns:
+        Tuple[int, Dict[str, int]]: (뉴스 개수, 빈도순 키워드)
+    """
+    news_count = 0
+    counts: Dict[str, int] = {}
+    first_positions: Dict[str, Position] = {}
+    for partial in partials:
+        news_count += partial.news_count
+        for keyword, count in partial.keyword_counts.items():
+            counts[keyword] = counts.get(keyword, 0) + count
+            position = partial.keyword_positions[keyword]
+            if keyword not in first_positions or position < first_positions[keyword]:
+                first_positions[keyword] = position
+    
+    order = sorted(counts, key=lambda keyword: (-counts[keyword], first_positions[keyword]))
+    return news_count, {keyword: counts[keyword] for keyword in order}
+
+
+class DailyAggregateStore:
+    """(기업, 날짜) → 일별 부분 집계 SQLite 저장소"""
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        초기화
+        
+        Args:
+            db_path: SQLite 파일 경로 (기본값: DAILY_AGGREGATE_DB 또는 ./daily_aggregates.db, 빈 문자열이면 사용 안 함)
+        """
+        self.db_path = db_path if db_path is not None else os.getenv('DAILY_AGGREGATE_DB', './daily_aggregates.db')
+        
+        # 스레드별 연결 (WAL 모드, 종료 시 모두 닫기 위해 목록도 보관)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        
+        # 통계
+        self.hit_days = 0
+        self.computed_days = 0
+        self.stale_days = 0
+        
+        if self.is_enabled():
+            self.init_database()
+    
+    def is_enabled(self) -> bool:
+        """일별 집계 저장소 사용 여부"""
+        return bool(self.db_path)
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 반환 (없으면 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def init_database(self):
+        """테이블 초기화 (기사 요약을 JSON으로 담던 이전 형식 테이블은 다시 만듦)"""
+        try:
+            conn = self._get_connection()
+            with conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(daily_keyword_aggregate)")}
+                if 'articles' in columns:
+                    conn.execute("DROP TABLE daily_keyword_aggregate")
+                    logger.info("🔄 이전 형식 일별 집계 테이블 삭제 (다시 계산)")
+                
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS daily_keyword_aggregate (
+                        company_name TEXT NOT NULL,
+                        date_key INTEGER NOT NULL,
+                        source_version TEXT NOT NULL,
+                        news_count INTEGER NOT NULL,
+                        keyword_counts TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (company_name, date_key)
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS daily_article (
+                        company_name TEXT NOT NULL,
+                        date_key INTEGER NOT NULL,
+                        source TEXT NOT NULL,
+                        row_id INTEGER NOT NULL,
+                        title TEXT,
+                        date TEXT,
+                        url TEXT,
+                        keywords TEXT NOT NULL,
+                        PRIMARY KEY (company_name, date_key, source, row_id)
+                    )
+                """)
+                # 기사별 키워드 색인 (기사당 같은 키워드는 한 번만)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS daily_article_keyword (
+                        company_name TEXT NOT NULL,
+                        date_key INTEGER NOT NULL,
+                        keyword TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        row_id INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_article_keyword_day
+                    ON daily_article_keyword (company_name, date_key, keyword)
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_article_keyword_keyword
+                    ON daily_article_keyword (company_name, keyword, date_key)
+                """)
+            logger.info(f"✅ 일별 집계 저장소 초기화 완료: {self.db_path}")
+        
+        except Exception as e:
+            logger.error(f"❌ 일별 집계 저장소 초기화 실패: {e}")
+            self.db_path = ""
+    
+    @staticmethod
+    def make_source_version(file_versions: Iterable[Tuple[str, str]]) -> str:
+        """날짜를 포함하는 원본 파일들의 (키, ETag)로 버전 문자열 생성"""
+        parts = [f"{key}:{etag}" for key, etag in sorted(file_versions)]
+        return f"v{AGGREGATE_VERSION}|" + "|".join(parts)
+    
+    def get_partials(self, company_name: str, source_versions: Dict[int, str]) -> Dict[int, DailyPartial]:
+        """
+        저장된 일별 부분 집계 조회 (버전이 다른 항목은 제외)
+        
+        Args:
+            company_name: 기업명
+            source_versions: 날짜 → 현재 원본 버전
+        
+        Returns:
+            Dict[int, DailyPartial]: 날짜 → 부분 집계 (유효한 항목만)
+        """
+        if not self.is_enabled() or not source_versions:
+            return {}
+        
+        partials = {}
+        stale = 0
+        try:
+            conn = self._get_connection()
+            date_keys = sorted(source_versions)
+            for offset in range(0, len(date_keys), QUERY_CHUNK_DAYS):
+                chunk = date_keys[offset:offset + QUERY_CHUNK_DAYS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"""
+                    SELECT date_key, source_version, news_count, keyword_counts
+                    FROM daily_keyword_aggregate
+                    WHERE company_name = ? AND date_key IN ({placeholders})
+                """, (company_name, *chunk)).fetchall()
+                
+                for date_key, source_version, news_count, keyword_counts in rows:
+                    if source_version != source_versions.get(date_key):
+                        stale += 1
+                        continue
+                    entries = json.loads(keyword_counts)
+                    partials[date_key] = DailyPartial(
+                        date_key=date_key,
+                        news_count=news_count,
+                        keyword_counts={keyword: count for keyword, count, _ in entries},
+                        keyword_positions={keyword: tuple(position) for keyword, _, position in entries}
+                    )
+        
+        except Exception as e:
+            logger.error(f"❌ 일별 집계 조회 실패: {e}")
+            return {}
+        
+        self.hit_days += len(partials)
+        self.stale_days += stale
+        return partials
+    
+    def save_partials(self, company_name: str, partials: Iterable[DailyPartial], source_versions: Dict[int, str]) -> bool:
+        """일별 부분 집계와 기사 요약/키워드 색인을 한 트랜잭션으로 저장 (같은 날짜는 덮어씀)"""
+        if not self.is_enabled():
+            return False
+        
+        partials = list(partials)
+        if not partials:
+            return True
+        
+        aggregate_rows = []
+        article_rows = []
+        keyword_rows = []
+        for p in partials:
+            aggregate_rows.append((
+                company_name, p.date_key, source_versions[p.date_key], p.news_count,
+                json.dumps([[keyword, count, p.keyword_positions[keyword]] for keyword, count in p.keyword_counts.items()],
+                           ensure_ascii=False)
+            ))
+            for source, row_id, title, date, url, keywords in p.articles:
+                article_rows.append((company_name, p.date_key, source, row_id, title, date, url,
+                                     json.dumps(keywords, ensure_ascii=False)))
+                keyword_rows.extend((company_name, p.date_key, keyword, source, row_id) for keyword in set(keywords))
+        day_keys = [(company_name, p.date_key) for p in partials]
+        
+        try:
+            conn = self._get_connection()
+            with conn:
+                conn.executemany("DELETE FROM daily_article WHERE company_name = ? AND date_key = ?", day_keys)
+                conn.executemany("DELETE FROM daily_article_keyword WHERE company_name = ? AND date_key = ?", day_keys)
+                conn.executemany("""
+                    INSERT OR REPLACE INTO daily_keyword_aggregate
+                    (company_name, date_key, source_version, news_count, keyword_counts, created_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, aggregate_rows)
+                conn.executemany("""
+                    INSERT INTO daily_article (company_name, date_key, source, row_id, title, date, url, keywords)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, article_rows)
+                conn.executemany("""
+                    INSERT INTO daily_article_keyword (company_name, date_key, keyword, source, row_id)
+                    VALUES (?, ?, ?, ?, ?)
+                """, keyword_rows)
+            self.computed_days += len(aggregate_rows)
+            logger.info(f"💾 일별 집계 저장: {company_name} {len(aggregate_rows)}일 (기사 {len(article_rows)}개)")
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ 일별 집계 저장 실패: {e}")
+            return False
+    
+    def select_top_articles(self, company_name: str, start_date: str, end_date: str, top_keywords_list: List[str],
+                            max_articles: int = 10) -> Optional[pd.DataFrame]:
+        """
+        기간 내 저장된 기사 중 상위 키워드와 매칭되는 개수가 많은 기사 max_articles개를 읽습니다.
+        
+        기간의 고유 키워드만 상위 키워드와 매칭한 뒤, 점수 계산과 정렬(개수 내림차순, 동률은 원본 위치 순)은
+        키워드 색인에서 SQLite가 수행하므로 선택된 기사만 읽습니다.
+        
+        Returns:
+            pd.DataFrame: 원본 위치 순으로 정렬된 후보 기사 (PandasAnalyzer.extract_top_news_articles 입력 형식),
+            조회 실패 시 None
+        """
+        if not self.is_enabled():
+            return None
+        
+        try:
+            conn = self._get_connection()
+            date_range = (company_name, int(start_date), int(end_date))
+            
+            vocabulary = [row[0] for row in conn.execute("""
+                SELECT DISTINCT keyword FROM daily_article_keyword
+                WHERE company_name = ? AND date_key BETWEEN ? AND ?
+            """, date_range)]
+            matcher = KeywordMatcher(top_keywords_list)
+            matches = [(token, idx) for token in vocabulary for idx in matcher.match_token(token)]
+            
+            with conn:
+                conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS top_keyword_match (
+                        keyword TEXT NOT NULL,
+                        keyword_idx INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("DELETE FROM temp.top_keyword_match")
+                conn.executemany("INSERT INTO temp.top_keyword_match VALUES (?, ?)", matches)
+            
+            rows = conn.execute("""
+                WITH ranked AS (
+                    SELECT p.date_key, p.source, p.row_id, COUNT(DISTINCT m.keyword_idx) AS score
+                    FROM daily_article_keyword p
+                    JOIN temp.top_keyword_match m ON m.keyword = p.keyword
+                    WHERE p.company_name = ? AND p.date_key BETWEEN ? AND ?
+                    GROUP BY p.date_key, p.source, p.row_id
+                    ORDER BY score DESC, p.source, p.row_id
+                    LIMIT ?
+                )
+                SELECT a.source, a.row_id, a.title, a.date, a.url, a.keywords
+                FROM ranked
+                JOIN daily_article a
+                  ON a.company_name = ? AND a.date_key = ranked.date_key
+                 AND a.source = ranked.source AND a.row_id = ranked.row_id
+                ORDER BY a.source, a.row_id
+            """, (*date_range, max_articles, company_name)).fetchall()
+        
+        except Exception as e:
+            logger.error(f"❌ 일별 집계 상위 기사 조회 실패: {e}")
+            return None
+        
+        articles_df = pd.DataFrame(
+            [[source, row_id, title, date, url, json.loads(keywords)] for source, row_id, title, date, url, keywords in rows],
+            columns=ARTICLE_COLUMNS
+        )
+        # 키워드는 모두 목록 컬럼에 있으므로 원본 문자열 컬럼은 비워 둠
+        articles_df['키워드'] = None
+        return articles_df
+    
+    def clear(self, company_name: Optional[str] = None) -> int:
+        """저장된 집계 삭제 (기업명을 주면 해당 기업만)"""
+        if not self.is_enabled():
+            return 0
+        
+        try:
+            conn = self._get_connection()
+            with conn:
+                if company_name is None:
+                    conn.execute("DELETE FROM daily_article")
+                    conn.execute("DELETE FROM daily_article_keyword")
+                    cursor = conn.execute("DELETE FROM daily_keyword_aggregate")
+                else:
+                    conn.execute("DELETE FROM daily_article WHERE company_name = ?", (company_name,))
+                    conn.execute("DELETE FROM daily_article_keyword WHERE company_name = ?", (company_name,))
+                    cursor = conn.execute("DELETE FROM daily_keyword_aggregate WHERE company_name = ?", (company_name,))
+            return cursor.rowcount
+        
+        except Exception as e:
+            logger.error(f"❌ 일별 집계 삭제 실패: {e}")
+            return 0
+    
+    def get_stats(self) -> Dict:
+        """저장소 통계"""
+        stats = {
+            "enabled": self.is_enabled(),
+            "hit_days": self.hit_days,
+            "computed_days": self.computed_days,
+            "stale_days": self.stale_days,
+        }
+        if not self.is_enabled():
+            return stats
+        
+        try:
+            row = self._get_connection().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT company_name) FROM daily_keyword_aggregate"
+            ).fetchone()
+            stats["stored_days"] = row[0]
+            stats["companies"] = row[1]
+            stats["stored_articles"] = self._get_connection().execute("SELECT COUNT(*) FROM daily_article").fetchone()[0]
+        except Exception as e:
+            logger.warning(f"일별 집계 통계 조회 실패: {e}")
+        return stats
+    
+    def close(self):
+        """모든 연결 종료"""
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.debug(f"일별 집계 DB 연결 종료 실패: {e}")
+        self._local = threading.local()
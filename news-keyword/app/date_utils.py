@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+날짜 정규화 유틸리티
+뉴스 날짜 컬럼의 형식을 한 번 감지한 뒤 정수형 YYYYMMDD(date_key)로 일괄 변환합니다.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 날짜로 사용할 수 있는 컬럼 (앞쪽 우선)
+DATE_COLUMN_CANDIDATES = ['일자', '날짜', 'date', 'Date', 'DATE']
+
+# 정규화된 날짜 컬럼명 (정수형 YYYYMMDD)
+DATE_KEY_COLUMN = 'date_key'
+
+# 지원하는 날짜 형식
+DATE_FORMATS = [
+    "%Y%m%d",             # 20210811
+    "%Y-%m-%d",           # 2021-08-11
+    "%Y/%m/%d",           # 2021/08/11
+    "%Y.%m.%d",           # 2021.08.11
+    "%Y-%m-%d %H:%M:%S",  # 2021-08-11 10:30:00
+    "%Y/%m/%d %H:%M:%S",  # 2021/08/11 10:30:00
+]
+
+# 형식 감지에 사용할 샘플 개수
+FORMAT_SAMPLE_SIZE = 100
+
+
+def find_date_column(columns: Iterable[str]) -> Optional[str]:
+    """날짜 관련 컬럼명을 찾습니다."""
+    columns = set(columns)
+    for col in DATE_COLUMN_CANDIDATES:
+        if col in columns:
+            return col
+    return None
+
+
+def _to_date_strings(values: pd.Series) -> pd.Series:
+    """날짜 값을 공백 제거된 문자열로 변환합니다. (20210811.0 같은 숫자형도 처리)"""
+    if pd.api.types.is_numeric_dtype(values):
+        values = values.astype('Int64')
+    return values.astype(str).str.strip()
+
+
+def detect_date_format(values: pd.Series) -> Optional[str]:
+    """
+    샘플 값으로 날짜 형식을 감지합니다.
+
+    Returns:
+        str: 샘플 전체를 파싱할 수 있는 첫 번째 형식, 없으면 None
+    """
+    sample = values.dropna().head(FORMAT_SAMPLE_SIZE)
+    if sample.empty:
+        return None
+
+    for fmt in DATE_FORMATS:
+        if pd.to_datetime(sample, format=fmt, errors='coerce').notna().all():
+            return fmt
+    return None
+
+
+def to_date_key(values: pd.Series) -> pd.Series:
+    """
+    날짜 컬럼을 정수형 YYYYMMDD 컬럼으로 일괄 변환합니다.
+
+    감지된 형식으로 전체를 한 번에 변환하고, 실패한 행에 대해서만
+    나머지 형식을 순서대로 (역시 벡터 연산으로) 시도합니다.
+
+    Returns:
+        pd.Series: Int32 타입 date_key (파싱 실패 시 결측값)
+    """
+    strings = _to_date_strings(values)
+    detected = detect_date_format(strings[values.notna()])
+
+    formats = DATE_FORMATS
+    if detected is not None:
+        formats = [detected] + [fmt for fmt in DATE_FORMATS if fmt != detected]
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    remaining = values.notna()
+
+    for fmt in formats:
+        if not remaining.any():
+            break
+        parsed_part = pd.to_datetime(strings[remaining], format=fmt, errors='coerce')
+        parsed.loc[parsed_part.index] = parsed_part
+        remaining = remaining & parsed.isna()
+
+    date_key = parsed.dt.year * 10000 + parsed.dt.month * 100 + parsed.dt.day
+    return date_key.astype('Int32')
+
+
+def fill_daily_counts(counts: pd.Series, start_date: str, end_date: str) -> Dict[str, int]:
+    """
+    date_key별 개수를 기간 내 모든 날짜의 {"YYYYMMDD": 개수} 딕셔너리로 만듭니다. (뉴스가 없는 날은 0)
+    
+    Args:
+        counts: date_key(int)를 인덱스로 갖는 개수 Series
+        start_date: 시작 날짜 (YYYYMMDD)
+        end_date: 종료 날짜 (YYYYMMDD)
+    """
+    day_range = pd.date_range(
+        pd.to_datetime(start_date, format="%Y%m%d"),
+        pd.to_datetime(end_date, format="%Y%m%d"),
+        freq='D'
+    )
+    day_keys = day_range.year * 10000 + day_range.month * 100 + day_range.day
+    counts = counts.reindex(day_keys, fill_value=0)
+    
+    return {str(day_key): int(count) for day_key, count in counts.items()}
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+분석 엔진 선택기
+파일 크기 고정 임계값 대신 캐시/저장소 상태, 기관 역색인 선택도, 가용 코어 수로
+엔진별 예상 처리 시간을 계산하고, 실제 처리 시간 기록(벤치마크 로그)으로 예측을 보정합니다.
+"""
+
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 엔진 이름
+ENGINE_PANDAS = "pandas"
+ENGINE_SPARK = "spark"
+ENGINE_MULTIPROCESS = "multiprocess"
+
+# 학습 이력이 없을 때 사용하는 기본 처리량 (bytes/sec, 코어당)
+DEFAULT_NETWORK_THROUGHPUT = 80 * 1024**2   # S3 CSV 다운로드
+DEFAULT_CSV_THROUGHPUT = 40 * 1024**2       # CSV 파싱 + 필터링/집계
+DEFAULT_LOCAL_THROUGHPUT = 400 * 1024**2    # 로컬 캐시/저장소 읽기 + 필터링/집계
+
+# 엔진별 고정 비용 (초)
+DEFAULT_SPARK_STARTUP_SECONDS = 30.0   # SparkSession이 없을 때 생성 비용
+DEFAULT_SPARK_JOB_SECONDS = 3.0        # Spark 작업 계획/스케줄링 비용
+DEFAULT_PROCESS_POOL_SECONDS = 1.0     # 프로세스 풀 작업 분배/결과 병합 비용
+
+# 동시에 내려받을 때 네트워크 처리량이 늘어나는 최대 배수
+NETWORK_PARALLELISM = 4
+
+# 보정에 사용할 엔진별 최근 기록 수 / 보정을 시작할 최소 기록 수
+BENCHMARK_HISTORY_SIZE = 50
+MIN_SAMPLES_FOR_LEARNING = 3
+
+# 벤치마크 로그에 남길 엔진별 최근 기록 수 (넘으면 파일을 다시 써서 오래된 기록 삭제)
+BENCHMARK_LOG_RECORDS_PER_ENGINE = BENCHMARK_HISTORY_SIZE * 4
+
+
+@dataclass
+class FileProfile:
+    """엔진 선택에 사용하는 파일 정보"""
+    path: str
+    size_bytes: int
+    cached: bool = False                 # CSV 캐시에 있음
+    ingested: bool = False               # 뉴스 저장소에 인제스트됨
+    row_count: int = 0                   # 저장소 행 수
+    matched_rows: Optional[int] = None   # 기관 역색인으로 찾은 기업 행 수 (모르면 None)
+    
+    @property
+    def selectivity(self) -> float:
+        """기업 행 비율 (역색인 조회 결과가 없으면 1.0)"""
+        if self.matched_rows is None or self.row_count <= 0:
+            return 1.0
+        return min(1.0, self.matched_rows / self.row_count)
+
+
+@dataclass
+class EnginePlan:
+    """엔진 선택 결과"""
+    engine: str
+    estimates: Dict[str, float]                                   # 보정된 예상 시간 (초)
+    raw_estimates: Dict[str, float] = field(default_factory=dict)  # 보정 전 예상 시간 (초)
+    features: Dict[str, float] = field(default_factory=dict)
+    reason: str = ""
+
+
+class EnginePlanner:
+    """비용 기반 분석 엔진 선택기"""
+    
+    def __init__(self, log_path: Optional[str] = None):
+        """
+        초기화
+        
+        Args:
+            log_path: 벤치마크 로그(JSONL) 경로 (기본값: ENGINE_BENCHMARK_LOG 또는 ./engine_benchmarks.jsonl)
+        """
+        self.log_path = log_path or os.getenv('ENGINE_BENCHMARK_LOG', './engine_benchmarks.jsonl')
+        self.forced_engine = os.getenv('ANALYSIS_ENGINE')  # 지정 시 해당 엔진 고정 사용
+        
+        # 엔진 이름 → 사용 가능 여부 확인 함수
+        self.engines: Dict[str, Callable[[], bool]] = {ENGINE_PANDAS: lambda: True}
+        
+        # 엔진별 최근 (실제 시간 / 예상 시간) 비율
+        self._ratios: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        
+        # 로그 파일의 엔진별 기록 수 (정리 시점 판단용)
+        self._log_counts: Dict[str, int] = {}
+        
+        self._load_history()
+    
+    def register_engine(self, name: str, is_available: Callable[[], bool]):
+        """선택 대상 엔진 등록"""
+        self.engines[name] = is_available
+    
+    def _load_history(self):
+        """벤치마크 로그에서 엔진별 보정 비율을 읽습니다. (엔진별 최근 기록만 남도록 로그 정리)"""
+        if not os.path.exists(self.log_path):
+            return
+        
+        try:
+            records = self._read_log()
+            for record in records:
+                if record.get('success', True):
+                    self._add_ratio(record.get('engine'), record.get('raw_estimate_seconds'), record.get('actual_seconds'))
+            
+            self._compact_log(records)
+            
+            loaded = {engine: len(ratios) for engine, ratios in self._ratios.items()}
+            logger.info(f"📈 엔진 벤치마크 이력 로드: {loaded}")
+        
+        except Exception as e:
+            logger.warning(f"엔진 벤치마크 이력 로드 실패: {e}")
+    
+    def _read_log(self) -> List[Dict]:
+        """벤치마크 로그의 기록 목록 (깨진 줄은 무시)"""
+        records = []
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
+    
+    def _compact_log(self, records: List[Dict]):
+        """
+        엔진별 최근 BENCHMARK_LOG_RECORDS_PER_ENGINE개만 남기고 로그를 다시 씁니다.
+        (로그가 계속 커지지 않도록, 임시 파일에 쓴 뒤 교체)
+        """
+        counts: Dict[str, int] = {}
+        kept = []
+        for record in reversed(records):
+            engine = record.get('engine') or ""
+            if counts.get(engine, 0) >= BENCHMARK_LOG_RECORDS_PER_ENGINE:
+                continue
+            counts[engine] = counts.get(engine, 0) + 1
+            kept.append(record)
+        self._log_counts = counts
+        
+        if len(kept) == len(records):
+            return
+        
+        tmp_path = f"{self.log_path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in reversed(kept):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.log_path)
+        logger.info(f"📈 엔진 벤치마크 로그 정리: {len(records)}개 → {len(kept)}개")
+    
+    def _add_ratio(self, engine: Optional[str], raw_estimate: Optional[float], actual: Optional[float]):
+        """보정 비율 추가 (비정상 값은 무시)"""
+        if not engine or not raw_estimate or actual is None or raw_estimate <= 0 or actual <= 0:
+            return
+        self._ratios.setdefault(engine, deque(maxlen=BENCHMARK_HISTORY_SIZE)).append(actual / raw_estimate)
+    
+    def _correction(self, engine: str) -> float:
+        """엔진별 보정 배수 (최근 실제/예상 비율의 중앙값)"""
+        ratios = self._ratios.get(engine)
+        if not ratios or len(ratios) < MIN_SAMPLES_FOR_LEARNING:
+            return 1.0
+        return statistics.median(ratios)
+    
+    @staticmethod
+    def available_cores() -> int:
+        """현재 부하를 제외한 사용 가능한 코어 수"""
+        cpu_count = os.cpu_count() or 1
+        try:
+            load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            load = 0.0
+        return max(1, int(round(cpu_count - load)))
+    
+    def _estimate(self, engine: str, files: List[FileProfile], cores: int, spark_ready: bool, spark_cores: int) -> float:
+        """엔진별 보정 전 예상 처리 시간 (초)"""
+        # 저장소 파일은 역색인으로 기업 행만 읽고, 캐시 파일은 로컬 전체를 읽음
+        store_bytes = sum(f.size_bytes * f.selectivity for f in files if f.ingested)
+        cached_bytes = sum(f.size_bytes for f in files if f.cached and not f.ingested)
+        remote_bytes = sum(f.size_bytes for f in files if not f.cached and not f.ingested)
+        
+        if engine == ENGINE_SPARK:
+            # Spark는 CSV 캐시를 쓰지 않고 S3에서 직접 읽으며, multiline CSV는 파일 단위로만 병렬 처리됨
+            csv_bytes = cached_bytes + remote_bytes
+            csv_files = sum(1 for f in files if not f.ingested)
+            csv_parallelism = max(1, min(spark_cores, csv_files))
+            startup = 0.0 if spark_ready else DEFAULT_SPARK_STARTUP_SECONDS
+            return (
+                startup + DEFAULT_SPARK_JOB_SECONDS
+                + csv_bytes / (DEFAULT_CSV_THROUGHPUT * csv_parallelism)
+                + store_bytes / (DEFAULT_LOCAL_THROUGHPUT * spark_cores)
+            )
+        
+        local_seconds = (cached_bytes + store_bytes) / DEFAULT_LOCAL_THROUGHPUT
+        remote_seconds = remote_bytes / DEFAULT_CSV_THROUGHPUT
+        network_seconds = remote_bytes / DEFAULT_NETWORK_THROUGHPUT
+        
+        if engine == ENGINE_MULTIPROCESS:
+            # 파일 단위 샤드를 프로세스 풀에 분배
+            parallelism = max(1, min(cores, len(files)))
+            return (
+                DEFAULT_PROCESS_POOL_SECONDS
+                + (local_seconds + remote_seconds) / parallelism
+                + network_seconds / min(parallelism, NETWORK_PARALLELISM)
+            )
+        
+        return local_seconds + remote_seconds + network_seconds
+    
+    def plan(self, files: List[FileProfile], spark_ready: bool = False, spark_cores: Optional[int] = None) -> EnginePlan:
+        """
+        엔진별 예상 처리 시간을 계산하여 가장 빠른 엔진을 선택합니다.
+        
+        Args:
+            files: 처리할 파일 정보 목록
+            spark_ready: SparkSession이 이미 생성되어 있는지 여부
+            spark_cores: Spark가 사용할 코어 수 (기본값: 사용 가능한 로컬 코어 수)
+        
+        Returns:
+            EnginePlan: 선택된 엔진과 엔진별 예상 시간
+        """
+        cores = self.available_cores()
+        spark_cores = spark_cores or cores
+        
+        features = {
+            "file_count": len(files),
+            "total_bytes": sum(f.size_bytes for f in files),
+            "cached_files": sum(1 for f in files if f.cached),
+            "ingested_files": sum(1 for f in files if f.ingested),
+            "matched_rows": sum(f.matched_rows or 0 for f in files if f.ingested),
+            "store_rows": sum(f.row_count for f in files if f.ingested),
+            "available_cores": cores,
+            "spark_ready": spark_ready,
+        }
+        
+        raw_estimates = {}
+        estimates = {}
+        with self._lock:
+            for engine, is_available in self.engines.items():
+                try:
+                    if not is_available():
+                        continue
+                except Exception:
+                    continue
+                raw_estimates[engine] = self._estimate(engine, files, cores, spark_ready, spark_cores)
+                estimates[engine] = raw_estimates[engine] * self._correction(engine)
+        
+        if self.forced_engine in estimates:
+            engine = self.forced_engine
+            reason = f"ANALYSIS_ENGINE={self.forced_engine} 지정"
+        else:
+            engine = min(estimates, key=estimates.get)
+            reason = ", ".join(f"{name} {seconds:.1f}초" for name, seconds in sorted(estimates.items(), key=lambda x: x[1]))
+        
+        return EnginePlan(engine=engine, estimates=estimates, raw_estimates=raw_estimates, features=features, reason=reason)
+    
+    def record(self, plan: EnginePlan, engine: str, actual_seconds: float, success: bool = True):
+        """
+        실제 처리 시간을 벤치마크 로그에 기록하고 보정 비율에 반영합니다.
+        
+        Args:
+            plan: 선택 시점의 계획
+            engine: 실제로 사용된 엔진 (폴백 시 계획과 다를 수 있음)
+            actual_seconds: 실제 처리 시간 (초)
+            success: 처리 성공 여부 (실패한 실행은 학습에 사용하지 않음)
+        """
+        record = {
+            "timestamp": time.time(),
+            "planned_engine": plan.engine,
+            "engine": engine,
+            "estimate_seconds": plan.estimates.get(engine),
+            "raw_estimate_seconds": plan.raw_estimates.get(engine),
+            "actual_seconds": actual_seconds,
+            "success": success,
+            "features": plan.features,
+        }
+        
+        with self._lock:
+            if success:
+                self._add_ratio(engine, record["raw_estimate_seconds"], actual_seconds)
+            
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                
+                # 엔진별 기록이 한도의 두 배가 되면 최근 기록만 남김 (매 기록마다 다시 쓰지 않도록)
+                self._log_counts[engine] = self._log_counts.get(engine, 0) + 1
+                if self._log_counts[engine] >= BENCHMARK_LOG_RECORDS_PER_ENGINE * 2:
+                    self._compact_log(self._read_log())
+            except Exception as e:
+                logger.warning(f"엔진 벤치마크 기록 실패: {e}")
+        
+        estimate = record["estimate_seconds"]
+        estimate_text = f"{estimate:.1f}초" if estimate is not None else "없음"
+        logger.info(f"📈 엔진 벤치마크: {engine} 실제 {actual_seconds:.1f}초 (예상 {estimate_text})")
+    
+    def get_stats(self) -> Dict:
+        """엔진별 보정 배수와 기록 수"""
+        with self._lock:
+            return {
+                engine: {"samples": len(ratios), "correction": round(self._correction(engine), 3)}
+                for engine, ratios in self._ratios.items()
+            }
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+API 요청 실행 계층
+키워드 추출처럼 오래 걸리는 동기 작업과 SQLite/S3 같은 짧은 블로킹 I/O를
+각각 크기가 제한된 스레드 풀에서 실행해 asyncio 이벤트 루프가 멈추지 않도록 합니다.
+무거운 작업은 동시 실행 + 대기 수를 제한(초과 시 즉시 거절)하고 요청별 제한 시간을 둡니다.
+
+두 풀 모두 스레드 풀이므로 Pandas 엔진의 CPU 작업은 GIL 때문에 사실상 한 번에 하나씩 실행됩니다.
+이 계층이 주는 것은 이벤트 루프 보호와 수락 제어(과부하 시 빠른 503)뿐이며, 여러 코어를 쓰는
+병렬 처리는 엔진 선택기가 고르는 멀티프로세스/Spark 엔진이 담당합니다.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionRejected(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음 (HTTP 503)"""
+    pass
+
+
+class ExecutionPool:
+    """무거운 작업/블로킹 I/O 실행 풀 + 수락 제어"""
+    
+    def __init__(self, max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None,
+                 timeout_seconds: Optional[float] = None,
+                 io_workers: Optional[int] = None):
+        """
+        초기화
+        
+        Args:
+            max_workers: 동시에 실행할 무거운 작업 수 (스레드 수, 기본값: EXECUTION_WORKERS 또는 4)
+            max_pending: 실행 대기할 수 있는 무거운 작업 수 (기본값: EXECUTION_MAX_PENDING 또는 16)
+            timeout_seconds: 요청별 기본 제한 시간 (기본값: EXECUTION_TIMEOUT 또는 300초)
+            io_workers: 블로킹 I/O 스레드 수 (기본값: EXECUTION_IO_WORKERS 또는 16)
+        """
+        self.max_workers = max_workers or int(os.getenv('EXECUTION_WORKERS', '4'))
+        self.max_pending = max_pending if max_pending is not None else int(os.getenv('EXECUTION_MAX_PENDING', '16'))
+        self.timeout_seconds = timeout_seconds or float(os.getenv('EXECUTION_TIMEOUT', '300'))
+        self.io_workers = io_workers or int(os.getenv('EXECUTION_IO_WORKERS', '16'))
+        
+        # CPU/메모리를 많이 쓰는 분석은 작은 풀, 짧은 I/O는 별도 풀 (분석이 밀려도 캐시 조회는 진행)
+        # 분석 풀도 스레드 풀이라 Pandas 작업끼리는 GIL을 나눠 쓰므로 max_workers는 처리량이 아니라 동시 수락 한도임
+        # (병렬 처리는 Spark/멀티프로세스 엔진이 이 스레드에서 각자의 클러스터/프로세스 풀로 작업을 넘길 때만 일어남)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract")
+        self._io_executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="blocking-io")
+        
+        # 실행 중 + 대기 중인 무거운 작업 수 (제한 시간으로 응답한 뒤에도 실제로 끝날 때까지 유지)
+        self._admitted = 0
+        self._lock = threading.Lock()
+        
+        # 통계
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failed = 0
+    
+    def _release(self, future):
+        """작업 종료 시 수락 슬롯 반환 (스레드 풀 완료 콜백)"""
+        with self._lock:
+            self._admitted -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+    
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        무거운 동기 작업을 실행 풀에 넣습니다. (스트리밍 응답처럼 수락 여부를 먼저 알아야 할 때 사용)
+        
+        Raises:
+            ExecutionRejected: 실행 + 대기 작업이 한도를 넘은 경우
+        """
+        with self._lock:
+            if self._admitted >= self.max_workers + self.max_pending:
+                self.rejected += 1
+                raise ExecutionRejected(
+                    f"처리 중인 요청이 너무 많습니다 (실행 {self.max_workers}개 + 대기 {self.max_pending}개)"
+                )
+            self._admitted += 1
+        
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._admitted -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+    
+    async def wait(self, future: Future, timeout: Optional[float] = None):
+        """
+        submit한 작업의 결과를 기다립니다.
+        
+        Raises:
+            asyncio.TimeoutError: 제한 시간 안에 끝나지 않은 경우 (작업은 백그라운드에서 마저 실행됨)
+        """
+        try:
+            # 제한 시간 초과 시 시작 전인 작업은 취소되고, 이미 시작된 작업은 끝까지 실행됨
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout_seconds)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+    
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        무거운 동기 작업을 실행 풀에서 실행합니다.
+        
+        Raises:
+            ExecutionRejected: 실행 + 대기 작업이 한도를 넘은 경우
+            asyncio.TimeoutError: 제한 시간 안에 끝나지 않은 경우 (작업은 백그라운드에서 마저 실행됨)
+        """
+        return await self.wait(self.submit(func, *args, **kwargs), timeout)
+    
+    async def run_io(self, func: Callable, *args, **kwargs):
+        """짧은 블로킹 I/O(SQLite, 파일, S3 조회)를 I/O 풀에서 실행합니다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, lambda: func(*args, **kwargs))
+    
+    def get_stats(self) -> Dict:
+        """실행 풀 상태"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "admitted": self._admitted,
+                "running": min(self._admitted, self.max_workers),
+                "pending": max(0, self._admitted - self.max_workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "failed": self.failed,
+                "timeout_seconds": self.timeout_seconds,
+            }
+    
+    def shutdown(self):
+        """실행 풀 정리 (대기 중인 작업은 취소)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 전역 실행 풀 인스턴스 (프로세스당 하나)
+execution_pool = None
+
+def get_execution_pool() -> ExecutionPool:
+    """실행 풀 인스턴스 반환"""
+    global execution_pool
+    if execution_pool is None:
+        execution_pool = ExecutionPool()
+    return execution_pool
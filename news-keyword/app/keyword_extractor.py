@@ -1,5 +1,6 @@
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 import os
+import time
 import logging
 import pandas as pd
 import re
@@ -7,11 +8,19 @@ import glob
 import boto3
 from datetime import datetime, timedelta
 from collections import Counter
-from pyspark.sql import SparkSession
 from pyspark.sql.functions import col, split, explode, count, collect_list, when, size, slice, regexp_replace, trim, length, lower
 from smart_keyword_filter import SmartKeywordFilter
 from spark_analyzer import SparkAnalyzer
+from spark_session_manager import get_spark_session_manager
+from engine_planner import EnginePlanner, EnginePlan, FileProfile, ENGINE_PANDAS, ENGINE_SPARK, ENGINE_MULTIPROCESS
 from pandas_analyzer import PandasAnalyzer
+from multiprocess_analyzer import MultiprocessAnalyzer
+from keyword_matcher import KeywordMatcher
+from keyword_utils import notify_progress
+from s3_prefetcher import S3Prefetcher
+from s3_catalog import S3Catalog
+from single_flight import SingleFlight
+from daily_aggregate_store import DailyAggregateStore, iter_date_keys, group_consecutive_days, merge_daily_partials
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -38,143 +47,137 @@ class KeywordExtractor:
             aws_session_token=os.getenv('AWS_SESSION_TOKEN')
         )
         
+        # S3 객체 목록 캐시 (요청마다 전체 목록/HEAD 조회를 하지 않도록)
+        self.s3_catalog = S3Catalog(self.s3_client, self.s3_bucket, self.s3_prefix)
+        
         # 분석기 초기화
         self.pandas_analyzer = PandasAnalyzer()
+        self.s3_prefetcher = S3Prefetcher(self.s3_client, self.s3_bucket)
+        self.pandas_analyzer.prefetcher = self.s3_prefetcher
+        self.pandas_analyzer.csv_cache.catalog = self.s3_catalog  # 캐시 항목을 원본 ETag/크기로 검증
+        self.pandas_analyzer.news_store.catalog = self.s3_catalog  # 저장소 항목도 원본 ETag/크기로 검증
+        self.s3_prefetcher.catalog = self.s3_catalog  # 스테이징 파일도 원본 ETag로 구분
         self.spark_analyzer = None  # Spark 초기화 후 설정
+        self.spark_manager = get_spark_session_manager()
+        
+        # 비용 기반 엔진 선택기 (상시 클러스터 사용 시 SPARK_CLUSTER_CORES로 클러스터 코어 수 지정)
+        self.engine_planner = EnginePlanner()
+        # Spark 생성/warm-up이 실패하면 SPARK_RETRY_SECONDS 동안 선택 대상에서 제외 (세션이 살아 있으면 항상 후보)
+        self.spark_retry_seconds = float(os.getenv('SPARK_RETRY_SECONDS', '600'))
+        self._spark_failed_at = None
+        self.engine_planner.register_engine(ENGINE_SPARK, self.is_spark_available)
+        self.multiprocess_analyzer = MultiprocessAnalyzer(pandas_analyzer=self.pandas_analyzer)
+        self.engine_planner.register_engine(ENGINE_MULTIPROCESS, self.multiprocess_analyzer.is_available)
+        self.spark_cores = int(os.getenv('SPARK_CLUSTER_CORES', '0')) or None
+        
+        # 기업별 일 단위 부분 집계 (기간이 겹치는 요청은 없는 날짜만 계산)
+        self.daily_store = DailyAggregateStore()
+        
+        # 동시에 들어온 같은 기업/기간 요청은 기본 추출을 한 번만 실행
+        self.single_flight = SingleFlight()
         
     def initialize_spark(self):
-        """SparkSession 초기화 (Java 11과 PySpark 3.3.0 호환성 최적화)"""
-        if self.spark is None:
+        """SparkSession 초기화 (warm-up된 세션이 있으면 재사용)"""
+        if self.spark is None or not self.spark_manager.is_alive():
             try:
-                import os
-                
-                # Java 환경 변수 확인 및 설정 (Java 8 사용)
-                java_home = os.environ.get('JAVA_HOME')
-                if not java_home:
-                    os.environ['JAVA_HOME'] = '/usr/lib/jvm/java-8-openjdk-amd64'
-                    logger.info(f"JAVA_HOME 설정: {os.environ['JAVA_HOME']}")
-                
-                # SPARK_HOME 환경 변수 설정
-                spark_home = os.environ.get('SPARK_HOME')
-                if not spark_home:
-                    os.environ['SPARK_HOME'] = '/usr/local/lib/python3.9/dist-packages/pyspark'
-                    logger.info(f"SPARK_HOME 설정: {os.environ['SPARK_HOME']}")
+                self.spark = self.spark_manager.get_session()
                 
-                # PySpark Python 실행 파일 설정
-                os.environ['PYSPARK_PYTHON'] = '/usr/bin/python'
-                os.environ['PYSPARK_DRIVER_PYTHON'] = '/usr/bin/python'
-                
-                print(f"AWS_ACCESS_KEY_ID: {os.getenv('AWS_ACCESS_KEY_ID', 'NOT_SET')}")
-                print(f"AWS_SECRET_ACCESS_KEY: {'SET' if os.getenv('AWS_SECRET_ACCESS_KEY') else 'NOT_SET'}")
-                
-                self.spark = SparkSession.builder \
-                    .appName("NewsKeywordAPI") \
-                    .master("local[*]") \
-                    .config("spark.driver.memory", "2g") \
-                    .config("spark.driver.maxResultSize", "1g") \
-                    .config("spark.executor.memory", "2g") \
-                    .config("spark.sql.adaptive.enabled", "true") \
-                    .config("spark.sql.adaptive.coalescePartitions.enabled", "true") \
-                    .config("spark.serializer", "org.apache.spark.serializer.KryoSerializer") \
-                    .config("spark.sql.adaptive.skewJoin.enabled", "true") \
-                    .config("spark.sql.execution.arrow.pyspark.enabled", "false") \
-                    .config("spark.sql.execution.arrow.enabled", "false") \
-                    .config("spark.sql.shuffle.partitions", "200") \
-                    .config("spark.default.parallelism", "4") \
-                    .config("spark.driver.host", "localhost") \
-                    .config("spark.driver.bindAddress", "0.0.0.0") \
-                    .config("spark.ui.enabled", "false") \
-                    .config("spark.ui.showConsoleProgress", "false") \
-                    .config("spark.jars.packages", 
-                            "org.apache.hadoop:hadoop-aws:3.3.4,"
-                            "com.amazonaws:aws-java-sdk-bundle:1.12.262") \
-                    .config("spark.hadoop.fs.s3a.access.key", os.getenv('AWS_ACCESS_KEY_ID')) \
-                    .config("spark.hadoop.fs.s3a.secret.key", os.getenv('AWS_SECRET_ACCESS_KEY')) \
-                    .config("spark.hadoop.fs.s3a.endpoint", f"s3.{self.s3_region}.amazonaws.com") \
-                    .config("spark.hadoop.fs.s3a.impl", "org.apache.hadoop.fs.s3a.S3AFileSystem") \
-                    .getOrCreate()
-                
-                # 로그 레벨 설정 (너무 많은 로그 방지)
-                self.spark.sparkContext.setLogLevel("WARN")
-                
-                # Java 버전 확인
-                java_version = self.spark.sparkContext._jvm.System.getProperty("java.version")
-                logger.info(f"SparkSession 초기화 성공! Java 버전: {java_version}")
-                
-                # SparkAnalyzer 초기화
-                self.spark_analyzer = SparkAnalyzer(self.spark, self.s3_bucket, self.s3_prefix)
+                # SparkAnalyzer 초기화 (뉴스 저장소는 이 서버의 로컬 디스크라 local 모드에서만 사용, 클러스터는 S3에서 읽음)
+                news_store = self.pandas_analyzer.news_store if self.spark_manager.master_url.startswith('local') else None
+                self.spark_analyzer = SparkAnalyzer(self.spark, self.s3_bucket, self.s3_prefix, news_store=news_store)
                 
             except Exception as e:
                 logger.error(f"SparkSession 초기화 실패: {e}")
                 logger.info("Java 버전 호환성 문제일 가능성이 높습니다.")
                 # pandas 백업 플랜 사용을 위해 spark를 None으로 유지
                 self.spark = None
+                self.spark_analyzer = None
+                self._spark_failed_at = time.time()
                 raise
+            
+            self._spark_failed_at = None
+    
+    def is_spark_available(self) -> bool:
+        """
+        엔진 선택기에서 Spark를 후보로 둘지 확인합니다.
+        세션이 살아 있으면 사용 가능, 최근 생성/warm-up이 실패했으면 재시도 간격 동안 사용 불가,
+        아직 시도하지 않았으면 생성 비용을 포함해 후보로 둡니다.
+        """
+        if self.spark_manager.is_alive():
+            return True
+        if self._spark_failed_at is None:
+            return True
+        return time.time() - self._spark_failed_at >= self.spark_retry_seconds
+    
+    def warm_up_spark(self) -> bool:
+        """API 시작 시 SparkSession을 미리 생성하고 상태를 확인합니다."""
+        if not self.spark_manager.warm_up():
+            self._spark_failed_at = time.time()
+            logger.warning(f"⚠️ SparkSession warm-up 실패 - {self.spark_retry_seconds:.0f}초 동안 Spark 엔진을 선택하지 않습니다.")
+            return False
+        
+        try:
+            self.initialize_spark()
+            return True
+        except Exception:
+            return False
     
     def find_csv_files(self, start_date: str, end_date: str) -> List[str]:
         """
         날짜 범위에 해당하는 CSV 파일들을 S3에서 찾습니다.
-        S3 버킷에서 해당 기간의 모든 CSV 파일을 반환합니다.
+        S3 카탈로그(목록 캐시 + 기간 인덱스)에서 해당 기간과 겹치는 모든 CSV 파일을 반환합니다.
         """
-        
-        # 입력 날짜를 datetime 객체로 변환
-        start_dt = datetime.strptime(start_date, "%Y%m%d")
-        end_dt = datetime.strptime(end_date, "%Y%m%d")
-        
-        matching_files = []
-        
         try:
-            # S3에서 객체 목록 가져오기
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(
-                Bucket=self.s3_bucket,
-                Prefix=self.s3_prefix
-            )
-            
-            for page in page_iterator:
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        key = obj['Key']
-                        
-                        # CSV 파일만 필터링
-                        if key.endswith('.csv'):
-                            filename = os.path.basename(key)
-                            
-                            try:
-                                # NewsResult_YYYYMMDD-YYYYMMDD.csv 형식에서 날짜 추출
-                                if filename.startswith('NewsResult_'):
-                                    date_part = filename.replace("NewsResult_", "").replace(".csv", "")
-                                    
-                                    if "-" in date_part:
-                                        file_start_str, file_end_str = date_part.split("-")
-                                        file_start_dt = datetime.strptime(file_start_str, "%Y%m%d")
-                                        file_end_dt = datetime.strptime(file_end_str, "%Y%m%d")
-                                        
-                                        # 날짜 범위가 겹치는지 확인
-                                        if (file_start_dt <= end_dt and file_end_dt >= start_dt):
-                                            s3_path = f"s3a://{self.s3_bucket}/{key}"
-                                            matching_files.append(s3_path)
-                                            logger.info(f"매칭된 S3 파일: {filename} ({file_start_str}-{file_end_str})")
-                                            
-                            except ValueError as e:
-                                # 날짜 파싱 실패 시 건너뛰기
-                                logger.debug(f"날짜 파싱 실패, 파일 건너뛰기: {filename}")
-                                continue
-                                
+            entries = self.s3_catalog.find_files(start_date, end_date)
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"S3에서 파일 목록을 가져오는 중 오류 발생: {e}")
             raise FileNotFoundError(f"S3에서 파일을 찾을 수 없습니다: {e}")
         
-        if not matching_files:
-            raise FileNotFoundError(f"날짜 범위 {start_date}-{end_date}에 해당하는 CSV 파일을 S3에서 찾을 수 없습니다.")
+        for entry in entries:
+            logger.info(f"매칭된 S3 파일: {os.path.basename(entry.key)} ({entry.start}-{entry.end})")
+        
+        return [entry.path for entry in entries]
+    
+    def describe_file_plan(self, company_name: str, start_date: str, end_date: str) -> Dict:
+        """
+        추출 전에 읽을 파일과 선택될 엔진을 조회합니다. (S3 카탈로그와 저장소 색인만 사용하는 가벼운 단계)
         
-        matching_files.sort()  # 파일명 순으로 정렬
-        logger.info(f"총 {len(matching_files)}개의 CSV 파일을 S3에서 찾았습니다.")
+        Returns:
+            Dict: 파일 목록(크기, 캐시/저장소 여부), 총 크기, 예상 엔진과 근거
+        """
+        # CSV 파일들 경로 찾기 (파일이 없으면 FileNotFoundError)
+        csv_files = self.find_csv_files(start_date, end_date)
+        profiles = self.build_file_profiles(company_name, csv_files)
         
-        return matching_files
+        file_plan = {
+            "files": [
+                {
+                    "name": os.path.basename(profile.path),
+                    "size_bytes": profile.size_bytes,
+                    "cached": profile.cached,
+                    "ingested": profile.ingested,
+                    "matched_rows": profile.matched_rows,
+                }
+                for profile in profiles
+            ],
+            "file_count": len(profiles),
+            "total_bytes": sum(profile.size_bytes for profile in profiles),
+            "daily_aggregate": self.daily_store.is_enabled(),
+        }
+        
+        try:
+            plan = self.engine_planner.plan(profiles, spark_ready=self.spark_manager.is_alive(), spark_cores=self.spark_cores)
+            file_plan["engine"] = plan.engine
+            file_plan["reason"] = plan.reason
+        except Exception as e:
+            logger.warning(f"엔진 선택 정보 조회 실패: {e}")
+        
+        return file_plan
     
-
-    def extract_smart_keywords_from_csv(self, company_name: str, start_date: str, end_date: str, top_keywords: int, use_ai_filter: bool = True) -> Dict:
+    def extract_smart_keywords_from_csv(self, company_name: str, start_date: str, end_date: str, top_keywords: int, use_ai_filter: bool = True,
+                                        progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
         CSV 파일에서 특정 기업의 키워드를 추출하고 AI 필터링을 적용합니다.
         
@@ -184,10 +187,27 @@ class KeywordExtractor:
             end_date: 종료 날짜 (YYYYMMDD)
             top_keywords: 상위 키워드 개수
             use_ai_filter: AI 필터링 사용 여부
+            progress: 단계별 알림 콜백 (단계명, 그 시점의 결과) - daily_counts, raw_keywords,
+                      filtered_keywords, top_articles, analysis 순서 (스트리밍 응답용)
         """
-        # 기본 키워드 추출
-        base_result = self.extract_keywords_from_csv(company_name, start_date, end_date, top_keywords * 2)  # 더 많은 키워드 추출
+        # 기본 키워드 추출 (날짜별 개수/키워드 빈도는 엔진이 계산하는 즉시 알림)
+        base_result = self.extract_keywords_from_csv(company_name, start_date, end_date, top_keywords * 2, progress)  # 더 많은 키워드 추출
+        return self.apply_ai_filter(base_result, company_name, top_keywords, use_ai_filter, progress)
+    
+    def apply_ai_filter(self, base_result: Dict, company_name: str, top_keywords: int, use_ai_filter: bool = True,
+                        progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """
+        기본 추출 결과에 AI 필터링과 키워드 분석을 적용합니다.
+        기본 결과는 top_keywords가 다른 요청들이 함께 쓸 수 있으므로 복사본을 수정합니다.
         
+        Args:
+            base_result: extract_keywords_from_csv 결과
+            company_name: 기업명
+            top_keywords: 상위 키워드 개수
+            use_ai_filter: AI 필터링 사용 여부
+            progress: 단계별 알림 콜백 (filtered_keywords, top_articles, analysis 순서)
+        """
+        base_result = dict(base_result)
         if not use_ai_filter or not base_result.get('keywords'):
             return base_result
         
@@ -197,10 +217,7 @@ class KeywordExtractor:
             # SmartKeywordFilter 가용성 확인
             if not self.smart_filter.is_available():
                 logger.warning("OpenAI API를 사용할 수 없습니다. .env 파일의 OPENAI_API_KEY를 확인해주세요.")
-                base_result['ai_filtered'] = False
-                base_result['ai_analysis'] = "OpenAI API 키가 설정되지 않았습니다."
-                base_result['message'] += " (AI 필터링 사용 불가)"
-                return base_result
+                return self._mark_ai_unavailable(base_result)
             
             # AI 필터링 적용
             filtered_keywords, filtered_top_keywords = self.smart_filter.filter_stock_related_keywords(
@@ -212,15 +229,11 @@ class KeywordExtractor:
             # 필터링 결과 검증
             if not filtered_keywords:
                 logger.warning("AI 필터링 결과가 비어있습니다. 원본 키워드를 반환합니다.")
-                # 원본 키워드의 상위 키워드만 반환
-                original_top = list(base_result['keywords'].items())[:top_keywords]
-                base_result['keywords'] = dict(original_top)
-                base_result['ai_filtered'] = False
-                base_result['ai_analysis'] = "AI 필터링에서 유효한 키워드를 찾지 못했습니다."
-                base_result['original_keyword_count'] = len(base_result['keywords'])
-                base_result['filtered_keyword_count'] = 0
-                base_result['message'] += " (AI 필터링 결과 없음)"
-                return base_result
+                return self._mark_ai_filter_empty(base_result, top_keywords)
+            
+            # 결과 업데이트 (필터링된 키워드는 뉴스 기사 재추출 전에 알림)
+            result = self._build_ai_filtered_result(base_result, filtered_keywords, filtered_top_keywords, "", progress)
+            notify_progress(progress, "top_articles", result)
             
             # 키워드 분석 추가
             analysis = ""
@@ -230,25 +243,8 @@ class KeywordExtractor:
                 except Exception as e:
                     logger.warning(f"AI 분석 중 오류: {e}")
                     analysis = "키워드 분석을 수행할 수 없습니다."
-            
-            # 결과 업데이트
-            result = base_result.copy()
-            result['keywords'] = filtered_keywords
             result['ai_analysis'] = analysis
-            result['ai_filtered'] = True
-            result['original_keyword_count'] = len(base_result['keywords'])
-            result['filtered_keyword_count'] = len(filtered_keywords)
-            
-            # 뉴스 기사 정보는 필터링된 키워드로 다시 추출
-            if 'top_news_articles' in base_result and filtered_top_keywords:
-                # 필터링된 키워드로 뉴스 기사 재추출
-                result['top_news_articles'] = self.re_extract_news_articles_with_filtered_keywords(
-                    base_result['top_news_articles'], filtered_top_keywords
-                )
-            if self.smart_filter.is_available():
-                result['message'] = f"AI 필터링 완료: {len(base_result['keywords'])}개 → {len(filtered_keywords)}개 키워드 (주가 관련성 기준)"
-            else:
-                result['message'] = f"규칙 기반 필터링 완료: {len(base_result['keywords'])}개 → {len(filtered_keywords)}개 키워드 (주가 관련성 기준)"
+            notify_progress(progress, "analysis", result)
             
             logger.info(f"AI 필터링 성공: {len(base_result['keywords'])}개 → {len(filtered_keywords)}개")
             return result
@@ -260,66 +256,482 @@ class KeywordExtractor:
             base_result['ai_analysis'] = "AI 필터링을 사용할 수 없습니다."
             base_result['message'] += " (AI 필터링 실패로 원본 키워드 반환)"
             return base_result
+    
+    def _mark_ai_unavailable(self, base_result: Dict) -> Dict:
+        """OpenAI API를 사용할 수 없을 때 원본 결과에 표시"""
+        base_result['ai_filtered'] = False
+        base_result['ai_analysis'] = "OpenAI API 키가 설정되지 않았습니다."
+        base_result['message'] += " (AI 필터링 사용 불가)"
+        return base_result
+    
+    def _mark_ai_filter_empty(self, base_result: Dict, top_keywords: int) -> Dict:
+        """AI 필터링 결과가 비었을 때 원본 키워드의 상위 키워드만 반환"""
+        original_top = list(base_result['keywords'].items())[:top_keywords]
+        base_result['keywords'] = dict(original_top)
+        base_result['ai_filtered'] = False
+        base_result['ai_analysis'] = "AI 필터링에서 유효한 키워드를 찾지 못했습니다."
+        base_result['original_keyword_count'] = len(base_result['keywords'])
+        base_result['filtered_keyword_count'] = 0
+        base_result['message'] += " (AI 필터링 결과 없음)"
+        return base_result
+    
+    def _build_ai_filtered_result(self, base_result: Dict, filtered_keywords: Dict[str, int],
+                                  filtered_top_keywords: List[str], analysis: str,
+                                  progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """AI 필터링된 키워드와 분석으로 결과 구성 (뉴스 기사는 필터링된 키워드로 재추출)"""
+        result = base_result.copy()
+        result['keywords'] = filtered_keywords
+        result['ai_analysis'] = analysis
+        result['ai_filtered'] = True
+        result['original_keyword_count'] = len(base_result['keywords'])
+        result['filtered_keyword_count'] = len(filtered_keywords)
+        notify_progress(progress, "filtered_keywords", result)
+        
+        # 뉴스 기사 정보는 필터링된 키워드로 다시 추출
+        if 'top_news_articles' in base_result and filtered_top_keywords:
+            # 필터링된 키워드로 뉴스 기사 재추출
+            result['top_news_articles'] = self.re_extract_news_articles_with_filtered_keywords(
+                base_result['top_news_articles'], filtered_top_keywords
+            )
+        if self.smart_filter.is_available():
+            result['message'] = f"AI 필터링 완료: {len(base_result['keywords'])}개 → {len(filtered_keywords)}개 키워드 (주가 관련성 기준)"
+        else:
+            result['message'] = f"규칙 기반 필터링 완료: {len(base_result['keywords'])}개 → {len(filtered_keywords)}개 키워드 (주가 관련성 기준)"
+        return result
+    
+    def extract_keywords_batch(self, company_names: List[str], start_date: str, end_date: str, top_keywords: int,
+                               use_ai_filter: bool = True) -> Dict[str, Dict]:
+        """
+        여러 기업의 키워드를 한 번의 데이터 스캔으로 추출하고 AI 필터링/분석도 기업들을 묶어 요청합니다.
+        기업마다 엔진을 고르지 않고 항상 Pandas 일괄 처리(파일 로드, 날짜 필터, 토큰화 각 한 번)를 사용합니다.
+        
+        Args:
+            company_names: 기업명 목록 (중복 없음)
+            start_date: 시작 날짜 (YYYYMMDD)
+            end_date: 종료 날짜 (YYYYMMDD)
+            top_keywords: 기업별 상위 키워드 개수
+            use_ai_filter: AI 필터링 사용 여부
+        
+        Returns:
+            Dict[str, Dict]: 기업명 → extract_smart_keywords_from_csv와 같은 형식의 결과
+        """
+        # CSV 파일들 경로 찾기 (파일이 없으면 FileNotFoundError)
+        csv_files = self.find_csv_files(start_date, end_date)
+        
+        try:
+            file_sizes = self.get_file_sizes(csv_files)
+        except Exception as e:
+            logger.warning(f"파일 크기 계산 실패: {e}")
+            file_sizes = None
+        
+        base_top_keywords = top_keywords * 2 if use_ai_filter else top_keywords  # AI 필터링용으로 더 많이 추출
+        base_results = self.pandas_analyzer.extract_keywords_batch(
+            company_names, start_date, end_date, base_top_keywords, csv_files, file_sizes
+        )
+        
+        if not use_ai_filter:
+            return base_results
+        return self.apply_ai_filter_batch(base_results, top_keywords)
+    
+    def apply_ai_filter_batch(self, base_results: Dict[str, Dict], top_keywords: int) -> Dict[str, Dict]:
+        """
+        기업별 기본 추출 결과에 AI 필터링/분석을 기업들을 묶어 적용합니다.
+        (기업별 extract_smart_keywords_from_csv와 같은 형식, 키워드가 없는 기업은 그대로 반환)
+        """
+        targets = {name: result['keywords'] for name, result in base_results.items() if result.get('keywords')}
+        if not targets:
+            return base_results
+        
+        results = dict(base_results)
+        try:
+            logger.info(f"AI 일괄 필터링 시작: {len(targets)}개 기업")
+            
+            if not self.smart_filter.is_available():
+                logger.warning("OpenAI API를 사용할 수 없습니다. .env 파일의 OPENAI_API_KEY를 확인해주세요.")
+                for name in targets:
+                    results[name] = self._mark_ai_unavailable(base_results[name])
+                return results
+            
+            filtered = self.smart_filter.filter_stock_related_keywords_batch(targets, top_keywords)
+            analyses = self.smart_filter.get_keyword_analysis_batch(
+                {name: filtered[name][0] for name in targets if filtered[name][0]}
+            )
+            
+            for name in targets:
+                filtered_keywords, filtered_top_keywords = filtered[name]
+                if not filtered_keywords:
+                    results[name] = self._mark_ai_filter_empty(dict(base_results[name]), top_keywords)
+                    continue
+                results[name] = self._build_ai_filtered_result(
+                    base_results[name], filtered_keywords, filtered_top_keywords, analyses.get(name, "")
+                )
+            
+            logger.info(f"AI 일괄 필터링 성공: {len(targets)}개 기업")
+            return results
+        
+        except Exception as e:
+            logger.error(f"AI 일괄 필터링 중 오류 발생: {e}")
+            # AI 필터링 실패 시 원본 결과 반환
+            for name in targets:
+                result = dict(base_results[name])
+                result['ai_filtered'] = False
+                result['ai_analysis'] = "AI 필터링을 사용할 수 없습니다."
+                result['message'] += " (AI 필터링 실패로 원본 키워드 반환)"
+                results[name] = result
+            return results
 
+    def get_file_sizes(self, csv_files: List[str]) -> Dict[str, int]:
+        """S3에서 파일별 크기를 조회합니다 (바이트 단위, 카탈로그에 없는 파일만 HEAD 요청)"""
+        file_sizes = self.s3_catalog.get_sizes(csv_files)
+        for csv_path, file_size in file_sizes.items():
+            logger.info(f"파일 크기: {os.path.basename(csv_path)} - {file_size / (1024**3):.2f} GB")
+        
+        for csv_path in csv_files:
+            if csv_path in file_sizes:
+                continue
+            
+            # s3a://bucket/path/file.csv -> bucket/path/file.csv
+            s3_key = csv_path.replace(f"s3a://{self.s3_bucket}/", "")
+            
+            response = self.s3_client.head_object(
+                Bucket=self.s3_bucket,
+                Key=s3_key
+            )
+            file_size = response['ContentLength']
+            file_sizes[csv_path] = file_size
+            logger.info(f"파일 크기: {os.path.basename(csv_path)} - {file_size / (1024**3):.2f} GB")
+        
+        return file_sizes
+    
     def get_total_file_size(self, csv_files: List[str]) -> int:
         """S3에서 파일들의 총 크기를 계산합니다 (바이트 단위)"""
-        total_size = 0
         try:
-            for csv_path in csv_files:
-                # s3a://bucket/path/file.csv -> bucket/path/file.csv
-                s3_key = csv_path.replace(f"s3a://{self.s3_bucket}/", "")
-                
-                response = self.s3_client.head_object(
-                    Bucket=self.s3_bucket,
-                    Key=s3_key
-                )
-                file_size = response['ContentLength']
-                total_size += file_size
-                logger.info(f"파일 크기: {os.path.basename(csv_path)} - {file_size / (1024**3):.2f} GB")
-                
+            return sum(self.get_file_sizes(csv_files).values())
         except Exception as e:
             logger.warning(f"파일 크기 계산 실패: {e}")
             return 0
+    
+    def build_file_profiles(self, company_name: str, csv_files: List[str]) -> List[FileProfile]:
+        """엔진 선택용 파일 정보 (크기, CSV 캐시/저장소 여부, 기관 역색인 선택도)"""
+        try:
+            file_sizes = self.get_file_sizes(csv_files)
+        except Exception as e:
+            logger.warning(f"파일 크기 계산 실패: {e}")
+            file_sizes = {}
+        
+        news_store = self.pandas_analyzer.news_store
+        csv_cache = self.pandas_analyzer.csv_cache
+        
+        profiles = []
+        for csv_path in csv_files:
+            profile = FileProfile(path=csv_path, size_bytes=file_sizes.get(csv_path, 0))
             
-        return total_size
-
-    def extract_keywords_from_csv(self, company_name: str, start_date: str, end_date: str, top_keywords: int) -> Dict:
+            manifest = news_store.get_manifest(csv_path)
+            if manifest is not None:
+                profile.ingested = True
+                profile.row_count = manifest.get('row_count', 0)
+                row_ids = news_store.lookup_rows(csv_path, company_name, manifest)
+                if row_ids is not None:
+                    profile.matched_rows = len(row_ids)
+            else:
+                profile.cached = csv_cache.is_cached(csv_path)
+            
+            profiles.append(profile)
+        
+        return profiles
+    
+    def _run_engine(self, plan: EnginePlan, company_name: str, start_date: str, end_date: str, top_keywords: int, csv_files: List[str],
+                    file_sizes: Optional[Dict[str, int]] = None, progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
-        CSV 파일에서 특정 기업의 키워드를 추출합니다.
-        파일 크기에 따라 Spark 또는 Pandas를 자동 선택합니다.
+        선택된 엔진으로 키워드를 추출합니다. (Spark/멀티프로세스 실패 시 Pandas로 폴백)
+        엔진별 실행 시간을 따로 기록하고, 실패한 엔진은 폴백 전에 실패로 기록합니다.
         """
+        if plan.engine == ENGINE_SPARK:
+            # Spark 초기화 시도
+            start_time = time.time()
+            try:
+                self.initialize_spark()
+                if self.spark_analyzer is None:
+                    raise Exception("SparkAnalyzer 초기화 실패")
+                result = self.spark_analyzer.extract_keywords_with_spark(company_name, start_date, end_date, top_keywords, csv_files, progress)
+                self.engine_planner.record(plan, ENGINE_SPARK, time.time() - start_time)
+                return result
+            except Exception as e:
+                self.engine_planner.record(plan, ENGINE_SPARK, time.time() - start_time, success=False)
+                logger.warning(f"⚠️ PySpark 실행 실패: {e}, Pandas로 폴백합니다.")
+        
+        if plan.engine == ENGINE_MULTIPROCESS:
+            start_time = time.time()
+            try:
+                self.pandas_analyzer.validate_sources(csv_files)
+                result = self.multiprocess_analyzer.extract_keywords_multiprocess(
+                    company_name, start_date, end_date, top_keywords, csv_files, progress=progress
+                )
+                self.engine_planner.record(plan, ENGINE_MULTIPROCESS, time.time() - start_time)
+                return result
+            except Exception as e:
+                self.engine_planner.record(plan, ENGINE_MULTIPROCESS, time.time() - start_time, success=False)
+                logger.warning(f"⚠️ 멀티프로세스 실행 실패: {e}, Pandas로 폴백합니다.")
+        
+        start_time = time.time()
         try:
-            # CSV 파일들 경로 찾기
-            csv_files = self.find_csv_files(start_date, end_date)
+            result = self.pandas_analyzer.extract_keywords_with_pandas(company_name, start_date, end_date, top_keywords, csv_files, file_sizes, progress)
+        except Exception:
+            self.engine_planner.record(plan, ENGINE_PANDAS, time.time() - start_time, success=False)
+            raise
+        self.engine_planner.record(plan, ENGINE_PANDAS, time.time() - start_time)
+        return result
+    
+    def load_daily_aggregate(self, company_name: str, start_date: str, end_date: str) -> Optional[Dict]:
+        """
+        기간의 일별 부분 집계를 모아 병합합니다. (top_keywords와 무관한 기본 추출)
+        없는 날짜(또는 원본이 바뀐 날짜)만 연속 구간 단위로 Pandas 엔진에서 계산해 저장합니다.
+        여러 요청이 결과를 공유하므로 반환값은 수정하지 않습니다.
+        
+        Returns:
+            Optional[Dict]: 병합된 집계, 일별 집계로 처리하지 않으면 None (기존 엔진 경로 사용)
+        """
+        try:
+            entries = self.s3_catalog.find_files(start_date, end_date)
+            if not entries:
+                return None
+            
+            # 날짜별 원본 버전 (그 날짜를 포함하는 파일들의 키/ETag)
+            date_keys = iter_date_keys(start_date, end_date)
+            source_versions = {
+                date_key: self.daily_store.make_source_version(
+                    (entry.key, entry.etag) for entry in entries if entry.start <= date_key <= entry.end
+                )
+                for date_key in date_keys
+            }
+            
+            partials = self.daily_store.get_partials(company_name, source_versions)
+            cached_days = len(partials)
+            missing_ranges = group_consecutive_days(d for d in date_keys if d not in partials)
+            
+            if missing_ranges:
+                missing_files = [
+                    entry.path for entry in entries
+                    if any(entry.start <= int(run_end) and entry.end >= int(run_start) for run_start, run_end in missing_ranges)
+                ]
+                
+                # 없는 날짜의 원본이 커서 Spark/멀티프로세스가 유리하면 기존 경로로 처리
+                # (일별 집계 계산은 Pandas로만 하므로 계획된 엔진과 다르면 계산하지 않고, 다른 작업량이라 실행 시간도 기록하지 않음)
+                profiles = self.build_file_profiles(company_name, missing_files)
+                plan = self.engine_planner.plan(profiles, spark_ready=self.spark_manager.is_alive(), spark_cores=self.spark_cores)
+                if plan.engine != ENGINE_PANDAS:
+                    logger.info(f"📅 일별 집계 생략: 계산할 날짜 {len(date_keys) - cached_days}일의 원본이 커서 {plan.engine} 엔진 사용")
+                    return None
+                
+                file_sizes = {profile.path: profile.size_bytes for profile in profiles if profile.size_bytes > 0}
+                
+                for run_start, run_end in missing_ranges:
+                    run_entries = [
+                        entry for entry in entries
+                        if entry.start <= int(run_end) and entry.end >= int(run_start)
+                    ]
+                    computed = self.pandas_analyzer.compute_daily_partials(
+                        company_name, run_start, run_end, [entry.path for entry in run_entries], file_sizes
+                    )
+                    if computed is None:
+                        return None
+                    
+                    # 상위 기사는 저장된 기사 색인에서 고르므로 저장하지 못하면 기존 경로로 처리
+                    if not self._is_store_current(run_entries) or \
+                            not self.daily_store.save_partials(company_name, computed.values(), source_versions):
+                        return None
+                    partials.update(computed)
             
-            # 파일 크기 계산
-            total_size = self.get_total_file_size(csv_files)
-            total_size_gb = total_size / (1024**3)
+            logger.info(f"📅 일별 집계 사용: {company_name} 저장된 {cached_days}일 + 계산 {len(date_keys) - cached_days}일")
             
+            total_count, keywords_dict = merge_daily_partials([partials[d] for d in date_keys])
+            return {
+                "total_news_count": total_count,
+                "daily_news_count": {str(d): partials[d].news_count for d in date_keys},
+                "keywords": keywords_dict,
+                "cached_days": cached_days,
+                "computed_days": len(date_keys) - cached_days,
+            }
+        
+        except Exception as e:
+            logger.warning(f"⚠️ 일별 집계 처리 실패: {e}, 기존 엔진 경로로 처리합니다.")
+            return None
+    
+    def _is_store_current(self, entries: List) -> bool:
+        """
+        일별 집계를 계산한 저장소 데이터가 source_version을 만든 원본 ETag와 같은지 확인합니다.
+        (오래된 데이터로 계산한 집계에 새 버전이 붙어 저장되지 않도록, 다르면 저장하지 않음)
+        """
+        news_store = self.pandas_analyzer.news_store
+        for entry in entries:
+            manifest = news_store.get_manifest(entry.path)
+            if manifest is None or manifest.get('source_etag') != entry.etag:
+                logger.warning(f"⚠️ 저장소 데이터가 원본 버전과 달라 일별 집계를 저장하지 않습니다: {os.path.basename(entry.path)}")
+                return False
+        return True
+    
+    def materialize_daily_aggregates(self, company_names: List[str], start_date: str, end_date: str) -> Dict:
+        """
+        여러 기업의 기간 일별 부분 집계 중 저장소에 없거나 원본이 바뀐 날짜만 일괄 계산해 저장합니다.
+        (야간 사전 계산용, 없는 날짜 구간마다 모든 대상 기업을 한 번의 스캔으로 처리)
+        
+        Returns:
+            Dict: 기업 수, 이미 있던 (기업, 날짜) 수, 계산한 (기업, 날짜) 수
+        """
+        stats = {"companies": len(company_names), "cached_days": 0, "computed_days": 0}
+        if not self.daily_store.is_enabled():
+            logger.warning("일별 집계 저장소를 사용하지 않아 사전 계산을 건너뜁니다.")
+            return stats
+        
+        entries = self.s3_catalog.find_files(start_date, end_date)
+        date_keys = iter_date_keys(start_date, end_date)
+        source_versions = {
+            date_key: self.daily_store.make_source_version(
+                (entry.key, entry.etag) for entry in entries if entry.start <= date_key <= entry.end
+            )
+            for date_key in date_keys
+        }
+        
+        # 기업별로 없는 날짜 확인
+        missing_days = {}
+        for company_name in company_names:
+            stored = self.daily_store.get_partials(company_name, source_versions)
+            stats["cached_days"] += len(stored)
+            missing = {d for d in date_keys if d not in stored}
+            if missing:
+                missing_days[company_name] = missing
+        
+        all_missing = set().union(*missing_days.values()) if missing_days else set()
+        for run_start, run_end in group_consecutive_days(all_missing):
+            run_keys = set(iter_date_keys(run_start, run_end))
+            run_companies = [name for name, missing in missing_days.items() if missing & run_keys]
+            run_entries = [
+                entry for entry in entries
+                if entry.start <= int(run_end) and entry.end >= int(run_start)
+            ]
+            logger.info(f"📅 일별 집계 일괄 계산: {run_start}-{run_end}, 기업 {len(run_companies)}개, 파일 {len(run_entries)}개")
+            
+            computed = self.pandas_analyzer.compute_daily_partials_batch(
+                run_companies, run_start, run_end, [entry.path for entry in run_entries]
+            )
+            if computed is None:
+                logger.warning(f"날짜별로 나눌 수 없는 데이터입니다: {run_start}-{run_end}")
+                continue
+            
+            if not self._is_store_current(run_entries):
+                continue
+            
+            for company_name in run_companies:
+                partials = [p for d, p in computed[company_name].items() if d in missing_days[company_name]]
+                if self.daily_store.save_partials(company_name, partials, source_versions):
+                    stats["computed_days"] += len(partials)
+        
+        return stats
+    
+    def extract_keywords_with_daily_aggregates(self, company_name: str, start_date: str, end_date: str, top_keywords: int,
+                                               progress: Optional[Callable[[str, Dict], None]] = None) -> Optional[Dict]:
+        """
+        저장된 일별 부분 집계를 합쳐 키워드를 추출합니다.
+        같은 기업/기간의 병합은 동시에 들어온 요청끼리 한 번만 실행하고(top_keywords가 달라도 공유),
+        상위 키워드 개수와 상위 기사 선택은 요청마다 병합 결과에 적용합니다.
+        
+        Returns:
+            Optional[Dict]: 추출 결과, 일별 집계로 처리하지 않으면 None (기존 엔진 경로 사용)
+        """
+        if not self.daily_store.is_enabled():
+            return None
+        
+        aggregate = self.single_flight.do(
+            ("daily_aggregate", company_name, start_date, end_date),
+            self.load_daily_aggregate, company_name, start_date, end_date
+        )
+        if aggregate is None:
+            return None
+        
+        if aggregate["total_news_count"] == 0:
+            return {
+                "company_name": company_name,
+                "period": f"{start_date}-{end_date}",
+                "total_news_count": 0,
+                "daily_news_count": {},
+                "keywords": {},
+                "message": f"'{company_name}'와 관련된 뉴스를 찾을 수 없습니다."
+            }
+        
+        # 상위 키워드 개수는 병합 후 적용 (top_keywords가 달라도 같은 일별 집계 재사용)
+        keywords_dict = aggregate["keywords"]
+        top_keywords_list = list(keywords_dict.keys())[:top_keywords]
+        
+        # 상위 기사 후보만 저장소에서 골라 읽음 (동률은 원본 위치 순)
+        candidates_df = self.daily_store.select_top_articles(company_name, start_date, end_date, top_keywords_list)
+        if candidates_df is None:
+            return None
+        
+        notify_progress(progress, "daily_counts", aggregate)
+        notify_progress(progress, "raw_keywords", aggregate)
+        
+        top_news_articles = self.pandas_analyzer.extract_top_news_articles(candidates_df, top_keywords_list)
+        
+        return {
+            "company_name": company_name,
+            "period": f"{start_date}-{end_date}",
+            "total_news_count": aggregate["total_news_count"],
+            "daily_news_count": dict(aggregate["daily_news_count"]),
+            "keywords": dict(keywords_dict),
+            "top_news_articles": top_news_articles,
+            "message": f"📅 일별 집계로 성공적으로 키워드를 추출했습니다. 총 {len(keywords_dict)}개 키워드 발견 "
+                       f"(저장된 {aggregate['cached_days']}일 + 계산 {aggregate['computed_days']}일)"
+        }
+    
+    def extract_keywords_from_csv(self, company_name: str, start_date: str, end_date: str, top_keywords: int,
+                                  progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """
+        CSV 파일에서 특정 기업의 키워드를 추출합니다.
+        캐시/저장소 상태, 기업 선택도, 가용 코어와 과거 실행 시간으로 엔진을 자동 선택합니다.
+        progress를 주면 엔진이 날짜별 개수(daily_counts)와 키워드 빈도(raw_keywords)를 계산하는 즉시 알립니다.
+        """
+        # 일별 부분 집계로 처리할 수 있으면 사용 (없는 날짜만 계산)
+        result = self.extract_keywords_with_daily_aggregates(company_name, start_date, end_date, top_keywords, progress)
+        if result is not None:
+            return result
+        
+        # CSV 파일들 경로 찾기 (파일이 없으면 FileNotFoundError)
+        csv_files = self.find_csv_files(start_date, end_date)
+        
+        try:
+            # 비용 기반 엔진 선택
+            profiles = self.build_file_profiles(company_name, csv_files)
+            plan = self.engine_planner.plan(profiles, spark_ready=self.spark_manager.is_alive(), spark_cores=self.spark_cores)
+            
+            total_size_gb = plan.features['total_bytes'] / (1024**3)
             logger.info(f"총 파일 크기: {total_size_gb:.2f} GB")
+            logger.info(f"🧭 엔진 선택: {plan.engine} (예상 시간: {plan.reason})")
             
-            # 15GB 이상이면 Spark 사용
-            if total_size_gb >= 10.0:
-                logger.info("🚀 엔진 선택: PySpark (파일 크기 15GB 이상)")
-                # Spark 초기화 시도
-                try:
-                    self.initialize_spark()
-                    if self.spark_analyzer is None:
-                        raise Exception("SparkAnalyzer 초기화 실패")
-                    return self.spark_analyzer.extract_keywords_with_spark(company_name, start_date, end_date, top_keywords, csv_files)
-                except Exception as e:
-                    logger.warning(f"⚠️ PySpark 실행 실패: {e}, Pandas로 폴백합니다.")
-                    return self.pandas_analyzer.extract_keywords_with_pandas(company_name, start_date, end_date, top_keywords, csv_files)
-            else:
-                logger.info("🐼 엔진 선택: Pandas (파일 크기 15GB 미만)")
-                return self.pandas_analyzer.extract_keywords_with_pandas(company_name, start_date, end_date, top_keywords, csv_files)
+            # 선행 다운로드 시 HEAD 요청을 생략하도록 이미 조회한 크기 전달
+            file_sizes = {profile.path: profile.size_bytes for profile in profiles if profile.size_bytes > 0}
+            
+            return self._run_engine(plan, company_name, start_date, end_date, top_keywords, csv_files, file_sizes, progress)
                 
         except Exception as e:
             logger.error(f"키워드 추출 중 오류 발생: {e}")
             # 최후의 수단으로 pandas 사용
             logger.info("⚠️ 오류 발생으로 Pandas 엔진으로 폴백합니다.")
-            return self.pandas_analyzer.extract_keywords_with_pandas(company_name, start_date, end_date, top_keywords, csv_files)
+            return self.pandas_analyzer.extract_keywords_with_pandas(company_name, start_date, end_date, top_keywords, csv_files,
+                                                                     progress=progress)
 
+    def fit_to_top_keywords(self, base_result: Dict, top_keywords: int) -> Dict:
+        """
+        공유된 기본 추출 결과의 상위 기사를 요청의 상위 키워드 기준으로 다시 정렬합니다.
+        (AI 필터링된 키워드와 같은 방식, 기본 결과는 수정하지 않고 키워드 개수는 응답을 만들 때 자름)
+        """
+        result = dict(base_result)
+        top_keywords_list = list(result.get('keywords', {}))[:top_keywords]
+        if result.get('top_news_articles') and top_keywords_list:
+            result['top_news_articles'] = self.re_extract_news_articles_with_filtered_keywords(
+                result['top_news_articles'], top_keywords_list
+            )
+        return result
+    
     def re_extract_news_articles_with_filtered_keywords(self, original_articles, filtered_keywords):
         """
         AI 필터링된 키워드로 뉴스 기사들을 재추출합니다.
@@ -337,24 +749,17 @@ class KeywordExtractor:
             
             # 필터링된 키워드와 매칭되는 기사들만 추출
             filtered_articles = []
+            matcher = KeywordMatcher(filtered_keywords)
             
             for article in original_articles:
-                # 기사의 키워드와 필터링된 키워드 매칭 확인
-                matched_count = 0
-                matched_keywords = []
+                # 기사의 키워드와 필터링된 키워드 매칭 확인 (키워드당 한 번만 카운트)
+                matched = matcher.match_keywords(article.get('all_keywords', []))
                 
-                for filtered_keyword in filtered_keywords:
-                    for article_keyword in article.get('all_keywords', []):
-                        if filtered_keyword in article_keyword or article_keyword in filtered_keyword:
-                            matched_count += 1
-                            matched_keywords.append(filtered_keyword)
-                            break  # 중복 카운트 방지
-                
-                if matched_count > 0:
+                if matched:
                     # 기사 정보 업데이트
                     updated_article = article.copy()
-                    updated_article['matched_keywords_count'] = matched_count
-                    updated_article['matched_keywords'] = list(set(matched_keywords))
+                    updated_article['matched_keywords_count'] = len(matched)
+                    updated_article['matched_keywords'] = list({filtered_keywords[i] for i in matched})
                     filtered_articles.append(updated_article)
             
             # 매칭된 키워드 개수 순으로 정렬
@@ -369,11 +774,10 @@ class KeywordExtractor:
             return original_articles  # 오류 시 원본 반환
     
     def cleanup(self):
-        """SparkSession 정리"""
-        if self.spark:
-            try:
-                self.spark.stop()
-                self.spark = None
-                logger.info("SparkSession이 정리되었습니다.")
-            except Exception as e:
-                logger.warning(f"SparkSession 정리 중 오류: {e}")
+        """SparkSession, 프로세스 풀, S3 다운로드 스레드 풀, 일별 집계 DB 연결 정리"""
+        self.spark_manager.stop()
+        self.multiprocess_analyzer.shutdown()
+        self.s3_prefetcher.shutdown()
+        self.daily_store.close()
+        self.spark = None
+        self.spark_analyzer = None
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+키워드 매칭 유틸리티
+상위 키워드 목록과 기사 키워드 간의 양방향 부분 문자열 매칭
+(상위 키워드 in 기사 키워드 or 기사 키워드 in 상위 키워드)을
+Aho-Corasick 오토마톤과 부분 문자열 사전으로 처리합니다.
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class KeywordMatcher:
+    """상위 키워드 목록에 대한 기사 키워드 매칭기"""
+    
+    def __init__(self, keywords: List[str]):
+        """
+        Args:
+            keywords: 매칭 대상 키워드 리스트 (순서/위치가 매칭 결과의 인덱스가 됨)
+        """
+        self.keywords = [str(k) for k in keywords]
+        
+        # 빈 키워드는 모든 기사 키워드에 포함되므로 별도로 처리
+        self._empty_indices = {i for i, k in enumerate(self.keywords) if not k}
+        
+        self._goto, self._fail, self._output = self._build_automaton()
+        self._substrings = self._build_substring_map()
+        self._token_cache: Dict[str, Tuple[int, ...]] = {}
+    
+    def _build_automaton(self):
+        """키워드 목록으로 Aho-Corasick 오토마톤(goto/fail/output)을 구성합니다."""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Set[int]] = [set()]
+        
+        for i, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    output.append(set())
+                state = next_state
+            output[state].add(i)
+        
+        # BFS로 실패 링크 계산 (접미사 상태의 출력도 함께 병합)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(ch, 0)
+                output[next_state] |= output[fail[next_state]]
+        
+        return goto, fail, output
+    
+    def _build_substring_map(self) -> Dict[str, Set[int]]:
+        """키워드의 모든 부분 문자열 → 해당 키워드 인덱스 사전을 만듭니다. (기사 키워드 in 상위 키워드)"""
+        substrings: Dict[str, Set[int]] = {}
+        for i, keyword in enumerate(self.keywords):
+            for start in range(len(keyword)):
+                for end in range(start + 1, len(keyword) + 1):
+                    substrings.setdefault(keyword[start:end], set()).add(i)
+        return substrings
+    
+    def _scan(self, text: str) -> Set[int]:
+        """텍스트에 포함된 키워드 인덱스를 오토마톤 한 번의 순회로 찾습니다. (상위 키워드 in 기사 키워드)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+    
+    def find_in_text(self, text: str) -> Tuple[int, ...]:
+        """
+        텍스트에 포함된 키워드 인덱스를 반환합니다. (단방향: 키워드 in 텍스트, str.contains와 같은 기준)
+        
+        Returns:
+            Tuple[int, ...]: 포함된 키워드 인덱스 (오름차순)
+        """
+        return tuple(sorted(self._scan(text) | self._empty_indices))
+    
+    def match_token(self, token: str) -> Tuple[int, ...]:
+        """
+        기사 키워드 하나와 매칭되는 키워드 인덱스를 반환합니다.
+        
+        Returns:
+            Tuple[int, ...]: 매칭된 키워드 인덱스 (오름차순)
+        """
+        matched = self._token_cache.get(token)
+        if matched is None:
+            found = self._scan(token) | self._substrings.get(token, set()) | self._empty_indices
+            matched = tuple(sorted(found))
+            self._token_cache[token] = matched
+        return matched
+    
+    def match_keywords(self, tokens: List[str]) -> List[int]:
+        """기사 키워드 목록 전체와 매칭되는 키워드 인덱스를 반환합니다. (키워드당 한 번만 카운트)"""
+        matched = set()
+        for token in tokens:
+            matched.update(self.match_token(token))
+        return sorted(matched)
+    
+    def score_rows(self, tokens: pd.Series, n_rows: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        행 단위로 펼쳐진 기사 키워드에 대해 행별 매칭 키워드 개수를 계산합니다.
+        
+        고유 토큰마다 한 번만 매칭하고, (행, 키워드) 쌍으로 펼친 뒤 중복을 제거해 집계합니다.
+        
+        Args:
+            tokens: 위치 기반 행 번호(0..n_rows-1)를 인덱스로 갖는 기사 키워드 Series
+            n_rows: 전체 행 수
+        
+        Returns:
+            Tuple: (행별 매칭 개수, 매칭 쌍의 행 번호, 매칭 쌍의 키워드 인덱스) - 쌍은 행 번호 순 정렬
+        """
+        empty = np.array([], dtype=np.int64)
+        if tokens.empty or not self.keywords:
+            return np.zeros(n_rows, dtype=np.int64), empty, empty
+        
+        codes, uniques = pd.factorize(tokens, sort=False)
+        matches = [self.match_token(token) for token in uniques]
+        
+        match_lengths = np.fromiter((len(m) for m in matches), dtype=np.int64, count=len(matches))
+        match_starts = np.concatenate([[0], np.cumsum(match_lengths)[:-1]])
+        flat_matches = np.fromiter((i for m in matches for i in m), dtype=np.int64, count=int(match_lengths.sum()))
+        
+        # 토큰 출현마다 매칭된 키워드 인덱스를 (행, 키워드) 쌍으로 펼침
+        occurrence_lengths = match_lengths[codes]
+        total = int(occurrence_lengths.sum())
+        if total == 0:
+            return np.zeros(n_rows, dtype=np.int64), empty, empty
+        
+        rows = np.repeat(tokens.index.to_numpy(dtype=np.int64), occurrence_lengths)
+        offsets = np.arange(total) - np.repeat(np.cumsum(occurrence_lengths) - occurrence_lengths, occurrence_lengths)
+        keyword_indices = flat_matches[np.repeat(match_starts[codes], occurrence_lengths) + offsets]
+        
+        # 같은 행에서 같은 키워드는 한 번만 카운트
+        pair_keys = np.unique(rows * len(self.keywords) + keyword_indices)
+        pair_rows = pair_keys // len(self.keywords)
+        pair_keywords = pair_keys % len(self.keywords)
+        
+        counts = np.bincount(pair_rows, minlength=n_rows)
+        return counts, pair_rows, pair_keywords
+
+
+def select_top_rows(counts: np.ndarray, limit: int) -> List[int]:
+    """
+    매칭 개수가 1 이상인 행 중 상위 limit개의 행 번호를 반환합니다.
+    (개수 내림차순, 동률은 앞선 행 우선 - 안정 정렬 후 자르기와 동일)
+    """
+    if limit <= 0 or counts.size == 0:
+        return []
+    
+    # k번째로 큰 개수를 기준값으로 잡아 후보를 limit개 이내로 제한
+    kth = min(limit, counts.size)
+    threshold = max(int(np.partition(counts, counts.size - kth)[counts.size - kth]), 1)
+    above = np.flatnonzero(counts > threshold)
+    at_threshold = np.flatnonzero(counts == threshold)[:limit - len(above)]
+    candidates = np.concatenate([above, at_threshold])
+    
+    return heapq.nsmallest(limit, candidates.tolist(), key=lambda row: (-counts[row], row))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+야간 키워드 사전 계산 작업
+BigKinds 뉴스 수집이 끝난 뒤 실행해 KOSPI200 전 종목의 새 날짜 일별 부분 집계(키워드 빈도, 기사 수, 기사 요약)를
+한 번의 스캔으로 계산해 저장하고, 표준 기간(1일/7일/30일) 결과를 결과 캐시에 미리 넣어
+/extract-keywords/ticker 요청이 캐시 조회만으로 끝나도록 합니다.
+
+사용: python keyword_materializer.py [--date YYYYMMDD] [--windows 1,7,30] [--top-keywords 20]
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from keyword_extractor import KeywordExtractor
+from cache_manager import CacheManager
+
+logger = logging.getLogger(__name__)
+
+# 표준 조회 기간 (일)
+DEFAULT_WINDOWS = (1, 7, 30)
+
+
+def load_company_names() -> List[str]:
+    """
+    사전 계산 대상 기업명 목록
+    MATERIALIZE_COMPANIES(쉼표 구분)가 있으면 사용하고, 없으면 kospi200/stock_items_data.py의
+    TICKER_TO_ITEM_NO 종목을 item_no 순서로 pykrx 종목명으로 변환합니다.
+    """
+    names = os.getenv('MATERIALIZE_COMPANIES', '')
+    if names.strip():
+        return [name.strip() for name in names.split(',') if name.strip()]
+    
+    stock_items_dir = os.getenv(
+        'STOCK_ITEMS_DIR',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'kospi200')
+    )
+    if stock_items_dir not in sys.path:
+        sys.path.append(stock_items_dir)
+    
+    try:
+        from stock_items_data import TICKER_TO_ITEM_NO
+        from pykrx import stock
+    except ImportError as e:
+        logger.error(f"❌ 종목 목록을 불러올 수 없습니다 (STOCK_ITEMS_DIR 또는 MATERIALIZE_COMPANIES 확인): {e}")
+        return []
+    
+    company_names = []
+    for ticker, _ in sorted(TICKER_TO_ITEM_NO.items(), key=lambda x: x[1]):
+        try:
+            name = stock.get_market_ticker_name(ticker)
+        except Exception as e:
+            logger.warning(f"종목명 조회 실패: {ticker}, 오류: {e}")
+            continue
+        if name:
+            company_names.append(name)
+    
+    return list(dict.fromkeys(company_names))
+
+
+class KeywordMaterializer:
+    """일별 부분 집계 + 표준 기간 결과 사전 계산"""
+    
+    def __init__(self, keyword_extractor: Optional[KeywordExtractor] = None,
+                 cache_manager: Optional[CacheManager] = None):
+        self.keyword_extractor = keyword_extractor or KeywordExtractor()
+        self.cache_manager = cache_manager or CacheManager()
+    
+    def materialize(self, target_date: str, company_names: List[str], windows: Sequence[int] = DEFAULT_WINDOWS,
+                    top_keywords: int = 20, ai_modes: Sequence[bool] = (True, False)) -> Dict:
+        """
+        target_date로 끝나는 표준 기간들을 사전 계산합니다.
+        
+        Args:
+            target_date: 새로 수집된 날짜 (YYYYMMDD)
+            company_names: 대상 기업명 목록
+            windows: 조회 기간 목록 (일)
+            top_keywords: 상위 키워드 개수 (API 기본값과 같아야 캐시가 사용됨)
+            ai_modes: 미리 계산할 AI 필터링 사용 여부 목록
+        
+        Returns:
+            Dict: 작업 통계 (status가 "no_data"면 대상 날짜의 원본이 아직 없음)
+        """
+        start_time = datetime.now()
+        end = datetime.strptime(target_date, "%Y%m%d")
+        stats = {"target_date": target_date, "companies": len(company_names), "windows": list(windows)}
+        
+        # 새 원본이 목록에 보이도록 카탈로그 전체 갱신
+        extractor = self.keyword_extractor
+        extractor.s3_catalog.refresh(force_full=True)
+        if not extractor.s3_catalog.find_files(target_date, target_date):
+            # 원본 없이 계산한 결과가 결과 캐시에 남지 않도록 중단
+            logger.error(f"❌ {target_date} 날짜의 뉴스 원본이 아직 없습니다. 사전 계산을 중단합니다.")
+            stats["status"] = "no_data"
+            return stats
+        
+        # 1) 가장 긴 기간의 일별 부분 집계 중 없는 날짜만 모든 기업을 한 번에 계산
+        longest_start = (end - timedelta(days=max(windows) - 1)).strftime("%Y%m%d")
+        stats["daily_aggregates"] = extractor.materialize_daily_aggregates(company_names, longest_start, target_date)
+        logger.info(f"📅 일별 집계 사전 계산 완료: {stats['daily_aggregates']}")
+        
+        # 2) 표준 기간 결과를 일별 집계 병합으로 만들어 결과 캐시에 저장 (기존 결과는 덮어씀, AI 필터링 실패 결과는 제외)
+        saved = 0
+        skipped = []
+        for window in windows:
+            start_date = (end - timedelta(days=window - 1)).strftime("%Y%m%d")
+            for use_ai_filter in ai_modes:
+                base_top_keywords = top_keywords * 2 if use_ai_filter else top_keywords
+                base_results = {}
+                for company_name in company_names:
+                    result = extractor.extract_keywords_with_daily_aggregates(company_name, start_date, target_date, base_top_keywords)
+                    if result is None:
+                        skipped.append(f"{company_name}:{window}d")
+                        continue
+                    base_results[company_name] = result
+                
+                results = extractor.apply_ai_filter_batch(base_results, top_keywords) if use_ai_filter else base_results
+                
+                degraded = 0
+                for company_name, result in results.items():
+                    # AI 필터링에 실패한(원본 키워드로 대체된) 결과는 기존 AI 결과를 덮어쓰지 않고 빈 자리만 채움
+                    replace = not (use_ai_filter and not result.get('ai_filtered'))
+                    if not replace:
+                        degraded += 1
+                    if self.cache_manager.save_result(company_name, start_date, target_date, top_keywords,
+                                                      use_ai_filter, result, replace=replace):
+                        saved += 1
+                if degraded:
+                    logger.warning(f"⚠️ {window}일 기간 AI 필터링 실패 {degraded}개 기업: 기존 결과는 유지")
+                
+                logger.info(f"💾 {window}일 기간 결과 저장: {len(results)}개 기업 (AI 필터링: {use_ai_filter})")
+        
+        stats["saved_results"] = saved
+        stats["skipped"] = skipped
+        stats["status"] = "success"
+        stats["elapsed_seconds"] = round((datetime.now() - start_time).total_seconds(), 1)
+        return stats
+    
+    def cleanup(self):
+        """추출기와 캐시 연결 정리"""
+        self.keyword_extractor.cleanup()
+        self.cache_manager.cleanup()
+
+
+def main() -> int:
+    """CLI 진입점 (종료 코드: 0 성공, 1 원본 없음/대상 없음)"""
+    parser = argparse.ArgumentParser(description="KOSPI200 뉴스 키워드 야간 사전 계산")
+    parser.add_argument("--date", default=(datetime.now() - timedelta(days=1)).strftime("%Y%m%d"),
+                        help="새로 수집된 날짜 YYYYMMDD (기본값: 어제, 뉴스 수집 기간과 동일)")
+    parser.add_argument("--windows", default=os.getenv('MATERIALIZE_WINDOWS', '1,7,30'),
+                        help="조회 기간 목록(일, 쉼표 구분)")
+    parser.add_argument("--top-keywords", type=int, default=int(os.getenv('MATERIALIZE_TOP_KEYWORDS', '20')),
+                        help="상위 키워드 개수 (API 기본값 20)")
+    parser.add_argument("--companies", default=None, help="대상 기업명(쉼표 구분, 기본값: KOSPI200 전 종목)")
+    parser.add_argument("--skip-ai", action="store_true", help="AI 필터링 결과는 미리 계산하지 않음")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    
+    if args.companies:
+        company_names = [name.strip() for name in args.companies.split(',') if name.strip()]
+    else:
+        company_names = load_company_names()
+    if not company_names:
+        logger.error("❌ 사전 계산할 기업이 없습니다.")
+        return 1
+    
+    windows = sorted({int(w) for w in args.windows.split(',') if w.strip()})
+    ai_modes = (False,) if args.skip_ai else (True, False)
+    
+    logger.info(f"🌙 키워드 사전 계산 시작: {args.date}, 기업 {len(company_names)}개, 기간 {windows}")
+    materializer = KeywordMaterializer()
+    try:
+        stats = materializer.materialize(args.date, company_names, windows, args.top_keywords, ai_modes)
+    finally:
+        materializer.cleanup()
+    
+    logger.info(f"🌙 키워드 사전 계산 종료: {stats}")
+    return 0 if stats.get("status") == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
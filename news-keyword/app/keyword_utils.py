@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+키워드 토큰화 유틸리티
+쉼표로 구분된 키워드 컬럼을 분리/정제/집계하는 작업을 컬럼 단위 연산으로 처리합니다.
+"""
+
+import logging
+import re
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 키워드에서 제거할 문자 (한글, 영문, 숫자, 공백 이외)
+KEYWORD_CLEAN_PATTERN = re.compile(r'[^가-힣a-zA-Z0-9\s]')
+
+# 집계에 포함할 최소 키워드 길이
+MIN_KEYWORD_LENGTH = 2
+
+
+def explode_keywords(values: pd.Series) -> pd.Series:
+    """
+    키워드 문자열을 행 인덱스를 유지한 채 토큰 단위로 펼칩니다.
+    (앞뒤 공백 제거, 빈 토큰 제외)
+    """
+    tokens = values.dropna().astype(str).str.split(',').explode().str.strip()
+    return tokens[tokens.notna() & (tokens != '')]
+
+
+def clean_tokens(tokens: pd.Series) -> pd.Series:
+    """펼쳐진 토큰에서 특수문자를 제거하고 최소 길이 미만 토큰을 제외합니다."""
+    cleaned = tokens.str.replace(KEYWORD_CLEAN_PATTERN, '', regex=True)
+    return cleaned[cleaned.str.len() >= MIN_KEYWORD_LENGTH]
+
+
+def explode_keyword_lists(values: pd.Series) -> pd.Series:
+    """리스트 컬럼(저장소의 분리/정제된 키워드)을 토큰 단위로 펼칩니다."""
+    tokens = values.explode()
+    return tokens[tokens.notna()]
+
+
+def to_keyword_lists(tokens: pd.Series, index: pd.Index) -> pd.Series:
+    """펼쳐진 토큰을 다시 행별 리스트로 묶습니다. (토큰이 없는 행은 빈 리스트)"""
+    keyword_lists = tokens.groupby(level=0, sort=False).agg(list).reindex(index)
+    return keyword_lists.apply(lambda v: v if isinstance(v, list) else [])
+
+
+def count_keywords(tokens: pd.Series, company_name: str) -> Dict[str, int]:
+    """
+    정제된 토큰의 빈도를 계산합니다.
+    
+    Counter.most_common과 같은 순서(빈도 내림차순, 동률은 먼저 나온 순)를 유지하며,
+    기업명이 포함된 키워드는 고유 토큰 단위로 한 번만 검사하여 제외합니다.
+    
+    Returns:
+        Dict[str, int]: {"키워드": 빈도수} (빈도순 정렬)
+    """
+    if tokens.empty:
+        return {}
+    
+    codes, uniques = pd.factorize(tokens, sort=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    
+    uniques = pd.Series(uniques, dtype=object)
+    keep = ~uniques.str.contains(company_name, regex=False).to_numpy(dtype=bool)
+    
+    kept_positions = np.flatnonzero(keep)
+    order = kept_positions[np.argsort(-counts[kept_positions], kind='stable')]
+    
+    return {uniques.iat[i]: int(counts[i]) for i in order}
+
+
+def count_keywords_in_order(tokens: pd.Series, company_name: str) -> Dict[str, int]:
+    """
+    정제된 토큰의 빈도를 처음 등장한 순서대로 계산합니다. (샤드별 부분 집계용)
+    기업명이 포함된 키워드는 제외합니다.
+    """
+    if tokens.empty:
+        return {}
+    
+    codes, uniques = pd.factorize(tokens, sort=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    
+    uniques = pd.Series(uniques, dtype=object)
+    keep = ~uniques.str.contains(company_name, regex=False).to_numpy(dtype=bool)
+    
+    return {uniques.iat[i]: int(counts[i]) for i in np.flatnonzero(keep)}
+
+
+def merge_keyword_counts(partials: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """
+    샤드별 부분 집계를 샤드 순서대로 합쳐 빈도순으로 정렬합니다.
+    각 부분 집계가 등장 순서를 유지하면 전체를 한 번에 센 Counter.most_common과 같은 순서가 됩니다.
+    """
+    merged: Dict[str, int] = {}
+    for partial in partials:
+        for keyword, count in partial.items():
+            merged[keyword] = merged.get(keyword, 0) + count
+    
+    return dict(sorted(merged.items(), key=lambda item: -item[1]))
+
+
+def notify_progress(progress: Optional[Callable[[str, Dict], None]], stage: str, data: Dict):
+    """
+    진행 단계 알림 (스트리밍 응답용, 엔진이 단계 결과를 계산한 즉시 호출)
+    알림 실패가 추출에 영향을 주지 않도록 오류는 기록만 합니다.
+    """
+    if progress is None:
+        return
+    try:
+        progress(stage, data)
+    except Exception as e:
+        logger.warning(f"진행 단계 알림 실패 ({stage}): {e}")
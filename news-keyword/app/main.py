@@ -4,16 +4,22 @@
 기간별 기업 키워드 추출 서비스를 제공합니다.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
+import json
 import logging
 import os
 import time
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 from contextlib import asynccontextmanager
 from keyword_extractor import KeywordExtractor
 from cache_manager import CacheManager
+from response_cache import get_response_cache
+from execution_pool import get_execution_pool, ExecutionRejected
+from single_flight import AsyncSingleFlight
 import glob
 import math
 
@@ -51,17 +57,51 @@ class KeywordResponse(BaseModel):
     original_keyword_count: Optional[int] = 0  # 원본 키워드 개수
     filtered_keyword_count: Optional[int] = 0  # 필터링된 키워드 개수
 
+class BatchKeywordRequest(BaseModel):
+    """여러 기업 키워드 일괄 추출 요청 모델"""
+    company_names: List[str]  # 기업명 목록 (예: ["삼성전자", "SK하이닉스"])
+    start_date: str    # 시작 날짜 (YYYYMMDD 형식)
+    end_date: str      # 종료 날짜 (YYYYMMDD 형식)
+    top_keywords: Optional[int] = 20  # 기업별 상위 키워드 개수 (기본값: 20)
+    use_ai_filter: Optional[bool] = True  # AI 필터링 사용 여부 (기본값: True)
+
+class BatchKeywordResponse(BaseModel):
+    """여러 기업 키워드 일괄 추출 응답 모델"""
+    period: str
+    company_count: int
+    results: Dict[str, KeywordResponse]  # {"기업명": 기업별 키워드 추출 결과, ...}
+    message: str
+
+# 일괄 요청 한 번에 받을 수 있는 최대 기업 수
+BATCH_MAX_COMPANIES = int(os.getenv('BATCH_MAX_COMPANIES', '200'))
+
+# 기업/기간 단위로 공유하는 기본 추출의 상위 기사 선택 기준 키워드 개수
+# (기본 요청 top_keywords=20의 AI 필터링이 쓰던 20 * 2, 요청별 top_keywords는 기본 결과에 적용)
+BASE_TOP_KEYWORDS = int(os.getenv('BASE_TOP_KEYWORDS', '40'))
+
 # 키워드 추출기 및 캐시 매니저 인스턴스
 keyword_extractor = KeywordExtractor()
 cache_manager = CacheManager()
+response_cache = get_response_cache()
+execution_pool = get_execution_pool()
+extraction_flights = AsyncSingleFlight()
+# 진행 중인 추출의 단계 이벤트 (기본 추출 키/요청 키 → StageProgress, extraction_flights의 작업과 함께 생성/제거)
+extraction_progress: Dict[tuple, "StageProgress"] = {}
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 생명주기 관리"""
     # 시작 시
     logger.info("FastAPI 애플리케이션이 시작되었습니다.")
+    
+    # SparkSession warm-up (백그라운드에서 미리 생성해 첫 대용량 요청의 기동 시간 제거)
+    if os.getenv('SPARK_WARMUP', 'true').lower() == 'true':
+        app.state.spark_warmup_task = asyncio.create_task(asyncio.to_thread(keyword_extractor.warm_up_spark))
+        logger.info("🔥 SparkSession warm-up 시작 (백그라운드)")
+    
     yield
     # 종료 시
+    execution_pool.shutdown()
     keyword_extractor.cleanup()
     cache_manager.cleanup()
     logger.info("FastAPI 애플리케이션이 종료되었습니다.")
@@ -81,6 +121,8 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "키워드 추출 (AI 필터링 포함)": "/extract-keywords/ticker",
+            "키워드 추출 스트리밍 (NDJSON/SSE)": "/extract-keywords/ticker/stream",
+            "여러 기업 키워드 일괄 추출": "/extract-keywords/batch",
             "캐시 통계": "/cache/stats",
             "캐시 삭제": "/cache/clear",
             "API 문서": "/docs",
@@ -98,16 +140,25 @@ async def root():
 @app.get("/health")
 async def health_check():
     """헬스체크 엔드포인트"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "spark": keyword_extractor.spark_manager.get_stats(),
+        "execution": execution_pool.get_stats(),
+        "coalesced_requests": extraction_flights.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
 
 @app.get("/cache/stats")
 async def get_cache_stats():
     """캐시 통계 조회 엔드포인트"""
     try:
-        stats = cache_manager.get_cache_stats()
+        stats = await execution_pool.run_io(cache_manager.get_cache_stats)
+        daily_stats = await execution_pool.run_io(keyword_extractor.daily_store.get_stats)
         return {
             "status": "success",
             "cache_stats": stats,
+            "response_cache_stats": response_cache.get_stats(),
+            "daily_aggregate_stats": daily_stats,
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -118,7 +169,9 @@ async def get_cache_stats():
 async def clear_old_cache(days: int = 30):
     """오래된 캐시 삭제 엔드포인트"""
     try:
-        deleted_count = cache_manager.clear_old_cache(days)
+        deleted_count = await execution_pool.run_io(cache_manager.clear_old_cache, days)
+        # 삭제된 결과가 메모리 응답 캐시에서 계속 나가지 않도록 응답 캐시도 비움
+        response_cache.clear()
         return {
             "status": "success",
             "message": f"{deleted_count}개의 오래된 캐시가 삭제되었습니다.",
@@ -130,6 +183,134 @@ async def clear_old_cache(days: int = 30):
         logger.error(f"캐시 삭제 실패: {e}")
         raise HTTPException(status_code=500, detail=f"캐시 삭제 중 오류가 발생했습니다: {str(e)}")
 
+def _result_key(company_name: str, request) -> tuple:
+    """응답 캐시/요청별 후처리 단일 실행 키 (기업명 앞뒤 공백 제거, 일괄 요청은 기업마다 호출)"""
+    return (company_name.strip(), request.start_date, request.end_date,
+            request.top_keywords, bool(request.use_ai_filter))
+
+def _extraction_key(company_name: str, request) -> tuple:
+    """기본 추출 단일 실행 키 (top_keywords/AI 필터링 여부가 달라도 기업/기간이 같으면 한 번만 추출)"""
+    return (company_name.strip(), request.start_date, request.end_date)
+
+def _build_keyword_response(result: Dict, top_keywords: int) -> KeywordResponse:
+    """
+    키워드 추출 결과(dict)를 응답 모델로 변환합니다.
+    
+    Args:
+        result: KeywordExtractor 또는 캐시에서 얻은 결과
+        top_keywords: 응답에 포함할 상위 키워드 개수
+    
+    Returns:
+        KeywordResponse: 응답 모델
+    """
+    # 응답 형식에 맞게 변환 (상위 키워드만)
+    top_keywords_dict = dict(list(result["keywords"].items())[:top_keywords])
+    
+    # 뉴스 기사 정보 변환
+    top_news_articles = _build_news_articles(result.get("top_news_articles"))
+    
+    response = KeywordResponse(
+        company_name=result["company_name"],
+        period=result["period"],
+        total_news_count=result["total_news_count"],
+        daily_news_count=result.get("daily_news_count", {}),
+        keywords=top_keywords_dict,
+        top_news_articles=top_news_articles,
+        message=result["message"],
+        ai_filtered=result.get("ai_filtered", False),
+        ai_analysis=result.get("ai_analysis", ""),
+        original_keyword_count=result.get("original_keyword_count", 0),
+        filtered_keyword_count=result.get("filtered_keyword_count", 0)
+    )
+    
+    return response
+
+def _build_news_articles(articles: Optional[List[Dict]]) -> List[NewsArticle]:
+    """뉴스 기사 정보(dict 목록)를 응답 모델 목록으로 변환합니다. (nan/None 값은 기본 문구로 대체)"""
+    top_news_articles = []
+    if articles:
+        for article in articles:
+            # nan 값 처리
+            url = article.get("url", "URL 없음")
+            if url is None or (isinstance(url, float) and str(url).lower() == 'nan'):
+                url = "URL 없음"
+            
+            title = article.get("title", "제목 없음")
+            if title is None or (isinstance(title, float) and str(title).lower() == 'nan'):
+                title = "제목 없음"
+            
+            date = article.get("date", "날짜 없음")
+            if date is None or (isinstance(date, float) and str(date).lower() == 'nan'):
+                date = "날짜 없음"
+            
+            top_news_articles.append(NewsArticle(
+                title=str(title),
+                date=str(date),
+                url=str(url),
+                matched_keywords_count=article.get("matched_keywords_count", 0),
+                matched_keywords=article.get("matched_keywords", [])
+            ))
+    return top_news_articles
+
+def _extract_base(request: KeywordRequest, progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+    """
+    기업/기간 단위 기본 키워드 추출 (top_keywords/AI 필터링과 무관, 같은 기업/기간 요청들이 공유)
+    블로킹 작업이므로 실행 풀 스레드에서 호출하며, 결과는 여러 요청이 읽으므로 수정하지 않습니다.
+    
+    Args:
+        request: 기본 추출을 시작한 요청
+        progress: 단계별 알림 콜백 (file_plan, daily_counts, raw_keywords)
+    """
+    if progress is not None:
+        progress("file_plan", keyword_extractor.describe_file_plan(request.company_name, request.start_date, request.end_date))
+    
+    return keyword_extractor.extract_keywords_from_csv(
+        company_name=request.company_name,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        top_keywords=BASE_TOP_KEYWORDS,
+        progress=progress
+    )
+
+def _finish_and_cache(request: KeywordRequest, base_result: Dict,
+                      progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+    """
+    공유된 기본 추출 결과에 요청의 top_keywords와 AI 필터링을 적용하고 결과를 SQLite 캐시에 저장합니다.
+    블로킹 작업(AI 호출, SQLite)이므로 실행 풀 스레드에서 호출합니다.
+    
+    Args:
+        request: 키워드 추출 요청
+        base_result: _extract_base 결과 (수정하지 않음)
+        progress: 단계별 알림 콜백 (filtered_keywords, top_articles, analysis)
+    """
+    if request.use_ai_filter:
+        result = keyword_extractor.apply_ai_filter(
+            base_result,
+            company_name=request.company_name,
+            top_keywords=request.top_keywords,
+            use_ai_filter=request.use_ai_filter,
+            progress=progress
+        )
+    else:
+        result = keyword_extractor.fit_to_top_keywords(base_result, request.top_keywords)
+    
+    # 결과를 캐시에 저장
+    cache_saved = cache_manager.save_result(
+        company_name=request.company_name,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        top_keywords=request.top_keywords,
+        use_ai_filter=request.use_ai_filter,
+        result_data=result
+    )
+    
+    if cache_saved:
+        logger.info(f"💾 결과 캐시 저장 완료: {request.company_name}")
+    else:
+        logger.info(f"⚠️ 캐시 저장 실패 또는 이미 존재: {request.company_name}")
+    
+    return result
+
 @app.post("/extract-keywords/ticker", response_model=KeywordResponse)
 async def extract_keywords(request: KeywordRequest):
     """
@@ -168,8 +349,19 @@ async def extract_keywords(request: KeywordRequest):
         except ValueError:
             raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. YYYYMMDD 형식을 사용해주세요.")
         
-        # 캐시에서 결과 조회
-        cached_result = cache_manager.get_cached_result(
+        # 기업명 공백을 정리해 응답 캐시, 결과 캐시, 단일 실행이 같은 키를 쓰도록 함
+        request.company_name = request.company_name.strip()
+        
+        # 메모리 응답 캐시 조회 (히트 시 SQLite 조회, JSON 파싱, 모델 생성 생략)
+        response_key = _result_key(request.company_name, request)
+        cached_body = response_cache.get(response_key)
+        if cached_body is not None:
+            logger.info(f"⚡ 응답 캐시 히트: {request.company_name} ({request.start_date}-{request.end_date}), {(time.time() - start_time) * 1000:.2f}ms")
+            return Response(content=cached_body, media_type="application/json")
+        
+        # 캐시에서 결과 조회 (SQLite 조회는 I/O 풀에서 실행)
+        cached_result = await execution_pool.run_io(
+            cache_manager.get_cached_result,
             company_name=request.company_name,
             start_date=request.start_date,
             end_date=request.end_date,
@@ -183,79 +375,15 @@ async def extract_keywords(request: KeywordRequest):
         else:
             logger.info(f"🔍 캐시 미스 - 키워드 추출 실행: {request.company_name}")
             
-            # 키워드 추출 실행 (AI 필터링 옵션 포함)
-            if request.use_ai_filter:
-                result = keyword_extractor.extract_smart_keywords_from_csv(
-                    company_name=request.company_name,
-                    start_date=request.start_date,
-                    end_date=request.end_date,
-                    top_keywords=request.top_keywords,
-                    use_ai_filter=request.use_ai_filter
-                )
-            else:
-                result = keyword_extractor.extract_keywords_from_csv(
-                    company_name=request.company_name,
-                    start_date=request.start_date,
-                    end_date=request.end_date,
-                    top_keywords=request.top_keywords
-                )
-            
-            # 결과를 캐시에 저장
-            cache_saved = cache_manager.save_result(
-                company_name=request.company_name,
-                start_date=request.start_date,
-                end_date=request.end_date,
-                top_keywords=request.top_keywords,
-                use_ai_filter=request.use_ai_filter,
-                result_data=result
-            )
-            
-            if cache_saved:
-                logger.info(f"💾 결과 캐시 저장 완료: {request.company_name}")
-            else:
-                logger.info(f"⚠️ 캐시 저장 실패 또는 이미 존재: {request.company_name}")
-        
-        # 응답 형식에 맞게 변환 (상위 키워드만)
-        top_keywords_dict = dict(list(result["keywords"].items())[:request.top_keywords])
+            # 키워드 추출 + 캐시 저장은 실행 풀에서 (이벤트 루프는 다른 요청 처리)
+            # 동시에 들어온 같은 요청(스트리밍 포함)은 하나의 실행 결과를 함께 기다림
+            task, _ = _join_extraction(request, response_key)
+            result = await asyncio.shield(task)
         
-        # 뉴스 기사 정보 변환
-        top_news_articles = []
-        if "top_news_articles" in result and result["top_news_articles"]:
-            for article in result["top_news_articles"]:
-                # nan 값 처리
-                url = article.get("url", "URL 없음")
-                if url is None or (isinstance(url, float) and str(url).lower() == 'nan'):
-                    url = "URL 없음"
-                
-                title = article.get("title", "제목 없음")
-                if title is None or (isinstance(title, float) and str(title).lower() == 'nan'):
-                    title = "제목 없음"
-                
-                date = article.get("date", "날짜 없음")
-                if date is None or (isinstance(date, float) and str(date).lower() == 'nan'):
-                    date = "날짜 없음"
-                
-                top_news_articles.append(NewsArticle(
-                    title=str(title),
-                    date=str(date),
-                    url=str(url),
-                    matched_keywords_count=article.get("matched_keywords_count", 0),
-                    matched_keywords=article.get("matched_keywords", [])
-                ))
-        
-        response = KeywordResponse(
-            company_name=result["company_name"],
-            period=result["period"],
-            total_news_count=result["total_news_count"],
-            daily_news_count=result.get("daily_news_count", {}),
-            keywords=top_keywords_dict,
-            top_news_articles=top_news_articles,
-            message=result["message"],
-            ai_filtered=result.get("ai_filtered", False),
-            ai_analysis=result.get("ai_analysis", ""),
-            original_keyword_count=result.get("original_keyword_count", 0),
-            filtered_keyword_count=result.get("filtered_keyword_count", 0)
-        )
+        # 응답 모델 생성 후 직렬화해 응답 캐시에 보관
+        response = _build_keyword_response(result, request.top_keywords)
+        response_body = response.model_dump_json().encode('utf-8')
+        response_cache.put(response_key, response_body)
         
         # 총 소요 시간 계산
         total_time = time.time() - start_time
@@ -272,8 +400,20 @@ async def extract_keywords(request: KeywordRequest):
         # 총 API 응답 시간 출력
         logger.info(f"🎯 총 API 응답 시간: {total_time:.2f}초")
         
-        return response
+        return Response(content=response_body, media_type="application/json")
         
+    except HTTPException:
+        raise
+    except ExecutionRejected as e:
+        total_time = time.time() - start_time
+        logger.warning(f"⛔ 요청 거절 (실행 풀 포화): {str(e)}")
+        logger.error(f"❌ API 실패 응답 시간: {total_time:.2f}초")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except asyncio.TimeoutError:
+        total_time = time.time() - start_time
+        logger.error(f"⏱️ 키워드 추출 제한 시간 초과: {request.company_name} ({request.start_date}-{request.end_date})")
+        logger.error(f"❌ API 실패 응답 시간: {total_time:.2f}초")
+        raise HTTPException(status_code=504, detail=f"키워드 추출이 제한 시간({execution_pool.timeout_seconds:.0f}초) 안에 끝나지 않았습니다. 잠시 후 다시 요청해주세요.")
     except FileNotFoundError as e:
         total_time = time.time() - start_time
         logger.error(f"파일을 찾을 수 없습니다: {str(e)}")
@@ -290,6 +430,435 @@ async def extract_keywords(request: KeywordRequest):
         logger.error(f"❌ API 실패 응답 시간: {total_time:.2f}초")
         raise HTTPException(status_code=500, detail=f"키워드 추출 중 오류가 발생했습니다: {str(e)}")
 
+# 스트리밍 응답 단계 (이 순서로 전송)
+STREAM_STAGES = ("file_plan", "daily_counts", "raw_keywords", "filtered_keywords", "top_articles", "analysis")
+
+def _stage_payload(stage: str, result: Dict, top_keywords: int) -> Dict:
+    """
+    스트리밍 단계별 전송 데이터를 만듭니다.
+    
+    Args:
+        stage: 단계명 (STREAM_STAGES)
+        result: 그 시점의 추출 결과 (file_plan 단계는 파일 계획)
+        top_keywords: 전송할 상위 키워드 개수
+    """
+    if stage == "file_plan":
+        return dict(result)
+    if stage == "daily_counts":
+        return {
+            "total_news_count": result.get("total_news_count", 0),
+            "daily_news_count": result.get("daily_news_count", {}),
+        }
+    if stage == "raw_keywords":
+        return {"keywords": dict(list(result.get("keywords", {}).items())[:top_keywords])}
+    if stage == "filtered_keywords":
+        return {
+            "keywords": dict(list(result.get("keywords", {}).items())[:top_keywords]),
+            "ai_filtered": result.get("ai_filtered", False),
+            "original_keyword_count": result.get("original_keyword_count", 0),
+            "filtered_keyword_count": result.get("filtered_keyword_count", 0),
+        }
+    if stage == "top_articles":
+        return {"top_news_articles": [article.model_dump() for article in _build_news_articles(result.get("top_news_articles"))]}
+    if stage == "analysis":
+        return {"ai_analysis": result.get("ai_analysis", ""), "message": result.get("message", "")}
+    raise ValueError(f"알 수 없는 스트리밍 단계: {stage}")
+
+def _format_stream_event(event: str, data, stream_format: str) -> bytes:
+    """이벤트 하나를 NDJSON 한 줄 또는 SSE 메시지로 직렬화합니다. (numpy 값은 파이썬 값으로 변환)"""
+    def to_json(value):
+        return json.dumps(value, ensure_ascii=False, default=lambda o: o.item() if hasattr(o, "item") else str(o))
+    
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {to_json(data)}\n\n".encode('utf-8')
+    return (to_json({"event": event, "data": data}) + "\n").encode('utf-8')
+
+class StageProgress:
+    """
+    진행 중인 추출 하나의 단계 이벤트 기록
+    같은 추출을 기다리는 스트리밍 요청들이 함께 구독하고, 늦게 합류한 요청에는 지난 단계를 먼저 다시 전달합니다.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, top_keywords: Optional[int]):
+        self.loop = loop
+        self.top_keywords = top_keywords
+        self.events: List[tuple] = []  # (단계명, 전송 데이터) - 단계당 한 번
+        self._subscribers: List[asyncio.Queue] = []
+    
+    def publish(self, stage: str, result: Dict):
+        """
+        단계 알림 (실행 풀 스레드에서 호출)
+        그 시점의 결과로 전송 데이터를 만든 뒤 이벤트 루프로 넘기고, 오류는 추출이 계속되도록 기록만 합니다.
+        """
+        try:
+            payload = _stage_payload(stage, result, self.top_keywords)
+            self.loop.call_soon_threadsafe(self._append, stage, payload)
+        except Exception as e:
+            logger.debug(f"스트리밍 이벤트 전달 실패 ({stage}): {e}")
+    
+    def _append(self, stage: str, payload: Dict):
+        """이벤트 루프에서 기록 후 구독자에게 전달 (엔진 폴백으로 같은 단계가 다시 오면 무시)"""
+        if any(sent_stage == stage for sent_stage, _ in self.events):
+            return
+        self.events.append((stage, payload))
+        for queue in self._subscribers:
+            queue.put_nowait((stage, payload))
+    
+    def forward(self, stage: str, payload: Dict):
+        """
+        공유 기본 추출의 단계 이벤트를 이 요청의 top_keywords에 맞춰 기록 (이벤트 루프에서 호출)
+        기본 추출의 키워드 빈도는 자르지 않은 전체이므로 요청마다 잘라서 전달합니다.
+        """
+        if stage == "raw_keywords":
+            payload = {"keywords": dict(list(payload["keywords"].items())[:self.top_keywords])}
+        self._append(stage, payload)
+    
+    def subscribe(self) -> asyncio.Queue:
+        """지난 단계가 미리 들어 있는 이벤트 큐 반환"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+        self._subscribers.append(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        """구독 해제 (연결이 끊긴 스트리밍 요청)"""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+def _start_base_extraction(request: KeywordRequest, base_key: tuple):
+    """
+    기본 추출을 실행 풀에 넣고 결과를 기다리는 코루틴을 반환합니다. (extraction_flights.start에서만 호출)
+    
+    Raises:
+        ExecutionRejected: 실행 풀이 가득 찬 경우 (작업을 등록하지 않음)
+    """
+    base_progress = StageProgress(asyncio.get_running_loop(), None)
+    future = execution_pool.submit(_extract_base, request, base_progress.publish)
+    extraction_progress[base_key] = base_progress
+    return execution_pool.wait(future)
+
+def _start_extraction(request: KeywordRequest, key: tuple):
+    """
+    요청별 추출을 시작합니다. (extraction_flights.start에서만 호출)
+    같은 기업/기간의 기본 추출이 진행 중이면 합류하고, 없으면 새로 시작한 뒤 요청별 후처리를 이어서 실행합니다.
+    
+    Raises:
+        ExecutionRejected: 기본 추출을 새로 시작해야 하는데 실행 풀이 가득 찬 경우 (작업을 등록하지 않음)
+    """
+    base_key = _extraction_key(request.company_name, request)
+    base_task = extraction_flights.start(base_key, _start_base_extraction, request, base_key)
+    base_progress = extraction_progress.get(base_key)
+    if base_progress is not None:
+        base_task.add_done_callback(lambda _: _forget_progress(base_key, base_progress))
+    
+    progress = StageProgress(asyncio.get_running_loop(), request.top_keywords)
+    extraction_progress[key] = progress
+    return _finish_extraction(request, base_task, base_progress, progress)
+
+async def _finish_extraction(request: KeywordRequest, base_task: asyncio.Task,
+                             base_progress: Optional[StageProgress], progress: StageProgress) -> Dict:
+    """
+    기본 추출의 단계 이벤트를 요청의 단계 기록으로 전달하고,
+    기본 추출이 끝나면 요청별 후처리(top_keywords, AI 필터링, 캐시 저장)를 실행 풀에서 실행합니다.
+    """
+    if base_progress is not None:
+        events = base_progress.subscribe()
+        getter = None
+        try:
+            while not base_task.done():
+                getter = asyncio.ensure_future(events.get())
+                await asyncio.wait({getter, base_task}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    break
+                progress.forward(*getter.result())
+            while not events.empty():
+                progress.forward(*events.get_nowait())
+        finally:
+            if getter is not None and not getter.done():
+                getter.cancel()
+            base_progress.unsubscribe(events)
+    
+    base_result = await asyncio.shield(base_task)
+    return await execution_pool.run(_finish_and_cache, request, base_result, progress.publish)
+
+def _join_extraction(request: KeywordRequest, key: tuple):
+    """
+    같은 요청의 추출이 진행 중이면 합류하고, 없으면 새로 시작합니다.
+    단건/스트리밍 API가 함께 사용하므로 어느 쪽이 먼저 시작해도 추출은 한 번만 실행되고,
+    top_keywords/AI 필터링 여부만 다른 요청끼리도 기업/기간 단위 기본 추출은 한 번만 실행됩니다.
+    
+    Returns:
+        Tuple[asyncio.Task, StageProgress]: (추출 작업, 단계 이벤트)
+    
+    Raises:
+        ExecutionRejected: 새로 시작해야 하는데 실행 풀이 가득 찬 경우
+    """
+    task = extraction_flights.start(key, _start_extraction, request, key)
+    progress = extraction_progress.get(key)
+    if progress is None:
+        # 작업이 막 끝나 단계 기록이 정리된 경우 (남은 단계는 최종 결과로 채움)
+        progress = StageProgress(asyncio.get_running_loop(), request.top_keywords)
+    else:
+        task.add_done_callback(lambda _: _forget_progress(key, progress))
+    return task, progress
+
+def _forget_progress(key: tuple, progress: StageProgress):
+    """추출 작업이 끝나면 단계 기록 제거 (같은 키로 새로 시작한 기록은 유지)"""
+    if extraction_progress.get(key) is progress:
+        del extraction_progress[key]
+
+@app.post("/extract-keywords/ticker/stream")
+async def extract_keywords_stream(request: KeywordRequest, format: str = "ndjson"):
+    """
+    /extract-keywords/ticker의 스트리밍 버전
+    단계가 끝날 때마다 이벤트를 보내므로 첫 응답은 파일 계획 단계 비용만큼만 걸리고
+    클라이언트는 결과를 점진적으로 표시할 수 있습니다.
+    
+    이벤트 순서: file_plan → daily_counts → raw_keywords → filtered_keywords → top_articles → analysis → result
+    (result는 /extract-keywords/ticker와 같은 응답, 처리 중 오류는 error 이벤트로 전달)
+    daily_counts/raw_keywords는 엔진이 날짜별 개수와 키워드 빈도를 계산하는 즉시 전송되고,
+    같은 요청의 추출이 이미 진행 중이면(단건 API 포함) 합류해 지난 단계부터 받습니다.
+    
+    Args:
+        request: 키워드 추출 요청
+        format: "ndjson"(기본값, application/x-ndjson) 또는 "sse"(text/event-stream)
+    """
+    start_time = time.time()
+    logger.info(f"🚀 키워드 추출 스트리밍 요청: {request.company_name}, {request.start_date}-{request.end_date}")
+    
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format은 ndjson 또는 sse만 사용할 수 있습니다.")
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    
+    # 날짜 형식 검증
+    try:
+        datetime.strptime(request.start_date, "%Y%m%d")
+        datetime.strptime(request.end_date, "%Y%m%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. YYYYMMDD 형식을 사용해주세요.")
+    
+    # 캐시 히트면 모든 단계를 바로 전송
+    request.company_name = request.company_name.strip()
+    response_key = _result_key(request.company_name, request)
+    cached_body = response_cache.get(response_key)
+    if cached_body is not None:
+        cached_result = json.loads(cached_body)
+    else:
+        cached_result = await execution_pool.run_io(
+            cache_manager.get_cached_result,
+            company_name=request.company_name,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            top_keywords=request.top_keywords,
+            use_ai_filter=request.use_ai_filter
+        )
+    
+    if cached_result:
+        logger.info(f"🎯 캐시에서 스트리밍 결과 반환: {request.company_name}")
+        
+        def cached_stream():
+            yield _format_stream_event("file_plan", {"source": "cache"}, format)
+            for stage in STREAM_STAGES[1:]:
+                yield _format_stream_event(stage, _stage_payload(stage, cached_result, request.top_keywords), format)
+            yield _format_stream_event("result", _build_keyword_response(cached_result, request.top_keywords).model_dump(), format)
+        
+        return StreamingResponse(cached_stream(), media_type=media_type)
+    
+    # 추출 작업 등록 또는 진행 중인 같은 추출에 합류 (새로 시작할 때 실행 풀이 가득 차면 스트림을 시작하기 전에 503)
+    try:
+        task, progress = _join_extraction(request, response_key)
+    except ExecutionRejected as e:
+        logger.warning(f"⛔ 요청 거절 (실행 풀 포화): {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    events = progress.subscribe()
+    
+    async def event_stream():
+        sent = set()
+        getter = None
+        try:
+            # 작업이 끝날 때까지 단계 이벤트 전달 (합류한 요청은 지난 단계부터 받음)
+            while not task.done():
+                getter = asyncio.ensure_future(events.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    break
+                stage, payload = getter.result()
+                sent.add(stage)
+                yield _format_stream_event(stage, payload, format)
+            while not events.empty():
+                stage, payload = events.get_nowait()
+                sent.add(stage)
+                yield _format_stream_event(stage, payload, format)
+            
+            result = task.result()
+            
+            # 중간에 알리지 않은 단계(AI 필터링 미사용, 필터링 결과 없음 등)는 최종 결과로 채움
+            for stage in STREAM_STAGES[1:]:
+                if stage not in sent:
+                    yield _format_stream_event(stage, _stage_payload(stage, result, request.top_keywords), format)
+            
+            response = _build_keyword_response(result, request.top_keywords)
+            response_body = response.model_dump_json().encode('utf-8')
+            response_cache.put(response_key, response_body)
+            yield _format_stream_event("result", json.loads(response_body), format)
+            
+            logger.info(f"🎯 총 스트리밍 응답 시간: {time.time() - start_time:.2f}초")
+        
+        except asyncio.TimeoutError:
+            logger.error(f"⏱️ 키워드 추출 제한 시간 초과: {request.company_name} ({request.start_date}-{request.end_date})")
+            yield _format_stream_event("error", {
+                "status_code": 504,
+                "detail": f"키워드 추출이 제한 시간({execution_pool.timeout_seconds:.0f}초) 안에 끝나지 않았습니다. 잠시 후 다시 요청해주세요."
+            }, format)
+        except FileNotFoundError as e:
+            logger.error(f"파일을 찾을 수 없습니다: {str(e)}")
+            yield _format_stream_event("error", {"status_code": 404, "detail": str(e)}, format)
+        except ValueError as e:
+            logger.error(f"잘못된 요청: {str(e)}")
+            yield _format_stream_event("error", {"status_code": 400, "detail": str(e)}, format)
+        except Exception as e:
+            logger.error(f"내부 서버 오류: {str(e)}")
+            yield _format_stream_event("error", {"status_code": 500, "detail": f"키워드 추출 중 오류가 발생했습니다: {str(e)}"}, format)
+        finally:
+            # 클라이언트가 연결을 끊어도 추출은 끝까지 실행되어 캐시에 저장되고, 함께 기다리던 요청도 결과를 받음
+            if getter is not None and not getter.done():
+                getter.cancel()
+            progress.unsubscribe(events)
+    
+    return StreamingResponse(event_stream(), media_type=media_type)
+
+def _extract_batch_and_cache(request: BatchKeywordRequest, company_names: List[str]) -> Dict[str, Dict]:
+    """
+    SQLite 캐시에 없는 기업만 모아 한 번의 데이터 스캔으로 추출하고 기업별로 캐시에 저장합니다.
+    블로킹 작업이므로 실행 풀 스레드에서 호출합니다.
+    
+    Returns:
+        Dict[str, Dict]: 기업명 → 키워드 추출 결과 (요청 순서)
+    """
+    results = {}
+    missing = []
+    for company_name in company_names:
+        cached_result = cache_manager.get_cached_result(
+            company_name=company_name,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            top_keywords=request.top_keywords,
+            use_ai_filter=request.use_ai_filter
+        )
+        if cached_result:
+            results[company_name] = cached_result
+        else:
+            missing.append(company_name)
+    
+    logger.info(f"🎯 일괄 요청 캐시 히트 {len(results)}개, 추출 대상 {len(missing)}개")
+    
+    if missing:
+        extracted = keyword_extractor.extract_keywords_batch(
+            company_names=missing,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            top_keywords=request.top_keywords,
+            use_ai_filter=request.use_ai_filter
+        )
+        for company_name in missing:
+            result = extracted[company_name]
+            cache_manager.save_result(
+                company_name=company_name,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                top_keywords=request.top_keywords,
+                use_ai_filter=request.use_ai_filter,
+                result_data=result
+            )
+            results[company_name] = result
+    
+    return {company_name: results[company_name] for company_name in company_names}
+
+@app.post("/extract-keywords/batch", response_model=BatchKeywordResponse)
+async def extract_keywords_batch(request: BatchKeywordRequest):
+    """
+    여러 기업의 키워드를 한 번에 추출하는 엔드포인트
+    기간 데이터 로드, 날짜 필터, 기관 컬럼 순회, 키워드 토큰화를 기업 수와 관계없이 한 번만 수행하고
+    AI 필터링/분석도 기업들을 묶어 요청합니다. 기업별 결과는 단건 API와 같은 캐시를 공유합니다.
+    
+    Example:
+        POST /extract-keywords/batch
+        {
+            "company_names": ["삼성전자", "SK하이닉스"],
+            "start_date": "20200901",
+            "end_date": "20200903",
+            "top_keywords": 20,
+            "use_ai_filter": true
+        }
+    """
+    start_time = time.time()
+    
+    try:
+        # 기업명 정리 (공백 제거, 중복 제거, 요청 순서 유지)
+        company_names = list(dict.fromkeys(name.strip() for name in request.company_names if name and name.strip()))
+        logger.info(f"🚀 일괄 키워드 추출 요청: {len(company_names)}개 기업, {request.start_date}-{request.end_date}")
+        
+        if not company_names:
+            raise HTTPException(status_code=400, detail="기업명을 하나 이상 입력해주세요.")
+        if len(company_names) > BATCH_MAX_COMPANIES:
+            raise HTTPException(status_code=400, detail=f"한 번에 최대 {BATCH_MAX_COMPANIES}개 기업까지 요청할 수 있습니다.")
+        
+        # 날짜 형식 검증
+        try:
+            datetime.strptime(request.start_date, "%Y%m%d")
+            datetime.strptime(request.end_date, "%Y%m%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. YYYYMMDD 형식을 사용해주세요.")
+        
+        # 캐시 조회 + 일괄 추출 + 캐시 저장은 실행 풀에서 (작업 하나로 수락 제어)
+        results = await execution_pool.run(_extract_batch_and_cache, request, company_names)
+        
+        # 기업별 응답 생성 (단건 API가 바로 쓸 수 있도록 응답 캐시에도 보관)
+        responses = {}
+        for company_name, result in results.items():
+            response = _build_keyword_response(result, request.top_keywords)
+            response_cache.put(_result_key(company_name, request), response.model_dump_json().encode('utf-8'))
+            responses[company_name] = response
+        
+        total_time = time.time() - start_time
+        logger.info(f"🎯 일괄 API 응답 시간: {total_time:.2f}초 ({len(company_names)}개 기업)")
+        
+        return BatchKeywordResponse(
+            period=f"{request.start_date}-{request.end_date}",
+            company_count=len(responses),
+            results=responses,
+            message=f"{len(responses)}개 기업의 키워드를 추출했습니다."
+        )
+    
+    except HTTPException:
+        raise
+    except ExecutionRejected as e:
+        total_time = time.time() - start_time
+        logger.warning(f"⛔ 요청 거절 (실행 풀 포화): {str(e)}")
+        logger.error(f"❌ API 실패 응답 시간: {total_time:.2f}초")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except asyncio.TimeoutError:
+        total_time = time.time() - start_time
+        logger.error(f"⏱️ 일괄 키워드 추출 제한 시간 초과: {request.start_date}-{request.end_date}")
+        logger.error(f"❌ API 실패 응답 시간: {total_time:.2f}초")
+        raise HTTPException(status_code=504, detail=f"키워드 추출이 제한 시간({execution_pool.timeout_seconds:.0f}초) 안에 끝나지 않았습니다. 잠시 후 다시 요청해주세요.")
+    except FileNotFoundError as e:
+        total_time = time.time() - start_time
+        logger.error(f"파일을 찾을 수 없습니다: {str(e)}")
+        logger.error(f"❌ API 실패 응답 시간: {total_time:.2f}초")
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        total_time = time.time() - start_time
+        logger.error(f"잘못된 요청: {str(e)}")
+        logger.error(f"❌ API 실패 응답 시간: {total_time:.2f}초")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        total_time = time.time() - start_time
+        logger.error(f"내부 서버 오류: {str(e)}")
+        logger.error(f"❌ API 실패 응답 시간: {total_time:.2f}초")
+        raise HTTPException(status_code=500, detail=f"일괄 키워드 추출 중 오류가 발생했습니다: {str(e)}")
+
 
 # ------------------------------
 # 기업 영향력 API (Parquet → pyarrow)
@@ -427,7 +996,7 @@ async def get_influence(path: str = "s3://cheesecrust-spark-data-bucket/outputs/
         raise HTTPException(status_code=400, detail="top 은 1 이상이어야 합니다.")
 
     path_glob = _resolve_parquet_glob(path)
-    items, score_type = _load_influence_with_pyarrow(path_glob, top, company)
+    items, score_type = await execution_pool.run_io(_load_influence_with_pyarrow, path_glob, top, company)
     return items
 
 if __name__ == "__main__":
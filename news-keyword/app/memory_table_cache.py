@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+프로세스 내 Arrow 테이블 메모리 캐시
+디스크 캐시(CSV 캐시, 뉴스 저장소) 위에서 최근 사용한 테이블을 메모리 한도 안에 보관합니다.
+Arrow 테이블은 변경되지 않으므로 조회 결과(컬럼 선택, 슬라이스)는 같은 버퍼를 공유합니다.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryTableCache:
+    """(원본 경로, 버전) → Arrow 테이블 LRU 캐시"""
+    
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        초기화
+        
+        Args:
+            max_bytes: 메모리 한도 (기본값: MEMORY_TABLE_CACHE_MB 또는 512MB, 0이면 사용 안 함)
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('MEMORY_TABLE_CACHE_MB', '512')) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        
+        # (원본 경로, 구분) → (버전, 테이블), 앞쪽이 가장 오래 사용하지 않은 항목
+        self._tables: "OrderedDict[Tuple[str, Hashable], Tuple[Hashable, pa.Table]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def is_enabled(self) -> bool:
+        """메모리 캐시 사용 여부"""
+        return self.max_bytes > 0
+    
+    def get(self, source_path: str, version: Hashable, kind: Hashable = None) -> Optional[pa.Table]:
+        """
+        테이블 조회 (버전이 다르면 오래된 항목을 버리고 None)
+        
+        Args:
+            source_path: 원본 경로
+            version: 원본/디스크 캐시 버전 (ETag, 저장 시각 등)
+            kind: 같은 원본의 다른 테이블 구분 (예: CSV 캐시 / 뉴스 저장소)
+        """
+        if not self.is_enabled():
+            return None
+        
+        key = (source_path, kind)
+        with self._lock:
+            cached = self._tables.get(key)
+            if cached is None or cached[0] != version:
+                if cached is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            
+            self._tables.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+    
+    def put(self, source_path: str, version: Hashable, table: pa.Table, kind: Hashable = None) -> bool:
+        """
+        테이블 저장 (한도를 넘으면 오래 사용하지 않은 항목부터 제거)
+        
+        Returns:
+            bool: 저장 여부 (한도보다 큰 테이블은 저장하지 않음)
+        """
+        if not self.is_enabled():
+            return False
+        
+        size = table.nbytes
+        if size > self.max_bytes:
+            logger.debug(f"메모리 캐시 한도보다 큰 테이블은 보관하지 않습니다: {os.path.basename(source_path)} ({size / (1024*1024):.1f}MB)")
+            return False
+        
+        key = (source_path, kind)
+        with self._lock:
+            if key in self._tables:
+                self._remove(key)
+            
+            while self._tables and self._total_bytes + size > self.max_bytes:
+                self._remove(next(iter(self._tables)))
+                self.evictions += 1
+            
+            self._tables[key] = (version, table)
+            self._total_bytes += size
+        
+        return True
+    
+    def _remove(self, key):
+        """항목 제거 (락을 잡은 상태에서 호출)"""
+        _, table = self._tables.pop(key)
+        self._total_bytes -= table.nbytes
+    
+    def invalidate(self, source_path: str):
+        """원본 경로의 모든 항목 제거"""
+        with self._lock:
+            for key in [key for key in self._tables if key[0] == source_path]:
+                self._remove(key)
+    
+    def clear(self):
+        """전체 항목 제거"""
+        with self._lock:
+            self._tables.clear()
+            self._total_bytes = 0
+    
+    def get_stats(self) -> Dict:
+        """메모리 캐시 통계"""
+        with self._lock:
+            total_requests = self.hits + self.misses
+            hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
+            return {
+                "tables": len(self._tables),
+                "memory_mb": f"{self._total_bytes / (1024*1024):.2f}MB",
+                "max_memory_mb": f"{self.max_bytes / (1024*1024):.0f}MB",
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": f"{hit_rate:.1f}%",
+                "evictions": self.evictions,
+            }
+
+
+# 전역 메모리 테이블 캐시 인스턴스 (프로세스당 하나, CSV 캐시와 뉴스 저장소가 공유)
+memory_table_cache = None
+
+def get_memory_table_cache() -> MemoryTableCache:
+    """메모리 테이블 캐시 인스턴스 반환"""
+    global memory_table_cache
+    if memory_table_cache is None:
+        memory_table_cache = MemoryTableCache()
+    return memory_table_cache
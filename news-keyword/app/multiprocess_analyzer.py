@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+멀티프로세스 키워드 추출 엔진
+파일 단위 샤드를 프로세스 풀에서 처리하고 작은 부분 집계만 병합합니다.
+(Spark 없이 멀티코어 서버에서 여러 파일 기간을 병렬 처리)
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from date_utils import DATE_KEY_COLUMN, find_date_column, to_date_key, fill_daily_counts
+from keyword_utils import count_keywords_in_order, merge_keyword_counts, notify_progress
+from news_store import KEYWORD_LIST_COLUMN
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스별 분석기 (저장소/캐시 인덱스를 작업 간에 재사용)
+_worker_analyzer = None
+
+# 상위 기사 선택에 필요한 컬럼 (워커가 부모 프로세스로 돌려주는 기사 요약)
+ARTICLE_COLUMNS = ['제목', '일자', 'URL', '키워드', KEYWORD_LIST_COLUMN]
+
+
+def _init_worker():
+    """
+    워커 프로세스 초기화
+    샤드는 작업마다 한 번만 읽으므로 워커마다 메모리 테이블 캐시(기본 512MB)를 두지 않습니다.
+    """
+    os.environ['MEMORY_TABLE_CACHE_MB'] = '0'
+
+
+def _get_worker_analyzer():
+    """워커 프로세스의 PandasAnalyzer (프로세스당 한 번 생성)"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        from pandas_analyzer import PandasAnalyzer
+        _worker_analyzer = PandasAnalyzer()
+    return _worker_analyzer
+
+
+def _load_filtered_shard(csv_path: str, company_name: str, start_date: str, end_date: str):
+    """샤드 하나를 읽어 기업/날짜 필터링합니다. (기관 컬럼이 없으면 None)"""
+    analyzer = _get_worker_analyzer()
+    df = analyzer.load_news_frame(csv_path, start_date, end_date, company_name)
+    if '기관' not in df.columns:
+        return analyzer, df, None
+    return analyzer, df, analyzer.filter_company_news(df, company_name, start_date, end_date)
+
+
+def _count_shard(csv_path: str, company_name: str, start_date: str, end_date: str) -> Dict:
+    """
+    워커: 샤드의 뉴스 수, 날짜별 개수, 키워드 빈도(등장 순서 유지)를 계산하고
+    상위 기사 선택에 필요한 컬럼만 남긴 기업 기사 요약을 함께 돌려줍니다. (샤드는 한 번만 읽음)
+    
+    Returns:
+        Dict: 부분 집계 + 기사 요약 데이터프레임 (articles)
+    """
+    analyzer, df, filtered_df = _load_filtered_shard(csv_path, company_name, start_date, end_date)
+    
+    partial = {
+        "loaded_rows": len(df),
+        "has_org": filtered_df is not None,
+        "has_keywords": '키워드' in df.columns,
+        "has_date": False,
+        "total_count": 0,
+        "date_counts": {},
+        "keywords": {},
+        "articles": None,
+    }
+    if filtered_df is None:
+        return partial
+    
+    partial["total_count"] = len(filtered_df)
+    partial["articles"] = filtered_df[[c for c in ARTICLE_COLUMNS if c in filtered_df.columns]].reset_index(drop=True)
+    
+    date_column = find_date_column(filtered_df.columns)
+    if date_column is not None:
+        partial["has_date"] = True
+        if DATE_KEY_COLUMN in filtered_df.columns:
+            date_keys = filtered_df[DATE_KEY_COLUMN]
+        else:
+            date_keys = to_date_key(filtered_df[date_column])
+        counts = date_keys.dropna().astype('int64').value_counts()
+        partial["date_counts"] = {int(day_key): int(count) for day_key, count in counts.items()}
+    
+    if partial["has_keywords"] and len(filtered_df) > 0:
+        partial["keywords"] = count_keywords_in_order(analyzer.tokenize_keywords(filtered_df), company_name)
+    
+    return partial
+
+
+class MultiprocessAnalyzer:
+    """파일 단위 샤드를 프로세스 풀에서 처리하는 키워드 추출 분석기"""
+    
+    def __init__(self, max_workers: Optional[int] = None, pandas_analyzer=None):
+        """
+        초기화
+        
+        Args:
+            max_workers: 워커 프로세스 수 (기본값: MULTIPROCESS_WORKERS 또는 CPU 코어 수)
+            pandas_analyzer: 병합한 기사 요약에서 상위 기사를 고를 때 쓰는 분석기 (없으면 처음 사용할 때 생성)
+        """
+        self.max_workers = max_workers or int(os.getenv('MULTIPROCESS_WORKERS', '0')) or os.cpu_count() or 1
+        self.pandas_analyzer = pandas_analyzer
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def is_available(self) -> bool:
+        """병렬 처리할 코어가 있는지 확인"""
+        return self.max_workers > 1
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """프로세스 풀 (처음 사용할 때 생성, 이후 재사용)"""
+        with self._lock:
+            if self._executor is None:
+                # API 프로세스의 스레드(Spark 게이트웨이 등)를 복제하지 않도록 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                logger.info(f"⚙️ 프로세스 풀 생성: 워커 {self.max_workers}개")
+            return self._executor
+    
+    def extract_keywords_multiprocess(self, company_name: str, start_date: str, end_date: str, top_keywords: int, csv_files: List[str], max_articles: int = 10,
+                                      progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """
+        멀티프로세스를 사용한 키워드 추출
+        워커가 샤드별 뉴스 수/날짜별 개수/키워드 빈도와 기사 요약을 한 번에 계산하면,
+        부분 집계를 병합한 뒤 전체 상위 키워드로 병합된 기사 요약에서 상위 기사를 고릅니다.
+        progress를 주면 병합 직후 날짜별 개수와 키워드 빈도를 알립니다.
+        """
+        logger.info(f"⚙️ 멀티프로세스 엔진으로 키워드 추출을 시작합니다. ({len(csv_files)}개 파일, 워커 {self.max_workers}개)")
+        start_time = time.time()
+        
+        executor = self._get_executor()
+        
+        # 샤드별 부분 집계 + 기사 요약
+        count_futures = [
+            executor.submit(_count_shard, csv_path, company_name, start_date, end_date)
+            for csv_path in csv_files
+        ]
+        
+        shards = []  # (csv_path, 부분 집계) - 파일 순서 유지
+        for csv_path, future in zip(csv_files, count_futures):
+            try:
+                shards.append((csv_path, future.result()))
+            except Exception as e:
+                logger.warning(f"CSV 파일 처리 실패: {csv_path}, 오류: {e}")
+        
+        if not shards:
+            raise FileNotFoundError("읽을 수 있는 CSV 파일이 없습니다.")
+        
+        total_loaded_rows = sum(partial["loaded_rows"] for _, partial in shards)
+        logger.info(f"총 {len(csv_files)}개 파일에서 {total_loaded_rows}개 행 로드 완료 ({time.time() - start_time:.2f}초)")
+        
+        if not any(partial["has_org"] for _, partial in shards):
+            raise ValueError("기관 컬럼을 찾을 수 없습니다.")
+        
+        total_count = sum(partial["total_count"] for _, partial in shards)
+        logger.info(f"날짜 필터링 후 뉴스: {total_count}개 ({start_date}-{end_date})")
+        
+        if total_count == 0:
+            return {
+                "company_name": company_name,
+                "period": f"{start_date}-{end_date}",
+                "total_news_count": 0,
+                "daily_news_count": {},
+                "keywords": {},
+                "message": f"'{company_name}'와 관련된 뉴스를 찾을 수 없습니다."
+            }
+        
+        # 날짜별 뉴스 개수 병합
+        daily_news_count = {}
+        if any(partial["has_date"] for _, partial in shards):
+            date_counts = pd.Series(dtype='int64')
+            for _, partial in shards:
+                if partial["date_counts"]:
+                    date_counts = date_counts.add(pd.Series(partial["date_counts"], dtype='int64'), fill_value=0)
+            daily_news_count = fill_daily_counts(date_counts.astype('int64'), start_date, end_date)
+        notify_progress(progress, "daily_counts", {"total_news_count": total_count, "daily_news_count": daily_news_count})
+        
+        if not any(partial["has_keywords"] for _, partial in shards):
+            return {
+                "company_name": company_name,
+                "period": f"{start_date}-{end_date}",
+                "total_news_count": total_count,
+                "daily_news_count": daily_news_count,
+                "keywords": {},
+                "message": "키워드 컬럼을 찾을 수 없습니다."
+            }
+        
+        # 키워드 빈도 병합 (파일 순서대로 합쳐 단일 프로세스와 같은 동률 순서 유지)
+        keywords_dict = merge_keyword_counts(partial["keywords"] for _, partial in shards)
+        top_keywords_list = list(keywords_dict.keys())[:top_keywords]
+        notify_progress(progress, "raw_keywords", {"keywords": keywords_dict})
+        
+        # 전체 상위 키워드 기준 상위 기사 (파일 순서로 이어 붙여 같은 개수는 앞선 파일/행 우선)
+        top_news_articles = []
+        if top_keywords_list:
+            article_frames = [partial["articles"] for _, partial in shards if partial["total_count"] > 0]
+            articles_df = pd.concat(article_frames, ignore_index=True)
+            top_news_articles = self._get_pandas_analyzer().extract_top_news_articles(articles_df, top_keywords_list, max_articles)
+        
+        logger.info(f"⚙️ 멀티프로세스 엔진으로 키워드 추출 완료: {len(keywords_dict)}개 키워드, {time.time() - start_time:.2f}초")
+        
+        return {
+            "company_name": company_name,
+            "period": f"{start_date}-{end_date}",
+            "total_news_count": total_count,
+            "daily_news_count": daily_news_count,
+            "keywords": keywords_dict,
+            "top_news_articles": top_news_articles,
+            "message": f"⚙️ 멀티프로세스 엔진으로 성공적으로 키워드를 추출했습니다. 총 {len(keywords_dict)}개 키워드 발견 (파일 {len(csv_files)}개 처리, 워커 {self.max_workers}개)"
+        }
+    
+    def _get_pandas_analyzer(self):
+        """상위 기사 선택용 분석기 (주입되지 않았으면 처음 사용할 때 생성)"""
+        if self.pandas_analyzer is None:
+            from pandas_analyzer import PandasAnalyzer
+            self.pandas_analyzer = PandasAnalyzer()
+        return self.pandas_analyzer
+    
+    def shutdown(self):
+        """프로세스 풀 정리"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                logger.info("프로세스 풀이 정리되었습니다.")
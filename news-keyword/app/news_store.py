@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+뉴스 컬럼형 저장소
+S3 CSV를 날짜별로 파티셔닝된 Parquet 데이터셋으로 변환하고, 조회 시 필요한 파티션과 컬럼만 읽습니다.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, List, Dict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from date_utils import DATE_KEY_COLUMN, find_date_column, to_date_key
+from keyword_utils import explode_keywords, clean_tokens, to_keyword_lists
+from memory_table_cache import get_memory_table_cache
+
+logger = logging.getLogger(__name__)
+
+# 분석에 사용하는 원본 컬럼 (본문 등 나머지 컬럼은 저장하지 않음)
+STORE_COLUMNS = ['기관', '일자', '키워드', '제목', 'URL']
+
+# 인제스트 시 추가되는 파생 컬럼 (date_key: 정수형 날짜 YYYYMMDD, 파티션 키)
+KEYWORD_LIST_COLUMN = '키워드_목록'    # 쉼표로 분리된 키워드 리스트
+KEYWORD_TOKENS_COLUMN = '키워드_정제'  # 특수문자 제거/길이 필터까지 끝난 집계용 키워드 리스트
+ROW_ID_COLUMN = 'row_id'            # 원본 파일 내 행 번호 (기관 역색인이 가리키는 값)
+
+# 저장 형식이 바뀌면 올려서 기존 데이터셋을 다시 인제스트하도록 함
+STORE_VERSION = 4
+
+# 메모리에 유지할 기관 역색인 개수
+ORG_INDEX_CACHE_SIZE = 64
+
+# 메모리 캐시 제외 목록에 기억할 데이터셋 개수
+UNCACHEABLE_TRACK_SIZE = 256
+
+# 메모리 테이블 캐시에서 저장소 테이블을 구분하는 이름
+MEMORY_CACHE_KIND = "news_store"
+
+
+def _build_org_index(orgs: pd.Series, row_ids: pd.Series) -> pa.Table:
+    """쉼표로 구분된 기관 컬럼에서 기관명 → 행 번호 목록 역색인을 만듭니다."""
+    names = orgs.dropna().astype(str).str.split(',').explode().str.strip()
+    names = names[names.notna() & (names != '')]
+
+    pairs = pd.DataFrame({
+        'org': names.values,
+        ROW_ID_COLUMN: row_ids.loc[names.index].values
+    }).drop_duplicates()
+    grouped = pairs.groupby('org', sort=True)[ROW_ID_COLUMN].agg(list)
+
+    return pa.table({
+        'org': pa.array(grouped.index.tolist(), type=pa.string()),
+        'row_ids': pa.array(grouped.tolist(), type=pa.list_(pa.int64()))
+    })
+
+
+class NewsStore:
+    """날짜 파티션 기반 뉴스 컬럼형 저장소"""
+
+    def __init__(self, store_dir: str = "./news_store", max_bytes: Optional[int] = None, idle_days: Optional[float] = None):
+        """
+        초기화
+
+        Args:
+            store_dir: 저장소 디렉토리
+            max_bytes: 저장소 용량 한도 (기본값: NEWS_STORE_MAX_MB 또는 2048MB, 0이면 무제한)
+                넘으면 가장 오래 조회하지 않은 데이터셋부터 제거 (CSV 캐시와 별도 한도)
+            idle_days: 이 기간 동안 조회하지 않은 데이터셋 제거 (기본값: NEWS_STORE_IDLE_DAYS 또는 7일, 0이면 사용 안 함)
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(exist_ok=True)
+
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('NEWS_STORE_MAX_MB', '2048')) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        if idle_days is None:
+            idle_days = float(os.getenv('NEWS_STORE_IDLE_DAYS', '7'))
+        self.idle_seconds = idle_days * 24 * 3600
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.partition_schema = pa.schema([(DATE_KEY_COLUMN, pa.int32())])
+
+        # 기관 역색인 메모리 캐시 (저장소 키 → (인제스트 시각, 역색인 테이블))
+        self._org_index_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+        # 메모리 테이블 캐시 (자주 조회하는 데이터셋은 디스크를 읽지 않고 메모리에서 필터링)
+        self.memory_cache = get_memory_table_cache()
+        # 메모리 한도보다 커서 캐시할 수 없는 데이터셋 (저장소 키 → 인제스트 시각, 최근 UNCACHEABLE_TRACK_SIZE개)
+        self._uncacheable: "OrderedDict[str, float]" = OrderedDict()
+
+        # 원본 버전 확인용 S3 카탈로그 (KeywordExtractor가 주입, 없으면 검증 생략)
+        self.catalog = None
+
+        logger.info(f"뉴스 저장소 디렉토리 초기화: {self.store_dir.absolute()} (한도: {self._format_limit()})")
+
+    def _format_limit(self) -> str:
+        """용량 한도 표시 문자열"""
+        return f"{self.max_bytes / (1024*1024):.0f}MB" if self.max_bytes > 0 else "무제한"
+
+    def _get_store_key(self, source_path: str) -> str:
+        """원본 경로를 기반으로 저장소 키 생성 (CSV 캐시와 동일한 규칙)"""
+        hash_key = hashlib.md5(source_path.encode()).hexdigest()
+        filename = os.path.splitext(os.path.basename(source_path))[0]
+        return f"{hash_key}_{filename}"
+
+    def _get_entry_dir(self, source_path: str) -> Path:
+        """원본 파일별 저장소 디렉토리 반환"""
+        return self.store_dir / self._get_store_key(source_path)
+
+    def get_data_dir(self, source_path: str) -> str:
+        """파티션 데이터 디렉토리 경로 반환 (Spark 등 외부 엔진에서 직접 읽을 때 사용)"""
+        return str(self._get_entry_dir(source_path) / "data")
+
+    def get_manifest(self, source_path: str) -> Optional[Dict]:
+        """인제스트 메타데이터 반환 (없거나 버전이 다르거나 원본이 바뀌었으면 None)"""
+        manifest_path = self._get_entry_dir(source_path) / "manifest.json"
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if manifest.get('version') != STORE_VERSION:
+            return None
+
+        if not self._is_current(manifest, source_path):
+            # 원본이 덮어써진 항목은 삭제 (카탈로그가 없는 워커 프로세스도 다시 인제스트하도록)
+            logger.info(f"♻️ 원본이 변경되어 저장소 항목 무효화: {os.path.basename(source_path)}")
+            self._remove_entry(self._get_entry_dir(source_path), source_path)
+            return None
+        return manifest
+
+    def _is_current(self, manifest: Dict, source_path: str) -> bool:
+        """저장소 항목이 현재 원본과 같은 버전인지 확인 (비교할 정보가 없으면 유효로 간주)"""
+        source_etag, source_size = self._get_source_info(source_path)
+        if source_etag and manifest.get('source_etag') and manifest['source_etag'] != source_etag:
+            return False
+        if source_size is not None and manifest.get('source_size') is not None and manifest['source_size'] != source_size:
+            return False
+        return True
+
+    def _get_source_info(self, source_path: str):
+        """현재 원본 ETag/크기 (카탈로그가 없거나 목록에 없으면 None)"""
+        if self.catalog is None:
+            return None, None
+        entry = self.catalog.get_entry(source_path)
+        if entry is None:
+            return None, None
+        return entry.etag, entry.size
+
+    def is_ingested(self, source_path: str) -> bool:
+        """원본 파일이 저장소에 인제스트되어 있는지 확인"""
+        return self.get_manifest(source_path) is not None
+
+    def ingest(self, source_path: str, df: pd.DataFrame) -> bool:
+        """
+        원본 DataFrame을 날짜별 파티션 데이터셋으로 변환하여 저장합니다.
+
+        Args:
+            source_path: 원본 CSV 경로 (S3 경로)
+            df: 원본 CSV를 읽은 DataFrame
+
+        Returns:
+            bool: 인제스트 성공 여부
+        """
+        date_column = find_date_column(df.columns)
+        if date_column is None:
+            logger.warning(f"날짜 컬럼이 없어 인제스트를 건너뜁니다: {os.path.basename(source_path)}")
+            return False
+
+        entry_dir = self._get_entry_dir(source_path)
+        tmp_dir = entry_dir.with_name(f"{entry_dir.name}.tmp-{os.getpid()}")
+
+        try:
+            start_time = time.time()
+            source_etag, source_size = self._get_source_info(source_path)
+
+            df = df.reset_index(drop=True)
+            columns = [c for c in STORE_COLUMNS if c in df.columns]
+            if date_column not in columns:
+                columns.append(date_column)
+
+            store_df = pd.DataFrame(index=df.index)
+            for column in columns:
+                values = df[column]
+                # 혼합 타입 컬럼도 문자열로 통일 (결측값은 유지)
+                store_df[column] = values.where(values.isna(), values.astype(str))
+
+            store_df[ROW_ID_COLUMN] = np.arange(len(df), dtype=np.int64)
+            store_df[DATE_KEY_COLUMN] = to_date_key(df[date_column])
+            if '키워드' in df.columns:
+                tokens = explode_keywords(df['키워드'])
+                store_df[KEYWORD_LIST_COLUMN] = to_keyword_lists(tokens, df.index)
+                store_df[KEYWORD_TOKENS_COLUMN] = to_keyword_lists(clean_tokens(tokens), df.index)
+
+            # 날짜를 알 수 없는 행은 어떤 기간 조회에도 포함되지 않으므로 제외
+            store_df = store_df[store_df[DATE_KEY_COLUMN].notna()]
+
+            table = pa.Table.from_pandas(store_df, preserve_index=False)
+            table = table.cast(table.schema.set(
+                table.schema.get_field_index(DATE_KEY_COLUMN),
+                pa.field(DATE_KEY_COLUMN, pa.int32())
+            ))
+
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            ds.write_dataset(
+                table,
+                str(tmp_dir / "data"),
+                format='parquet',
+                partitioning=ds.partitioning(self.partition_schema, flavor='hive'),
+                existing_data_behavior='overwrite_or_ignore'
+            )
+
+            has_org_index = '기관' in store_df.columns
+            if has_org_index:
+                org_index = _build_org_index(store_df['기관'], store_df[ROW_ID_COLUMN])
+                pq.write_table(org_index, tmp_dir / "org_index.parquet")
+
+            manifest = {
+                "version": STORE_VERSION,
+                "source_path": source_path,
+                "columns": table.column_names,
+                "date_column": date_column,
+                "row_count": table.num_rows,
+                "has_org_index": has_org_index,
+                "dropped_rows": len(df) - table.num_rows,
+                "source_etag": source_etag,
+                "source_size": source_size,
+                "size_bytes": sum(path.stat().st_size for path in tmp_dir.rglob('*') if path.is_file()),
+                "ingested_at": time.time()
+            }
+            with open(tmp_dir / "manifest.json", 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+
+            # 완성된 디렉토리로 교체 (조회 중에 반쯤 쓰인 데이터셋이 보이지 않도록)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+
+            ingest_time = time.time() - start_time
+            logger.info(f"🗂️ 인제스트 완료: {os.path.basename(source_path)}")
+            logger.info(f"   📊 행 수: {table.num_rows:,}개, 시간: {ingest_time:.3f}초")
+            if has_org_index:
+                logger.info(f"   🏢 기관 역색인: {org_index.num_rows:,}개 기관")
+
+            self._enforce_limits(keep_key=entry_dir.name)
+
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ 인제스트 실패 ({source_path}): {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+    def _load_org_index(self, source_path: str, manifest: Dict) -> Optional[pa.Table]:
+        """기관 역색인을 읽습니다 (최근 사용한 역색인은 메모리에서 재사용)"""
+        if not manifest.get('has_org_index'):
+            return None
+
+        store_key = self._get_store_key(source_path)
+        cached = self._org_index_cache.get(store_key)
+        if cached is not None and cached[0] == manifest['ingested_at']:
+            self._org_index_cache.move_to_end(store_key)
+            return cached[1]
+
+        org_index = pq.read_table(self._get_entry_dir(source_path) / "org_index.parquet")
+        self._org_index_cache[store_key] = (manifest['ingested_at'], org_index)
+        while len(self._org_index_cache) > ORG_INDEX_CACHE_SIZE:
+            self._org_index_cache.popitem(last=False)
+
+        return org_index
+
+    def lookup_rows(self, source_path: str, company_name: str,
+                    manifest: Optional[Dict] = None) -> Optional[np.ndarray]:
+        """
+        기관 역색인에서 기업명이 포함된 기관의 행 번호들을 찾습니다.
+
+        기관명 목록(수천 개)에 대해서만 부분 문자열 검색을 하므로
+        기존 `기관` 컬럼 전체 스캔과 같은 결과를 행 수와 무관한 비용으로 얻습니다.
+
+        Returns:
+            np.ndarray: 정렬된 행 번호 배열, 역색인을 사용할 수 없으면 None
+        """
+        # 쉼표나 앞뒤 공백이 있는 이름은 기관 단위 매칭과 결과가 달라질 수 있음
+        if not company_name or ',' in company_name or company_name != company_name.strip():
+            return None
+
+        if manifest is None:
+            manifest = self.get_manifest(source_path)
+            if manifest is None:
+                return None
+
+        try:
+            org_index = self._load_org_index(source_path, manifest)
+        except Exception as e:
+            logger.warning(f"기관 역색인 로드 실패 ({source_path}): {e}")
+            return None
+
+        if org_index is None:
+            return None
+
+        mask = pc.match_substring(org_index['org'], company_name)
+        positions = np.flatnonzero(mask.to_numpy(zero_copy_only=False))
+        if len(positions) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        row_ids = org_index['row_ids'].take(pa.array(positions)).combine_chunks().flatten()
+        return np.unique(row_ids.to_numpy())
+
+    def load(self, source_path: str, start_date: str, end_date: str,
+             columns: Optional[List[str]] = None,
+             company_name: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        날짜 범위에 해당하는 파티션에서 필요한 컬럼만 읽습니다.
+
+        Args:
+            source_path: 원본 CSV 경로 (S3 경로)
+            start_date: 시작 날짜 (YYYYMMDD)
+            end_date: 종료 날짜 (YYYYMMDD)
+            columns: 읽을 컬럼 목록 (기본값: 저장된 전체 컬럼)
+            company_name: 지정 시 기관 역색인으로 해당 기업의 행만 읽음
+
+        Returns:
+            pd.DataFrame 또는 None (인제스트되지 않은 경우)
+        """
+        manifest = self.get_manifest(source_path)
+        if manifest is None:
+            return None
+
+        try:
+            start_time = time.time()
+
+            row_ids = None
+            if company_name is not None:
+                row_ids = self.lookup_rows(source_path, company_name, manifest)
+                if row_ids is not None:
+                    logger.info(f"   🏢 '{company_name}' 역색인 조회: {len(row_ids):,}개 행")
+
+            # 1. 메모리 테이블 캐시에서 필터링 (디스크 읽기 없음)
+            cached_table = self._get_memory_table(source_path, manifest)
+            if cached_table is not None:
+                table = self._filter_table(cached_table, start_date, end_date, columns or manifest['columns'], row_ids)
+                source = "메모리"
+            else:
+                # 2. 디스크에서 필요한 파티션/컬럼/행만 읽음
+                table = self._scan_dataset(source_path, start_date, end_date, columns or manifest['columns'], row_ids)
+                source = "저장소"
+
+            df = self._restore_order(table, columns).to_pandas()
+            self._touch(source_path)
+
+            load_time = time.time() - start_time
+            logger.info(f"🗂️ {source}에서 로드: {os.path.basename(source_path)} ({start_date}-{end_date})")
+            logger.info(f"   📊 행 수: {len(df):,}개 / {manifest['row_count']:,}개, 시간: {load_time:.3f}초")
+
+            return df
+
+        except Exception as e:
+            logger.error(f"❌ 저장소 로드 실패 ({source_path}): {e}")
+            return None
+
+    def _open_dataset(self, source_path: str) -> ds.Dataset:
+        """날짜 파티션 데이터셋 열기"""
+        return ds.dataset(
+            self.get_data_dir(source_path),
+            format='parquet',
+            partitioning=ds.partitioning(self.partition_schema, flavor='hive')
+        )
+
+    def _get_memory_table(self, source_path: str, manifest: Dict) -> Optional[pa.Table]:
+        """
+        데이터셋 전체 테이블을 메모리 캐시에서 찾고, 없으면 한 번 읽어 캐시에 올립니다.
+        메모리 캐시를 쓰지 않거나 한도보다 큰 데이터셋이면 None을 반환합니다.
+        """
+        if not self.memory_cache.is_enabled():
+            return None
+
+        store_key = self._get_store_key(source_path)
+        version = manifest['ingested_at']
+        if self._uncacheable.get(store_key) == version:
+            return None
+
+        table = self.memory_cache.get(source_path, version, MEMORY_CACHE_KIND)
+        if table is not None:
+            return table
+
+        table = self._open_dataset(source_path).to_table()
+        if not self.memory_cache.put(source_path, version, table, MEMORY_CACHE_KIND):
+            self._uncacheable[store_key] = version
+            self._uncacheable.move_to_end(store_key)
+            while len(self._uncacheable) > UNCACHEABLE_TRACK_SIZE:
+                self._uncacheable.popitem(last=False)
+        return table
+
+    def _scan_dataset(self, source_path: str, start_date: str, end_date: str,
+                      columns: List[str], row_ids: Optional[np.ndarray]) -> pa.Table:
+        """디스크 데이터셋에서 기간/행 조건에 맞는 파티션과 컬럼만 읽습니다."""
+        dataset = self._open_dataset(source_path)
+
+        columns = [c for c in columns if c in dataset.schema.names]
+        for required in (DATE_KEY_COLUMN, ROW_ID_COLUMN):
+            if required not in columns and required in dataset.schema.names:
+                columns.append(required)
+
+        row_filter = (
+            (ds.field(DATE_KEY_COLUMN) >= int(start_date)) &
+            (ds.field(DATE_KEY_COLUMN) <= int(end_date))
+        )
+        if row_ids is not None:
+            row_filter = row_filter & ds.field(ROW_ID_COLUMN).isin(pa.array(row_ids, type=pa.int64()))
+
+        return dataset.to_table(columns=columns, filter=row_filter)
+
+    def _filter_table(self, table: pa.Table, start_date: str, end_date: str,
+                      columns: List[str], row_ids: Optional[np.ndarray]) -> pa.Table:
+        """메모리 테이블에 디스크 조회와 같은 조건을 적용합니다."""
+        columns = [c for c in columns if c in table.column_names]
+        for required in (DATE_KEY_COLUMN, ROW_ID_COLUMN):
+            if required not in columns and required in table.column_names:
+                columns.append(required)
+
+        date_keys = table[DATE_KEY_COLUMN]
+        mask = pc.and_(
+            pc.greater_equal(date_keys, int(start_date)),
+            pc.less_equal(date_keys, int(end_date))
+        )
+        if row_ids is not None:
+            mask = pc.and_(mask, pc.is_in(table[ROW_ID_COLUMN], value_set=pa.array(row_ids, type=pa.int64())))
+
+        return table.select(columns).filter(mask)
+
+    def _restore_order(self, table: pa.Table, columns: Optional[List[str]]) -> pa.Table:
+        """
+        날짜 파티션 순서로 읽힌 행을 원본 파일 순서(row_id)로 되돌립니다.
+        (키워드 동률 순서와 상위 기사 선택이 원본 CSV를 읽었을 때와 같도록)
+        """
+        if ROW_ID_COLUMN not in table.column_names:
+            return table
+
+        table = table.take(pc.sort_indices(table[ROW_ID_COLUMN]))
+        if columns is not None and ROW_ID_COLUMN not in columns:
+            table = table.drop([ROW_ID_COLUMN])
+        return table
+
+    def _touch(self, source_path: str):
+        """조회 시각 기록 (manifest.json 수정 시각, 여러 프로세스가 함께 보는 LRU 기준)"""
+        try:
+            os.utime(self._get_entry_dir(source_path) / "manifest.json")
+        except OSError:
+            pass
+
+    def _remove_entry(self, entry_dir: Path, source_path: Optional[str]):
+        """데이터셋 디렉토리와 관련 메모리 캐시 삭제"""
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        self._uncacheable.pop(entry_dir.name, None)
+        self._org_index_cache.pop(entry_dir.name, None)
+        if source_path:
+            self.memory_cache.invalidate(source_path)
+
+    def _enforce_limits(self, keep_key: str):
+        """
+        오래 조회하지 않은 데이터셋과 이전 저장 형식 데이터셋을 지우고,
+        용량 한도를 넘으면 가장 오래 조회하지 않은 데이터셋부터 제거합니다. (방금 인제스트한 항목은 유지)
+        """
+        with self._lock:
+            entries = []
+            for entry_dir in self.store_dir.iterdir():
+                if not entry_dir.is_dir() or '.tmp-' in entry_dir.name:
+                    continue
+                manifest_path = entry_dir / "manifest.json"
+                try:
+                    last_access = manifest_path.stat().st_mtime
+                    with open(manifest_path, 'r', encoding='utf-8') as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                entries.append((last_access, entry_dir, manifest))
+
+            now = time.time()
+            total_size = sum(manifest.get('size_bytes', 0) for _, _, manifest in entries)
+            removed = 0
+            for last_access, entry_dir, manifest in sorted(entries, key=lambda item: item[0]):
+                if entry_dir.name == keep_key:
+                    continue
+                outdated = manifest.get('version') != STORE_VERSION
+                idle = self.idle_seconds > 0 and now - last_access > self.idle_seconds
+                over_limit = self.max_bytes > 0 and total_size > self.max_bytes
+                if not (outdated or idle or over_limit):
+                    continue
+                total_size -= manifest.get('size_bytes', 0)
+                self._remove_entry(entry_dir, manifest.get('source_path'))
+                removed += 1
+
+        if removed:
+            self.evictions += removed
+            logger.info(f"🧹 저장소 정리: {removed}개 데이터셋 제거 "
+                        f"(현재 {total_size / (1024*1024):.2f}MB / {self._format_limit()})")
+
+    def clear_store(self) -> bool:
+        """저장소 디렉토리 정리"""
+        try:
+            deleted_count = 0
+            for entry_dir in self.store_dir.iterdir():
+                if entry_dir.is_dir():
+                    shutil.rmtree(entry_dir)
+                    deleted_count += 1
+
+            self.memory_cache.clear()
+            self._uncacheable.clear()
+
+            logger.info(f"🗑️ 저장소 정리 완료: {deleted_count}개 데이터셋 삭제")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ 저장소 정리 실패: {e}")
+            return False
@@ -4,61 +4,163 @@ Pandas를 사용한 키워드 추출 엔진
 """
 
 import os
-import re
-from typing import Dict, List
-from collections import Counter
+from typing import Callable, Dict, List, Optional
 import logging
+import numpy as np
 import pandas as pd
 import time
+from concurrent.futures import Future
 from csv_cache_manager import CSVCacheManager
+from news_store import NewsStore, STORE_COLUMNS, KEYWORD_LIST_COLUMN, KEYWORD_TOKENS_COLUMN, ROW_ID_COLUMN
+from date_utils import DATE_COLUMN_CANDIDATES, DATE_KEY_COLUMN, find_date_column, to_date_key, fill_daily_counts
+from keyword_utils import explode_keywords, explode_keyword_lists, clean_tokens, count_keywords, count_keywords_in_order, to_keyword_lists, notify_progress
+from keyword_matcher import KeywordMatcher, select_top_rows
+from daily_aggregate_store import DailyPartial, SOURCE_COLUMN, iter_date_keys
 
 logger = logging.getLogger(__name__)
 
+# 인제스트/분석에 필요한 원본 컬럼 (캐시에서 본문 등 나머지 컬럼은 읽지 않음)
+ANALYSIS_COLUMNS = STORE_COLUMNS + [c for c in DATE_COLUMN_CANDIDATES if c not in STORE_COLUMNS]
+
 class PandasAnalyzer:
     """Pandas를 사용한 키워드 추출 분석기"""
     
     def __init__(self):
         # CSV 캐시 매니저 초기화
         self.csv_cache = CSVCacheManager()
+        # 날짜 파티션 뉴스 저장소 초기화
+        self.news_store = NewsStore()
+        # S3 선행 다운로드 (KeywordExtractor가 S3Prefetcher를 주입, 없으면 파일마다 직접 읽음)
+        self.prefetcher = None
+    
+    def start_prefetch(self, csv_files: List[str], file_sizes: Optional[Dict[str, int]] = None) -> Dict[str, Future]:
+        """저장소/캐시에 없는 파일의 S3 다운로드를 미리 시작합니다."""
+        if self.prefetcher is None:
+            return {}
+        
+        missing_files = [
+            csv_path for csv_path in csv_files
+            if not self.news_store.is_ingested(csv_path) and not self.csv_cache.is_cached(csv_path)
+        ]
+        
+        try:
+            return self.prefetcher.prefetch(missing_files, file_sizes)
+        except Exception as e:
+            logger.warning(f"S3 선행 다운로드 예약 실패: {e}")
+            return {}
+    
+    def validate_sources(self, csv_files: List[str]):
+        """
+        저장소/캐시 항목을 원본 ETag/크기로 검증합니다.
+        원본이 바뀐 항목은 삭제되므로, 카탈로그 없이 읽는 워커 프로세스도 새 원본을 다시 읽습니다.
+        """
+        for csv_path in csv_files:
+            self.news_store.is_ingested(csv_path)
+            self.csv_cache.is_cached(csv_path)
     
-    def extract_keywords_with_pandas(self, company_name: str, start_date: str, end_date: str, top_keywords: int, csv_files: List[str]) -> Dict:
+    def _read_source_csv(self, csv_path: str, download: Optional[Future] = None):
+        """
+        원본 CSV를 읽습니다. 선행 다운로드가 있으면 로컬 파일을, 실패하면 S3를 직접 읽습니다.
+        
+        Returns:
+            Tuple[pd.DataFrame, Optional[str]]: (데이터, 읽은 스테이징 파일 경로)
+        """
+        if download is not None:
+            try:
+                local_path = download.result()
+                return pd.read_csv(local_path, encoding='utf-8'), local_path
+            except Exception as e:
+                logger.warning(f"선행 다운로드 파일 사용 실패, S3에서 직접 읽습니다: {os.path.basename(csv_path)}, 오류: {e}")
+        
+        return pd.read_csv(csv_path, encoding='utf-8'), None
+    
+    def load_raw_csv(self, csv_path: str, download: Optional[Future] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        원본 CSV를 읽습니다 (캐시 우선, 없으면 S3에서 읽고 캐시에 저장)
+        columns를 주면 해당 컬럼만 반환합니다. (캐시에서는 해당 컬럼만 읽음)
+        """
+        filename = os.path.basename(csv_path)
+        file_start_time = time.time()
+        
+        # 1. 캐시에서 먼저 확인
+        df = self.csv_cache.load_from_cache(csv_path, columns=columns)
+        
+        if df is not None:
+            # 캐시에서 로드 성공
+            file_read_time = time.time() - file_start_time
+            logger.info(f"🚀 {filename} 캐시 로드: {len(df):,}행, {file_read_time:.3f}초")
+        else:
+            # 2. 캐시에 없으면 S3에서 읽고 캐시에 저장
+            logger.info(f"📥 {filename} S3에서 읽는 중...")
+            read_start_time = time.time()
+            df, local_path = self._read_source_csv(csv_path, download)
+            read_time = time.time() - read_start_time
+            
+            # 캐시에 저장
+            cache_saved = self.csv_cache.save_to_cache(csv_path, df)
+            
+            # 캐시에 저장된 스테이징 파일은 더 이상 필요 없음
+            if cache_saved and local_path is not None:
+                self.prefetcher.release(local_path)
+            
+            cache_status = "✅ 캐시됨" if cache_saved else "❌ 캐시 실패"
+            logger.info(f"📁 {filename} S3 읽기: {len(df):,}행, {read_time:.2f}초 ({cache_status})")
+            
+            if columns is not None:
+                df = df[[c for c in columns if c in df.columns]]
+        
+        return df
+    
+    def load_news_frame(self, csv_path: str, start_date: str, end_date: str, company_name: Optional[str] = None,
+                        download: Optional[Future] = None) -> pd.DataFrame:
+        """
+        CSV 파일 하나에서 기간에 해당하는 분석용 컬럼만 읽습니다.
+        저장소에 없으면 원본을 읽어 인제스트한 뒤 저장소에서 다시 읽습니다.
+        company_name을 주면 기관 역색인으로 해당 기업의 행만 읽습니다.
+        download는 start_prefetch가 돌려준 선행 다운로드입니다.
+        """
+        filename = os.path.basename(csv_path)
+        logger.info(f"CSV 파일 처리 중: {filename}")
+        
+        df = self.news_store.load(csv_path, start_date, end_date, company_name=company_name)
+        if df is not None:
+            return df
+        
+        raw_df = self.load_raw_csv(csv_path, download, columns=ANALYSIS_COLUMNS)
+        if self.news_store.ingest(csv_path, raw_df):
+            df = self.news_store.load(csv_path, start_date, end_date, company_name=company_name)
+            if df is not None:
+                return df
+        
+        # 인제스트 실패 시 캐시에서 기업/기간 조건에 맞는 행만 다시 읽음 (캐시가 없으면 원본 그대로 사용)
+        if company_name is not None:
+            filtered_df = self.csv_cache.load_from_cache(csv_path, columns=ANALYSIS_COLUMNS, start_date=start_date,
+                                                         end_date=end_date, company_name=company_name)
+            if filtered_df is not None:
+                return filtered_df
+        
+        return raw_df
+    
+    def extract_keywords_with_pandas(self, company_name: str, start_date: str, end_date: str, top_keywords: int, csv_files: List[str],
+                                     file_sizes: Optional[Dict[str, int]] = None,
+                                     progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
         pandas를 사용한 키워드 추출 (백업 방법)
         여러 CSV 파일을 읽어서 통합 처리
+        progress를 주면 날짜별 개수(daily_counts)와 키워드 빈도(raw_keywords)를 계산하는 즉시 알립니다.
         """
         logger.info("🐼 Pandas 엔진으로 키워드 추출을 시작합니다.")
         
         all_dataframes = []
         total_loaded_rows = 0
         
-        # 모든 CSV 파일 읽기 (캐시 우선 사용)
+        # 저장소/캐시에 없는 파일은 미리 병렬 다운로드 (앞 파일 디코딩 중에 뒤 파일 수신)
+        downloads = self.start_prefetch(csv_files, file_sizes)
+        
+        # 모든 CSV 파일 읽기 (뉴스 저장소 → 캐시 → S3 순서)
         for csv_path in csv_files:
             try:
-                filename = os.path.basename(csv_path)
-                logger.info(f"CSV 파일 처리 중: {filename}")
-                
-                file_start_time = time.time()
-                
-                # 1. 캐시에서 먼저 확인
-                df = self.csv_cache.load_from_cache(csv_path)
-                
-                if df is not None:
-                    # 캐시에서 로드 성공
-                    file_read_time = time.time() - file_start_time
-                    logger.info(f"🚀 {filename} 캐시 로드: {len(df):,}행, {file_read_time:.3f}초")
-                else:
-                    # 2. 캐시에 없으면 S3에서 읽고 캐시에 저장
-                    logger.info(f"📥 {filename} S3에서 읽는 중...")
-                    read_start_time = time.time()
-                    df = pd.read_csv(csv_path, encoding='utf-8')
-                    read_time = time.time() - read_start_time
-                    
-                    # 캐시에 저장
-                    cache_saved = self.csv_cache.save_to_cache(csv_path, df)
-                    
-                    file_read_time = time.time() - file_start_time
-                    cache_status = "✅ 캐시됨" if cache_saved else "❌ 캐시 실패"
-                    logger.info(f"📁 {filename} S3 읽기: {len(df):,}행, {read_time:.2f}초 ({cache_status})")
+                df = self.load_news_frame(csv_path, start_date, end_date, company_name, downloads.get(csv_path))
                 
                 all_dataframes.append(df)
                 total_loaded_rows += len(df)
@@ -78,21 +180,9 @@ class PandasAnalyzer:
         
         # 기업 필터링 (기관 컬럼에서 해당 기업이 포함된 행들을 가져옴)
         if '기관' in df.columns:
-            # 기관 컬럼에 NaN이 아니고 회사명이 포함된 행 필터링
-            mask = df['기관'].notna() & df['기관'].str.contains(company_name, na=False, regex=False)
-            company_filtered_df = df[mask]
-            company_count = len(company_filtered_df)
-            
-            logger.info(f"'{company_name}' 관련 뉴스: {company_count}개 (기관 필터링 후)")
-            
-            # 날짜 필터링 적용
-            date_filtered_df = self.apply_date_filter(company_filtered_df, start_date, end_date)
-            total_count = len(date_filtered_df)
-            
-            logger.info(f"날짜 필터링 후 뉴스: {total_count}개 ({start_date}-{end_date})")
-            
-            # 최종 필터링된 데이터프레임 사용
-            filtered_df = date_filtered_df
+            # 기업 + 날짜 필터링
+            filtered_df = self.filter_company_news(df, company_name, start_date, end_date)
+            total_count = len(filtered_df)
             
             if total_count == 0:
                 return {
@@ -106,23 +196,16 @@ class PandasAnalyzer:
             
             # 날짜별 뉴스 개수 계산
             daily_news_count = self.calculate_daily_news_count(filtered_df, start_date, end_date)
+            notify_progress(progress, "daily_counts", {"total_news_count": total_count, "daily_news_count": daily_news_count})
             
             # 키워드 추출 (기존 키워드 컬럼 사용)
             if '키워드' in df.columns:
-                # 키워드 컬럼에서 키워드 분리 및 정리
-                all_keywords = []
-                for keywords_str in filtered_df['키워드'].dropna():
-                    keywords = [re.sub(r'[^가-힣a-zA-Z0-9\s]', '', k.strip()) for k in keywords_str.split(',') if k.strip()]
-                    all_keywords.extend([k for k in keywords if len(k) >= 2])
-                
-                # 기업명 자체는 키워드에서 제외
-                all_keywords = [k for k in all_keywords if company_name not in k]
+                # 키워드 분리/정제 (저장소에서 읽은 경우 인제스트 시 정제된 토큰 재사용)
+                tokens = self.tokenize_keywords(filtered_df)
                 
-                # 키워드 빈도 계산
-                keyword_counter = Counter(all_keywords)
-                
-                # 빈도순으로 정렬하여 딕셔너리 생성
-                keywords_dict = dict(keyword_counter.most_common())
+                # 키워드 빈도 계산 (기업명 자체는 키워드에서 제외, 빈도순 정렬)
+                keywords_dict = count_keywords(tokens, company_name)
+                notify_progress(progress, "raw_keywords", {"keywords": keywords_dict})
                 
                 # 상위 키워드가 많이 포함된 뉴스 기사들 추출
                 top_keywords_list = list(keywords_dict.keys())[:top_keywords]
@@ -152,9 +235,303 @@ class PandasAnalyzer:
         else:
             raise ValueError("기관 컬럼을 찾을 수 없습니다.")
     
+    def compute_daily_partials(self, company_name: str, start_date: str, end_date: str, csv_files: List[str],
+                               file_sizes: Optional[Dict[str, int]] = None) -> Optional[Dict[int, DailyPartial]]:
+        """
+        기간 내 날짜별 부분 집계(뉴스 개수, 키워드 빈도와 처음 등장 위치, 기사 요약)를 계산합니다.
+        csv_files는 PandasAnalyzer와 같은 파일 키 순서여야 원본 위치로 동률 순서를 맞출 수 있습니다.
+        저장되는 값이므로 읽지 못한 파일이 있으면 예외를 그대로 올립니다.
+        
+        Returns:
+            Dict[int, DailyPartial]: 기간 내 모든 날짜 → 부분 집계 (뉴스가 없는 날 포함),
+            날짜/키워드 컬럼이 없어 날짜별로 나눌 수 없으면 None
+        """
+        partials = {date_key: DailyPartial(date_key=date_key) for date_key in iter_date_keys(start_date, end_date)}
+        if not csv_files:
+            return partials
+        
+        downloads = self.start_prefetch(csv_files, file_sizes)
+        dataframes = [
+            self._with_source_position(
+                self.load_news_frame(csv_path, start_date, end_date, company_name, downloads.get(csv_path)), csv_path
+            )
+            for csv_path in csv_files
+        ]
+        df = pd.concat(dataframes, ignore_index=True)
+        
+        if '기관' not in df.columns or '키워드' not in df.columns:
+            return None
+        
+        filtered_df = self.filter_company_news(df, company_name, start_date, end_date)
+        if DATE_KEY_COLUMN not in filtered_df.columns:
+            return None
+        
+        articles_df = filtered_df.reset_index(drop=True)
+        if articles_df.empty:
+            return partials
+        
+        tokens = self.tokenize_keywords(articles_df)
+        self._fill_daily_partials(partials, articles_df, self._article_rows(articles_df), tokens,
+                                  np.arange(len(articles_df)), company_name)
+        return partials
+    
+    def compute_daily_partials_batch(self, company_names: List[str], start_date: str, end_date: str, csv_files: List[str],
+                                     file_sizes: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Dict[int, DailyPartial]]]:
+        """
+        여러 기업의 날짜별 부분 집계를 한 번에 계산합니다. (기업별 compute_daily_partials와 같은 결과)
+        기간 데이터 로드, 날짜 필터, 기관 컬럼 순회, 키워드 토큰화를 기업 수와 관계없이 한 번만 수행합니다.
+        저장되는 값이므로 읽지 못한 파일이 있으면 예외를 그대로 올립니다.
+        
+        Returns:
+            Dict[str, Dict[int, DailyPartial]]: 기업명 → (기간 내 모든 날짜 → 부분 집계),
+            날짜/키워드 컬럼이 없어 날짜별로 나눌 수 없으면 None
+        """
+        date_range = iter_date_keys(start_date, end_date)
+        partials = {
+            company_name: {date_key: DailyPartial(date_key=date_key) for date_key in date_range}
+            for company_name in company_names
+        }
+        if not csv_files:
+            return partials
+        
+        downloads = self.start_prefetch(csv_files, file_sizes)
+        dataframes = [
+            self._with_source_position(
+                self.load_news_frame(csv_path, start_date, end_date, download=downloads.get(csv_path)), csv_path
+            )
+            for csv_path in csv_files
+        ]
+        df = pd.concat(dataframes, ignore_index=True)
+        
+        if '기관' not in df.columns or '키워드' not in df.columns:
+            return None
+        
+        date_df = self.apply_date_filter(df, start_date, end_date)
+        if DATE_KEY_COLUMN not in date_df.columns:
+            return None
+        date_df = date_df.reset_index(drop=True)
+        
+        # 기업별 행 분할 후 요청 기업들에 해당하는 행만 한 번 토큰화
+        company_rows = self.partition_by_company(date_df['기관'], company_names)
+        union_rows = np.unique(np.concatenate([np.empty(0, dtype=np.int64)] + list(company_rows.values())))
+        articles_df = date_df.iloc[union_rows].reset_index(drop=True)
+        if articles_df.empty:
+            return partials
+        
+        # 토큰화와 기사 요약은 행마다 한 번만 만들고 기업별로 나눠 담음
+        tokens = self.tokenize_keywords(articles_df)
+        articles = self._article_rows(articles_df)
+        for company_name in company_names:
+            rows = np.searchsorted(union_rows, company_rows[company_name])
+            if len(rows) == 0:
+                continue
+            self._fill_daily_partials(partials[company_name], articles_df, articles, tokens, rows, company_name)
+        
+        return partials
+    
+    @staticmethod
+    def _with_source_position(df: pd.DataFrame, csv_path: str) -> pd.DataFrame:
+        """일별 집계의 동률 순서용 원본 위치(원본 경로, 파일 내 행 번호) 컬럼을 붙입니다."""
+        df = df.assign(**{SOURCE_COLUMN: csv_path})
+        if ROW_ID_COLUMN not in df.columns:
+            # 저장소를 거치지 않은 경우 파일에서 읽은 순서를 행 번호로 사용
+            df[ROW_ID_COLUMN] = np.arange(len(df), dtype=np.int64)
+        return df
+    
+    def _article_rows(self, articles_df: pd.DataFrame) -> List[List]:
+        """행별 기사 요약 (ARTICLE_COLUMNS 순서)"""
+        keyword_lists = to_keyword_lists(
+            self._explode_article_keywords(articles_df, KEYWORD_LIST_COLUMN, explode_keywords), articles_df.index
+        )
+        columns = [articles_df[c] if c in articles_df.columns else [None] * len(articles_df) for c in ('제목', '일자', 'URL')]
+        return [
+            [source, int(row_id), None if pd.isna(title) else str(title), None if pd.isna(date) else str(date),
+             None if pd.isna(url) else str(url), list(keywords)]
+            for source, row_id, title, date, url, keywords in zip(
+                articles_df[SOURCE_COLUMN], articles_df[ROW_ID_COLUMN], *columns, keyword_lists
+            )
+        ]
+    
+    @staticmethod
+    def _fill_daily_partials(partials: Dict[int, DailyPartial], articles_df: pd.DataFrame, articles: List[List],
+                             tokens: pd.Series, rows: np.ndarray, company_name: str):
+        """
+        articles_df의 rows 위치(오름차순) 행을 날짜별 부분 집계에 담습니다.
+        키워드 빈도는 기업명 포함 키워드를 제외하고, 키워드마다 처음 등장한 원본 위치
+        (원본 경로, 파일 내 행 번호, 행 내 키워드 순서)를 함께 기록합니다.
+        """
+        date_keys = articles_df[DATE_KEY_COLUMN].to_numpy(dtype=np.int64)
+        sources = articles_df[SOURCE_COLUMN].to_numpy()
+        row_ids = articles_df[ROW_ID_COLUMN].to_numpy(dtype=np.int64)
+        
+        row_tokens = tokens[np.isin(tokens.index.to_numpy(), rows)]
+        token_rows = row_tokens.index.to_numpy()
+        token_orders = row_tokens.groupby(level=0, sort=False).cumcount().to_numpy()
+        
+        for date_key, day_tokens in row_tokens.groupby(date_keys[token_rows], sort=False):
+            partial = partials[int(date_key)]
+            partial.keyword_counts = count_keywords_in_order(day_tokens, company_name)
+            
+            day_mask = date_keys[token_rows] == date_key
+            first = ~day_tokens.duplicated().to_numpy()
+            first_positions = {
+                token: (sources[row], int(row_ids[row]), int(order))
+                for token, row, order in zip(day_tokens.to_numpy()[first], token_rows[day_mask][first],
+                                             token_orders[day_mask][first])
+            }
+            partial.keyword_positions = {keyword: first_positions[keyword] for keyword in partial.keyword_counts}
+        
+        for row in rows:
+            partial = partials[int(date_keys[row])]
+            partial.news_count += 1
+            partial.articles.append(articles[row])
+    
+    def partition_by_company(self, orgs: pd.Series, company_names: List[str]) -> Dict[str, np.ndarray]:
+        """
+        기관 컬럼을 한 번만 훑어 기업별 행 위치를 구합니다.
+        고유 기관 값마다 모든 기업명을 Aho-Corasick으로 한 번에 찾습니다. (기업별 str.contains와 같은 결과)
+        
+        Returns:
+            Dict[str, np.ndarray]: 기업명 → 오름차순 행 위치
+        """
+        codes, uniques = pd.factorize(orgs, sort=False)
+        matcher = KeywordMatcher(company_names)
+        
+        codes_by_company: List[List[int]] = [[] for _ in company_names]
+        for code, org in enumerate(uniques):
+            if not isinstance(org, str):
+                continue
+            for company_idx in matcher.find_in_text(org):
+                codes_by_company[company_idx].append(code)
+        
+        return {
+            company_name: np.flatnonzero(np.isin(codes, codes_by_company[i]))
+            for i, company_name in enumerate(company_names)
+        }
+    
+    def extract_keywords_batch(self, company_names: List[str], start_date: str, end_date: str, top_keywords: int,
+                               csv_files: List[str], file_sizes: Optional[Dict[str, int]] = None) -> Dict[str, Dict]:
+        """
+        여러 기업의 키워드를 한 번에 추출합니다.
+        기간 데이터를 한 번만 읽고 기관 컬럼 한 번의 순회로 기업별 행을 나눈 뒤,
+        키워드 토큰화도 요청 기업들에 해당하는 행에 대해 한 번만 수행합니다.
+        
+        Returns:
+            Dict[str, Dict]: 기업명 → extract_keywords_with_pandas와 같은 형식의 결과
+        """
+        logger.info(f"🐼 Pandas 엔진으로 {len(company_names)}개 기업의 키워드를 한 번에 추출합니다.")
+        
+        all_dataframes = []
+        downloads = self.start_prefetch(csv_files, file_sizes)
+        for csv_path in csv_files:
+            try:
+                all_dataframes.append(self.load_news_frame(csv_path, start_date, end_date, download=downloads.get(csv_path)))
+            except Exception as e:
+                logger.warning(f"CSV 파일 처리 실패: {csv_path}, 오류: {e}")
+                continue
+        
+        if not all_dataframes:
+            raise FileNotFoundError("읽을 수 있는 CSV 파일이 없습니다.")
+        
+        df = pd.concat(all_dataframes, ignore_index=True)
+        logger.info(f"총 {len(csv_files)}개 파일에서 {len(df)}개 행 로드 완료")
+        
+        if '기관' not in df.columns:
+            raise ValueError("기관 컬럼을 찾을 수 없습니다.")
+        
+        # 날짜 필터링 한 번 + 기관 컬럼 한 번의 순회로 기업별 행 분할
+        date_df = self.apply_date_filter(df, start_date, end_date).reset_index(drop=True)
+        company_rows = self.partition_by_company(date_df['기관'], company_names)
+        
+        # 요청 기업들에 해당하는 행만 한 번 토큰화 (기업 간 겹치는 기사도 한 번만 처리)
+        union_rows = np.unique(np.concatenate([np.empty(0, dtype=np.int64)] + list(company_rows.values())))
+        tokens = None
+        if '키워드' in date_df.columns:
+            tokens = self.tokenize_keywords(date_df.iloc[union_rows])
+        token_positions = tokens.index.to_numpy() if tokens is not None else None
+        
+        results = {}
+        for company_name in company_names:
+            rows = company_rows[company_name]
+            filtered_df = date_df.iloc[rows]
+            total_count = len(filtered_df)
+            logger.info(f"'{company_name}' 관련 뉴스: {total_count}개 ({start_date}-{end_date})")
+            
+            if total_count == 0:
+                results[company_name] = {
+                    "company_name": company_name,
+                    "period": f"{start_date}-{end_date}",
+                    "total_news_count": 0,
+                    "daily_news_count": {},
+                    "keywords": {},
+                    "message": f"'{company_name}'와 관련된 뉴스를 찾을 수 없습니다."
+                }
+                continue
+            
+            daily_news_count = self.calculate_daily_news_count(filtered_df, start_date, end_date)
+            
+            if tokens is None:
+                results[company_name] = {
+                    "company_name": company_name,
+                    "period": f"{start_date}-{end_date}",
+                    "total_news_count": total_count,
+                    "daily_news_count": daily_news_count,
+                    "keywords": {},
+                    "message": "키워드 컬럼을 찾을 수 없습니다."
+                }
+                continue
+            
+            # 기업 행에 해당하는 토큰만 골라 빈도 계산 (행 순서 유지)
+            company_tokens = tokens[np.isin(token_positions, np.searchsorted(union_rows, rows))]
+            keywords_dict = count_keywords(company_tokens, company_name)
+            
+            top_keywords_list = list(keywords_dict.keys())[:top_keywords]
+            top_news_articles = self.extract_top_news_articles(filtered_df, top_keywords_list)
+            
+            results[company_name] = {
+                "company_name": company_name,
+                "period": f"{start_date}-{end_date}",
+                "total_news_count": total_count,
+                "daily_news_count": daily_news_count,
+                "keywords": keywords_dict,
+                "top_news_articles": top_news_articles,
+                "message": f"🐼 Pandas 엔진으로 성공적으로 키워드를 추출했습니다. 총 {len(keywords_dict)}개 키워드 발견 "
+                           f"(파일 {len(csv_files)}개, 기업 {len(company_names)}개 일괄 처리)"
+            }
+        
+        self.csv_cache.print_cache_stats()
+        return results
+    
+    def filter_company_news(self, df, company_name: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        기관 컬럼에 기업명이 포함되고 기간 내에 있는 뉴스만 남깁니다.
+        저장소에서 읽은 행은 이미 역색인으로 좁혀져 있어 이 스캔은 소수 행에만 적용됩니다.
+        """
+        # 기관 컬럼에 NaN이 아니고 회사명이 포함된 행 필터링
+        mask = df['기관'].notna() & df['기관'].str.contains(company_name, na=False, regex=False)
+        company_filtered_df = df[mask]
+        
+        logger.info(f"'{company_name}' 관련 뉴스: {len(company_filtered_df)}개 (기관 필터링 후)")
+        
+        # 날짜 필터링 적용
+        date_filtered_df = self.apply_date_filter(company_filtered_df, start_date, end_date)
+        
+        logger.info(f"날짜 필터링 후 뉴스: {len(date_filtered_df)}개 ({start_date}-{end_date})")
+        
+        return date_filtered_df
+    
+    def tokenize_keywords(self, filtered_df) -> pd.Series:
+        """집계용 키워드 토큰 (저장소에서 읽은 경우 인제스트 시 정제된 토큰 재사용)"""
+        return self._explode_article_keywords(
+            filtered_df.reset_index(drop=True), KEYWORD_TOKENS_COLUMN,
+            lambda values: clean_tokens(explode_keywords(values))
+        )
+    
     def apply_date_filter(self, df, start_date: str, end_date: str) -> pd.DataFrame:
         """
         날짜 컬럼을 사용하여 설정된 기간 내의 데이터만 필터링합니다.
+        날짜는 정수형 YYYYMMDD(date_key)로 일괄 변환한 뒤 숫자 범위로 비교하며,
+        결과에 date_key 컬럼을 남겨 날짜별 집계에서 재사용할 수 있게 합니다.
         
         Args:
             df: 필터링할 데이터프레임
@@ -162,17 +539,11 @@ class PandasAnalyzer:
             end_date: 종료 날짜 (YYYYMMDD)
             
         Returns:
-            pd.DataFrame: 날짜 필터링된 데이터프레임
+            pd.DataFrame: 날짜 필터링된 데이터프레임 (date_key 컬럼 포함)
         """
         try:
-            from datetime import datetime
-            
             # 날짜 관련 컬럼 찾기
-            date_column = None
-            for col in ['일자', '날짜', 'date', 'Date', 'DATE']:
-                if col in df.columns:
-                    date_column = col
-                    break
+            date_column = find_date_column(df.columns)
             
             if date_column is None:
                 logger.warning("날짜 관련 컬럼을 찾을 수 없습니다. 날짜 필터링을 건너뜁니다.")
@@ -180,61 +551,32 @@ class PandasAnalyzer:
             
             logger.info(f"날짜 필터링에 사용할 컬럼: {date_column}")
             
-            # 날짜 범위를 datetime 객체로 변환
-            start_dt = datetime.strptime(start_date, "%Y%m%d")
-            end_dt = datetime.strptime(end_date, "%Y%m%d")
-            
-            # 날짜 컬럼의 값들을 파싱하여 필터링
-            def parse_date(date_str):
-                """다양한 날짜 형식을 파싱합니다."""
-                if pd.isna(date_str):
-                    return None
-                
-                date_str = str(date_str).strip()
-                
-                # 다양한 날짜 형식 시도
-                date_formats = [
-                    "%Y%m%d",      # 20210811
-                    "%Y-%m-%d",   # 2021-08-11
-                    "%Y/%m/%d",   # 2021/08/11
-                    "%Y.%m.%d",   # 2021.08.11
-                    "%Y-%m-%d %H:%M:%S",  # 2021-08-11 10:30:00
-                    "%Y/%m/%d %H:%M:%S",  # 2021/08/11 10:30:00
-                ]
-                
-                for fmt in date_formats:
-                    try:
-                        return datetime.strptime(date_str, fmt)
-                    except ValueError:
-                        continue
-                
-                # 파싱 실패 시 None 반환
-                return None
-            
-            # 날짜 파싱 및 필터링
-            df_copy = df.copy()
-            df_copy['parsed_date'] = df_copy[date_column].apply(parse_date)
+            # 저장소에서 읽은 데이터는 이미 정규화된 date_key가 있음
+            if DATE_KEY_COLUMN in df.columns:
+                date_keys = df[DATE_KEY_COLUMN]
+            else:
+                date_keys = to_date_key(df[date_column])
             
             # 유효한 날짜만 필터링
-            valid_dates_mask = df_copy['parsed_date'].notna()
-            df_with_dates = df_copy[valid_dates_mask]
+            valid_dates_mask = date_keys.notna()
+            valid_count = int(valid_dates_mask.sum())
             
-            logger.info(f"유효한 날짜가 있는 뉴스: {len(df_with_dates)}개")
+            logger.info(f"유효한 날짜가 있는 뉴스: {valid_count}개")
             
-            if len(df_with_dates) == 0:
+            if valid_count == 0:
                 logger.warning("유효한 날짜가 있는 뉴스가 없습니다.")
                 return df.iloc[0:0]  # 빈 데이터프레임 반환
             
-            # 날짜 범위 필터링
+            # 날짜 범위 필터링 (정수 비교)
             date_range_mask = (
-                (df_with_dates['parsed_date'] >= start_dt) & 
-                (df_with_dates['parsed_date'] <= end_dt)
+                valid_dates_mask &
+                (date_keys >= int(start_date)).fillna(False) &
+                (date_keys <= int(end_date)).fillna(False)
             )
             
-            filtered_df = df_with_dates[date_range_mask]
-            
-            # 원본 컬럼만 유지 (parsed_date 컬럼 제거)
-            result_df = filtered_df.drop('parsed_date', axis=1)
+            result_df = df[date_range_mask]
+            if DATE_KEY_COLUMN not in result_df.columns:
+                result_df = result_df.assign(**{DATE_KEY_COLUMN: date_keys[date_range_mask]})
             
             logger.info(f"날짜 범위 필터링 완료: {len(result_df)}개 뉴스")
             
@@ -253,6 +595,7 @@ class PandasAnalyzer:
     def calculate_daily_news_count(self, filtered_df, start_date: str, end_date: str) -> Dict[str, int]:
         """
         날짜별 뉴스 개수를 계산합니다.
+        정규화된 date_key에 대한 한 번의 value_counts로 집계하고, 뉴스가 없는 날은 0으로 채웁니다.
         
         Args:
             filtered_df: 필터링된 데이터프레임
@@ -263,17 +606,11 @@ class PandasAnalyzer:
             Dict[str, int]: 날짜별 뉴스 개수 {"20210811": 15, "20210812": 23, ...}
         """
         try:
-            from datetime import datetime, timedelta
-            
             # 사용 가능한 컬럼 확인
             logger.info(f"사용 가능한 컬럼: {list(filtered_df.columns)}")
             
             # 날짜 관련 컬럼 찾기
-            date_column = None
-            for col in ['일자', '날짜', 'date', 'Date', 'DATE']:
-                if col in filtered_df.columns:
-                    date_column = col
-                    break
+            date_column = find_date_column(filtered_df.columns)
             
             if date_column is None:
                 logger.warning("날짜 관련 컬럼을 찾을 수 없습니다. 빈 딕셔너리를 반환합니다.")
@@ -281,49 +618,15 @@ class PandasAnalyzer:
             
             logger.info(f"날짜 컬럼 사용: {date_column}")
             
-            # 날짜 범위 생성
-            start_dt = datetime.strptime(start_date, "%Y%m%d")
-            end_dt = datetime.strptime(end_date, "%Y%m%d")
+            # apply_date_filter 또는 저장소에서 만든 date_key 재사용
+            if DATE_KEY_COLUMN in filtered_df.columns:
+                date_keys = filtered_df[DATE_KEY_COLUMN]
+            else:
+                date_keys = to_date_key(filtered_df[date_column])
             
-            daily_count = {}
-            current_date = start_dt
-            
-            # 각 날짜별로 뉴스 개수 계산
-            while current_date <= end_dt:
-                date_str = current_date.strftime("%Y%m%d")
-                
-                # 해당 날짜의 뉴스 개수 계산
-                try:
-                    # 다양한 날짜 형식 지원
-                    date_patterns = [
-                        date_str,  # 20210811
-                        f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}",  # 2021-08-11
-                        f"{date_str[:4]}/{date_str[4:6]}/{date_str[6:8]}",  # 2021/08/11
-                        f"{date_str[:4]}.{date_str[4:6]}.{date_str[6:8]}",  # 2021.08.11
-                    ]
-                    
-                    # 각 패턴에 대해 매칭 시도
-                    count = 0
-                    for pattern in date_patterns:
-                        date_mask = filtered_df[date_column].astype(str).str.contains(pattern, na=False)
-                        pattern_count = date_mask.sum()
-                        if pattern_count > 0:
-                            count = pattern_count
-                            logger.debug(f"{date_str} ({pattern}): {count}개 뉴스 발견")
-                            break
-                    
-                    # 디버깅을 위한 로그
-                    if count == 0:
-                        # 샘플 날짜 값 확인
-                        sample_dates = filtered_df[date_column].dropna().head(3).tolist()
-                        logger.debug(f"{date_str} 매칭 실패. 샘플 날짜 값: {sample_dates}")
-                    
-                except Exception as e:
-                    logger.warning(f"날짜 {date_str} 계산 중 오류: {e}")
-                    count = 0
-                
-                daily_count[date_str] = int(count)
-                current_date += timedelta(days=1)
+            # 날짜별 개수를 한 번에 집계하고 기간 내 모든 날짜를 0으로 채움
+            counts = date_keys.dropna().astype('int64').value_counts()
+            daily_count = fill_daily_counts(counts, start_date, end_date)
             
             # 총합 검증
             total_daily_count = sum(daily_count.values())
@@ -336,6 +639,21 @@ class PandasAnalyzer:
             logger.warning(f"날짜별 뉴스 개수 계산 중 오류: {e}")
             return {}
     
+    def _explode_article_keywords(self, df, list_column, tokenize):
+        """
+        기사 키워드를 행 인덱스를 유지한 채 토큰 단위로 펼칩니다.
+        저장소에서 읽은 행은 인제스트 시 분리해 둔 리스트 컬럼을 재사용하고,
+        나머지 행만 키워드 컬럼을 직접 분리합니다.
+        """
+        if list_column not in df.columns:
+            return tokenize(df['키워드'])
+        
+        precomputed = df[list_column].notna()
+        return pd.concat([
+            explode_keyword_lists(df.loc[precomputed, list_column]),
+            tokenize(df.loc[~precomputed, '키워드'])
+        ]).sort_index(kind='stable')
+    
     def extract_top_news_articles(self, filtered_df, top_keywords_list, max_articles=10):
         """
         상위 키워드가 많이 포함된 뉴스 기사들을 추출합니다.
@@ -352,53 +670,49 @@ class PandasAnalyzer:
             if not top_keywords_list:
                 return []
             
-            # 각 기사에서 상위 키워드 매칭 개수 계산
-            articles_with_score = []
+            if '키워드' not in filtered_df.columns:
+                return []
+            
+            # 기사 키워드를 한 번만 분리 (행 번호는 위치 기준)
+            articles_df = filtered_df.reset_index(drop=True)
+            tokens = self._explode_article_keywords(articles_df, KEYWORD_LIST_COLUMN, explode_keywords)
             
-            for idx, row in filtered_df.iterrows():
-                article_keywords = []
-                if pd.notna(row.get('키워드', '')):
-                    # 기사 키워드 분리
-                    article_keywords = [k.strip() for k in str(row['키워드']).split(',') if k.strip()]
+            # 상위 키워드와 매칭되는 개수 계산 (고유 토큰 단위 매칭, 행당 키워드 중복 카운트 방지)
+            matcher = KeywordMatcher(top_keywords_list)
+            counts, pair_rows, pair_keywords = matcher.score_rows(tokens, len(articles_df))
+            
+            # 매칭된 키워드 개수 순으로 상위 기사 선택
+            top_rows = select_top_rows(counts, max_articles)
+            
+            token_rows = tokens.index.to_numpy()
+            top_articles = []
+            for row_idx in top_rows:
+                row = articles_df.iloc[row_idx]
+                
+                # nan 값 처리
+                title = row.get('제목', '제목 없음')
+                if pd.isna(title):
+                    title = '제목 없음'
+                
+                date = row.get('일자', '일자 없음')
+                if pd.isna(date):
+                    date = '일자 없음'
+                
+                url = row.get('URL', 'URL 없음')
+                if pd.isna(url):
+                    url = 'URL 없음'
                 
-                # 상위 키워드와 매칭되는 개수 계산
-                matched_count = 0
-                matched_keywords = []
-                for keyword in top_keywords_list:
-                    for article_keyword in article_keywords:
-                        if keyword in article_keyword or article_keyword in keyword:
-                            matched_count += 1
-                            matched_keywords.append(keyword)
-                            break  # 중복 카운트 방지
+                pair_start, pair_end = np.searchsorted(pair_rows, [row_idx, row_idx + 1])
+                token_start, token_end = np.searchsorted(token_rows, [row_idx, row_idx + 1])
                 
-                if matched_count > 0:
-                    # nan 값 처리
-                    title = row.get('제목', '제목 없음')
-                    if pd.isna(title):
-                        title = '제목 없음'
-                    
-                    date = row.get('일자', '일자 없음')
-                    if pd.isna(date):
-                        date = '일자 없음'
-                    
-                    url = row.get('URL', 'URL 없음')
-                    if pd.isna(url):
-                        url = 'URL 없음'
-                    
-                    articles_with_score.append({
-                        'title': str(title),
-                        'date': str(date),
-                        'url': str(url),
-                        'matched_keywords_count': matched_count,
-                        'matched_keywords': list(set(matched_keywords)),
-                        'all_keywords': article_keywords
-                    })
-            
-            # 매칭된 키워드 개수 순으로 정렬
-            articles_with_score.sort(key=lambda x: x['matched_keywords_count'], reverse=True)
-            
-            # 상위 기사들만 반환
-            top_articles = articles_with_score[:max_articles]
+                top_articles.append({
+                    'title': str(title),
+                    'date': str(date),
+                    'url': str(url),
+                    'matched_keywords_count': int(counts[row_idx]),
+                    'matched_keywords': list({top_keywords_list[k] for k in pair_keywords[pair_start:pair_end]}),
+                    'all_keywords': tokens.iloc[token_start:token_end].tolist()
+                })
             
             logger.info(f"상위 키워드가 포함된 뉴스 기사 {len(top_articles)}개 추출 완료")
             
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+프로세스 내 API 응답 캐시
+SQLite 결과 캐시 앞단에서 완성된 응답을 JSON bytes로 직렬화해 보관합니다.
+히트 시 SQLite 조회, JSON 파싱, Pydantic 모델 생성 없이 그대로 반환합니다.
+
+SQLite를 다시 확인하지 않으므로, 야간 사전 계산(keyword_materializer.py)이 다른 프로세스에서
+결과를 덮어써도(replace=True) 이미 보관된 응답은 TTL(RESPONSE_CACHE_TTL, 기본 10분)이 지날 때까지
+이전 결과로 응답합니다. 사전 계산 직후 바로 반영해야 하면 TTL을 줄이거나 API를 재시작하세요.
+(같은 프로세스의 /cache/clear는 응답 캐시도 함께 비움)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """요청 키 → 직렬화된 응답 bytes LRU + TTL 캐시"""
+    
+    def __init__(self, max_bytes: Optional[int] = None,
+                 max_entries: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        """
+        초기화
+        
+        Args:
+            max_bytes: 메모리 한도 (기본값: RESPONSE_CACHE_MB 또는 64MB, 0이면 사용 안 함)
+            max_entries: 최대 항목 수 (기본값: RESPONSE_CACHE_MAX_ENTRIES 또는 1024)
+            ttl_seconds: 항목 유효 시간 (기본값: RESPONSE_CACHE_TTL 또는 600초)
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('RESPONSE_CACHE_MB', '64')) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('RESPONSE_CACHE_TTL', '600'))
+        
+        # 요청 키 → (만료 시각, 응답 bytes), 앞쪽이 가장 오래 사용하지 않은 항목
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+    
+    def is_enabled(self) -> bool:
+        """응답 캐시 사용 여부"""
+        return self.max_bytes > 0 and self.max_entries > 0
+    
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """응답 조회 (만료된 항목은 제거하고 None)"""
+        if not self.is_enabled():
+            return None
+        
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            
+            if cached[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+    
+    def put(self, key: Hashable, body: bytes) -> bool:
+        """
+        응답 저장 (한도를 넘으면 오래 사용하지 않은 항목부터 제거)
+        
+        Returns:
+            bool: 저장 여부 (한도보다 큰 응답은 저장하지 않음)
+        """
+        if not self.is_enabled():
+            return False
+        
+        size = len(body)
+        if size > self.max_bytes:
+            logger.debug(f"응답 캐시 한도보다 큰 응답은 보관하지 않습니다: {key} ({size / (1024*1024):.1f}MB)")
+            return False
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            while self._entries and (self._total_bytes + size > self.max_bytes
+                                     or len(self._entries) >= self.max_entries):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+            self._total_bytes += size
+        
+        return True
+    
+    def _remove(self, key: Hashable):
+        """항목 제거 (락을 잡은 상태에서 호출)"""
+        _, body = self._entries.pop(key)
+        self._total_bytes -= len(body)
+    
+    def clear(self) -> int:
+        """전체 항목 제거"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+            return count
+    
+    def get_stats(self) -> Dict:
+        """응답 캐시 통계"""
+        with self._lock:
+            total_requests = self.hits + self.misses
+            hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
+            return {
+                "entries": len(self._entries),
+                "memory_mb": f"{self._total_bytes / (1024*1024):.2f}MB",
+                "max_memory_mb": f"{self.max_bytes / (1024*1024):.0f}MB",
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": f"{hit_rate:.1f}%",
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+            }
+
+
+# 전역 응답 캐시 인스턴스 (프로세스당 하나)
+response_cache = None
+
+def get_response_cache() -> ResponseCache:
+    """응답 캐시 인스턴스 반환"""
+    global response_cache
+    if response_cache is None:
+        response_cache = ResponseCache()
+    return response_cache
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+S3 뉴스 CSV 카탈로그
+NewsResult_YYYYMMDD-YYYYMMDD.csv 객체 목록(기간, 크기, ETag)을 메모리에 보관하고
+기간 겹침 조회를 이진 탐색으로 처리합니다.
+목록은 TTL이 지나면 StartAfter로 마지막 키 뒤에 추가된 키만 이어서 가져오고,
+삭제/덮어쓰기/앞쪽 키 추가를 반영하기 위해 주기적으로 전체 목록을 다시 가져옵니다.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 뉴스 CSV 파일명 형식
+NEWS_FILE_PREFIX = "NewsResult_"
+NEWS_FILE_SUFFIX = ".csv"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """카탈로그의 S3 객체 하나"""
+    key: str
+    path: str            # s3a://bucket/key
+    start: int           # 파일 시작일 (YYYYMMDD 정수)
+    end: int             # 파일 종료일 (YYYYMMDD 정수)
+    size: int
+    etag: str
+    last_modified: float
+
+
+def parse_news_filename(filename: str) -> Optional[Tuple[int, int]]:
+    """
+    NewsResult_YYYYMMDD-YYYYMMDD.csv 파일명에서 기간을 추출합니다.
+    
+    Returns:
+        Optional[Tuple[int, int]]: (시작일, 종료일) YYYYMMDD 정수, 형식이 다르면 None
+    """
+    if not filename.startswith(NEWS_FILE_PREFIX) or not filename.endswith(NEWS_FILE_SUFFIX):
+        return None
+    
+    date_part = filename.replace(NEWS_FILE_PREFIX, "").replace(NEWS_FILE_SUFFIX, "")
+    if "-" not in date_part:
+        return None
+    
+    try:
+        file_start_str, file_end_str = date_part.split("-")
+        datetime.strptime(file_start_str, "%Y%m%d")
+        datetime.strptime(file_end_str, "%Y%m%d")
+    except ValueError:
+        return None
+    
+    return int(file_start_str), int(file_end_str)
+
+
+class S3Catalog:
+    """S3 뉴스 CSV 목록 캐시 + 기간 인덱스"""
+    
+    def __init__(self, s3_client, s3_bucket: str, s3_prefix: str,
+                 ttl_seconds: Optional[float] = None,
+                 full_refresh_seconds: Optional[float] = None):
+        """
+        초기화
+        
+        Args:
+            s3_client: boto3 S3 클라이언트
+            s3_bucket: S3 버킷 이름
+            s3_prefix: 뉴스 CSV가 있는 키 접두사
+            ttl_seconds: 목록을 다시 확인하기 전까지 재사용하는 시간 (기본값: S3_CATALOG_TTL 또는 300초)
+            full_refresh_seconds: 전체 목록을 다시 가져오는 주기 (기본값: S3_CATALOG_FULL_REFRESH 또는 3600초)
+        """
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.s3_prefix = s3_prefix
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('S3_CATALOG_TTL', '300'))
+        self.full_refresh_seconds = full_refresh_seconds if full_refresh_seconds is not None else float(os.getenv('S3_CATALOG_FULL_REFRESH', '3600'))
+        
+        # 키 → 항목 (뉴스 CSV 형식이 아닌 키는 보관하지 않음)
+        self._entries: Dict[str, CatalogEntry] = {}
+        # StartAfter 기준 키 (뉴스 CSV 중 가장 뒤의 키, 새 날짜 파일은 이 뒤에 추가됨)
+        self._last_key: Optional[str] = None
+        
+        # 기간 인덱스: 시작일 순 정렬 항목, 시작일 배열, 종료일 누적 최대값 배열
+        self._sorted_entries: List[CatalogEntry] = []
+        self._starts: List[int] = []
+        self._max_ends: List[int] = []
+        
+        self._checked_at: Optional[float] = None
+        self._full_listed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        
+        # 통계
+        self.full_listings = 0
+        self.incremental_listings = 0
+        self.listed_objects = 0
+    
+    def _list_objects(self, start_after: Optional[str] = None):
+        """list_objects_v2 페이지를 순회하며 객체를 돌려줍니다."""
+        params = {"Bucket": self.s3_bucket, "Prefix": self.s3_prefix}
+        if start_after:
+            params["StartAfter"] = start_after
+        
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(**params):
+            for obj in page.get('Contents', []):
+                yield obj
+    
+    def _make_entry(self, obj: Dict) -> Optional[CatalogEntry]:
+        """list_objects_v2 객체를 카탈로그 항목으로 변환 (뉴스 CSV가 아니면 None)"""
+        key = obj['Key']
+        date_range = parse_news_filename(os.path.basename(key))
+        if date_range is None:
+            return None
+        
+        last_modified = obj.get('LastModified')
+        return CatalogEntry(
+            key=key,
+            path=f"s3a://{self.s3_bucket}/{key}",
+            start=date_range[0],
+            end=date_range[1],
+            size=int(obj.get('Size', 0)),
+            etag=str(obj.get('ETag', '')).strip('"'),
+            last_modified=last_modified.timestamp() if hasattr(last_modified, 'timestamp') else 0.0,
+        )
+    
+    def _rebuild_index(self):
+        """시작일 순 정렬 + 종료일 누적 최대값 배열 재구성"""
+        sorted_entries = sorted(self._entries.values(), key=lambda e: (e.start, e.key))
+        max_ends = []
+        current_max = 0
+        for entry in sorted_entries:
+            current_max = max(current_max, entry.end)
+            max_ends.append(current_max)
+        
+        self._sorted_entries = sorted_entries
+        self._starts = [entry.start for entry in sorted_entries]
+        self._max_ends = max_ends
+    
+    def _refresh_locked(self, force_full: bool = False):
+        """필요하면 목록을 갱신합니다. (락을 잡은 상태에서 호출)"""
+        now = time.time()
+        
+        full = (
+            force_full
+            or self._full_listed_at is None
+            or now - self._full_listed_at >= self.full_refresh_seconds
+        )
+        if not full and self._checked_at is not None and now - self._checked_at < self.ttl_seconds:
+            return
+        
+        start_time = time.time()
+        entries = {} if full else dict(self._entries)
+        last_key = None if full else self._last_key
+        listed = 0
+        
+        for obj in self._list_objects(start_after=last_key):
+            listed += 1
+            entry = self._make_entry(obj)
+            if entry is not None:
+                entries[entry.key] = entry
+                if last_key is None or entry.key > last_key:
+                    last_key = entry.key
+        
+        added = len(entries) - (0 if full else len(self._entries))
+        self._entries = entries
+        self._last_key = last_key
+        self._rebuild_index()
+        
+        self._checked_at = now
+        self.listed_objects += listed
+        if full:
+            self._full_listed_at = now
+            self.full_listings += 1
+            logger.info(f"🗂️ S3 카탈로그 전체 갱신: 뉴스 CSV {len(entries)}개 (객체 {listed}개, {time.time() - start_time:.2f}초)")
+        else:
+            self.incremental_listings += 1
+            if added:
+                logger.info(f"🗂️ S3 카탈로그 증분 갱신: {added}개 추가 (총 {len(entries)}개, {time.time() - start_time:.2f}초)")
+    
+    def refresh(self, force_full: bool = False):
+        """목록 갱신 (TTL 이내면 생략, force_full이면 전체 목록을 다시 가져옴)"""
+        with self._lock:
+            self._refresh_locked(force_full)
+    
+    def invalidate(self):
+        """다음 조회 시 전체 목록을 다시 가져오도록 표시"""
+        with self._lock:
+            self._full_listed_at = None
+    
+    def find_files(self, start_date: str, end_date: str) -> List[CatalogEntry]:
+        """
+        기간이 겹치는 뉴스 CSV를 찾습니다.
+        시작일 ≤ end_date인 범위와 종료일 누적 최대값 ≥ start_date인 범위를 이진 탐색으로 구해
+        그 사이만 확인합니다.
+        
+        Args:
+            start_date: 조회 시작일 (YYYYMMDD)
+            end_date: 조회 종료일 (YYYYMMDD)
+        
+        Returns:
+            List[CatalogEntry]: 겹치는 파일 (S3 키 순서)
+        """
+        start_key = int(datetime.strptime(start_date, "%Y%m%d").strftime("%Y%m%d"))
+        end_key = int(datetime.strptime(end_date, "%Y%m%d").strftime("%Y%m%d"))
+        
+        with self._lock:
+            self._refresh_locked()
+            sorted_entries = self._sorted_entries
+            starts = self._starts
+            max_ends = self._max_ends
+        
+        upper = bisect.bisect_right(starts, end_key)
+        lower = bisect.bisect_left(max_ends, start_key, 0, upper)
+        
+        matched = [entry for entry in sorted_entries[lower:upper] if entry.end >= start_key]
+        
+        # S3 목록 순서(키 순서)를 유지해 파일 처리 순서가 이전과 같도록 함
+        matched.sort(key=lambda e: e.key)
+        return matched
+    
+    def get_entry(self, path: str) -> Optional[CatalogEntry]:
+        """s3a:// 경로 또는 키로 항목 조회 (목록 갱신 없이)"""
+        key = path.replace(f"s3a://{self.s3_bucket}/", "")
+        with self._lock:
+            return self._entries.get(key)
+    
+    def get_sizes(self, paths: List[str]) -> Dict[str, int]:
+        """카탈로그에 있는 파일들의 크기 (없는 파일은 결과에서 제외)"""
+        sizes = {}
+        for path in paths:
+            entry = self.get_entry(path)
+            if entry is not None:
+                sizes[path] = entry.size
+        return sizes
+    
+    def get_stats(self) -> Dict:
+        """카탈로그 상태 정보"""
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "total_size_gb": round(sum(e.size for e in self._entries.values()) / (1024**3), 3),
+                "checked_at": self._checked_at,
+                "full_listed_at": self._full_listed_at,
+                "full_listings": self.full_listings,
+                "incremental_listings": self.incremental_listings,
+                "listed_objects": self.listed_objects,
+            }
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+S3 CSV 선행 다운로드(prefetch) 모듈
+캐시/저장소에 없는 S3 파일을 제한된 병렬도와 범위(Range) GET으로 미리 내려받아
+앞 파일의 CSV 디코딩과 뒤 파일의 네트워크 다운로드가 겹치도록 합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 범위 GET 한 번에 받을 크기 (bytes)
+DEFAULT_PART_SIZE = 16 * 1024**2
+
+# 범위 GET 실패 시 재시도 횟수
+PART_RETRIES = 3
+
+
+class S3Prefetcher:
+    """S3 객체를 로컬 스테이징 디렉토리로 병렬 다운로드하는 선행 로더"""
+    
+    def __init__(self, s3_client, s3_bucket: str,
+                 staging_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None,
+                 max_files: Optional[int] = None,
+                 part_size: Optional[int] = None):
+        """
+        초기화
+        
+        Args:
+            s3_client: boto3 S3 클라이언트 (스레드 간 공유 가능)
+            s3_bucket: S3 버킷 이름
+            staging_dir: 다운로드 파일을 둘 디렉토리 (기본값: S3_STAGING_DIR 또는 ./s3_staging)
+            max_workers: 동시에 실행할 범위 GET 수 (기본값: S3_PREFETCH_WORKERS 또는 8)
+            max_files: 동시에 내려받을 파일 수 (기본값: S3_PREFETCH_FILES 또는 2)
+            part_size: 범위 GET 크기 (기본값: S3_PREFETCH_PART_MB 또는 16MB)
+        """
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.staging_dir = Path(staging_dir or os.getenv('S3_STAGING_DIR', './s3_staging'))
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.max_workers = max_workers or int(os.getenv('S3_PREFETCH_WORKERS', '8'))
+        self.max_files = max_files or int(os.getenv('S3_PREFETCH_FILES', '2'))
+        self.part_size = part_size or int(os.getenv('S3_PREFETCH_PART_MB', '0')) * 1024**2 or DEFAULT_PART_SIZE
+        
+        # 원본 ETag/크기 조회용 S3 카탈로그 (KeywordExtractor가 주입, 없으면 HEAD 요청)
+        self.catalog = None
+        
+        # 파일 단위 작업(범위 GET 분배/결과 대기)과 범위 GET 작업을 다른 풀에서 실행 (중첩 대기 교착 방지)
+        self._file_executor = ThreadPoolExecutor(max_workers=self.max_files, thread_name_prefix="s3-prefetch-file")
+        self._part_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="s3-prefetch-part")
+        
+        # 같은 파일을 동시에 두 번 받지 않도록 진행 중인 다운로드 공유
+        # (이미 끝난 Future의 완료 콜백은 등록한 스레드에서 바로 실행되므로 재진입 가능한 락 사용)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+        
+        # 다운로드 통계
+        self.downloaded_files = 0
+        self.downloaded_bytes = 0
+        self.download_seconds = 0.0
+    
+    def _get_s3_key(self, csv_path: str) -> str:
+        """s3a://bucket/path/file.csv -> path/file.csv"""
+        for scheme in ("s3a://", "s3://"):
+            prefix = f"{scheme}{self.s3_bucket}/"
+            if csv_path.startswith(prefix):
+                return csv_path[len(prefix):]
+        return csv_path
+    
+    def _get_staging_path(self, csv_path: str, etag: str) -> Path:
+        """스테이징 파일 경로 (S3 키의 디렉토리 구분자를 평탄화하고 원본 ETag를 붙여 버전별로 구분)"""
+        return self.staging_dir / f"{self._get_s3_key(csv_path).replace('/', '__')}@{etag}"
+    
+    def _get_source_info(self, csv_path: str, s3_key: str, size_bytes: Optional[int]):
+        """현재 원본 ETag/크기 (카탈로그에 없으면 HEAD 요청)"""
+        if self.catalog is not None:
+            entry = self.catalog.get_entry(csv_path)
+            if entry is not None and entry.etag:
+                return entry.etag, size_bytes if size_bytes is not None else entry.size
+        
+        head = self.s3_client.head_object(Bucket=self.s3_bucket, Key=s3_key)
+        return str(head.get('ETag', '')).strip('"'), head['ContentLength']
+    
+    def is_s3_path(self, csv_path: str) -> bool:
+        """선행 다운로드 대상 경로인지 확인"""
+        return csv_path.startswith(("s3a://", "s3://"))
+    
+    def _fetch_part(self, s3_key: str, etag: str, tmp_path: str, offset: int, end: int) -> int:
+        """
+        범위 GET 한 번으로 [offset, end] 구간을 받아 임시 파일의 같은 위치에 씁니다.
+        다운로드 중 원본이 바뀌면 서로 다른 버전의 범위가 섞이지 않도록 IfMatch로 ETag를 확인합니다.
+        """
+        last_error = None
+        for attempt in range(PART_RETRIES):
+            try:
+                conditions = {"IfMatch": etag} if etag else {}
+                response = self.s3_client.get_object(
+                    Bucket=self.s3_bucket,
+                    Key=s3_key,
+                    Range=f"bytes={offset}-{end}",
+                    **conditions
+                )
+                data = response['Body'].read()
+                if len(data) != end - offset + 1:
+                    raise IOError(f"범위 크기 불일치: {len(data)} != {end - offset + 1}")
+                
+                fd = os.open(tmp_path, os.O_WRONLY)
+                try:
+                    os.pwrite(fd, data, offset)
+                finally:
+                    os.close(fd)
+                return len(data)
+            
+            except Exception as e:
+                last_error = e
+                logger.debug(f"범위 GET 재시도 ({attempt + 1}/{PART_RETRIES}): {s3_key} {offset}-{end}, 오류: {e}")
+        
+        raise last_error
+    
+    def _download(self, csv_path: str, size_bytes: Optional[int]) -> str:
+        """파일 하나를 범위 GET으로 나눠 받아 스테이징 경로에 원자적으로 저장합니다."""
+        s3_key = self._get_s3_key(csv_path)
+        etag, size_bytes = self._get_source_info(csv_path, s3_key, size_bytes)
+        staging_path = self._get_staging_path(csv_path, etag)
+        
+        # 같은 버전(ETag)의 이전 다운로드가 남아 있고 크기가 같으면 재사용
+        if etag and staging_path.exists() and staging_path.stat().st_size == size_bytes:
+            return str(staging_path)
+        
+        start_time = time.time()
+        tmp_path = staging_path.with_name(f"{staging_path.name}.{os.getpid()}.{threading.get_ident()}.part")
+        
+        try:
+            # 전체 크기로 미리 만든 뒤 각 범위를 제 위치에 기록
+            with open(tmp_path, 'wb') as f:
+                f.truncate(size_bytes)
+            
+            part_futures = [
+                self._part_executor.submit(self._fetch_part, s3_key, etag, str(tmp_path), offset,
+                                           min(offset + self.part_size, size_bytes) - 1)
+                for offset in range(0, size_bytes, self.part_size)
+            ]
+            for future in part_futures:
+                future.result()
+            
+            os.replace(tmp_path, staging_path)
+        
+        except Exception:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+        
+        elapsed = time.time() - start_time
+        with self._lock:
+            self.downloaded_files += 1
+            self.downloaded_bytes += size_bytes
+            self.download_seconds += elapsed
+        
+        speed = size_bytes / (1024**2) / elapsed if elapsed > 0 else 0.0
+        logger.info(f"⬇️ {os.path.basename(csv_path)} 선행 다운로드 완료: "
+                    f"{size_bytes / (1024**2):.1f}MB, {len(part_futures)}개 범위, {elapsed:.2f}초 ({speed:.1f}MB/s)")
+        
+        return str(staging_path)
+    
+    def prefetch(self, csv_paths: List[str], file_sizes: Optional[Dict[str, int]] = None) -> Dict[str, Future]:
+        """
+        파일들의 다운로드를 요청 순서대로 예약합니다.
+        
+        Args:
+            csv_paths: 내려받을 S3 경로 목록 (앞 파일부터 먼저 받음)
+            file_sizes: 경로별 크기 (알고 있으면 HEAD 요청 생략)
+        
+        Returns:
+            Dict[str, Future]: 경로 → 로컬 파일 경로를 돌려주는 Future
+        """
+        file_sizes = file_sizes or {}
+        futures = {}
+        
+        with self._lock:
+            for csv_path in csv_paths:
+                if not self.is_s3_path(csv_path) or csv_path in futures:
+                    continue
+                
+                future = self._inflight.get(csv_path)
+                if future is None:
+                    future = self._file_executor.submit(self._download, csv_path, file_sizes.get(csv_path))
+                    self._inflight[csv_path] = future
+                    future.add_done_callback(lambda _, path=csv_path: self._forget(path))
+                futures[csv_path] = future
+        
+        if futures:
+            logger.info(f"⬇️ S3 선행 다운로드 예약: {len(futures)}개 파일 "
+                        f"(동시 파일 {self.max_files}개, 범위 GET {self.max_workers}개)")
+        
+        return futures
+    
+    def _forget(self, csv_path: str):
+        """완료된 다운로드를 진행 목록에서 제거"""
+        with self._lock:
+            self._inflight.pop(csv_path, None)
+    
+    def release(self, local_path: str):
+        """캐시/저장소에 반영된 스테이징 파일 삭제"""
+        try:
+            Path(local_path).unlink(missing_ok=True)
+        except Exception as e:
+            logger.debug(f"스테이징 파일 삭제 실패: {local_path}, 오류: {e}")
+    
+    def get_stats(self) -> Dict:
+        """다운로드 통계"""
+        with self._lock:
+            return {
+                "downloaded_files": self.downloaded_files,
+                "downloaded_mb": round(self.downloaded_bytes / (1024**2), 2),
+                "download_seconds": round(self.download_seconds, 2),
+                "inflight": len(self._inflight),
+            }
+    
+    def shutdown(self):
+        """다운로드 스레드 풀 정리"""
+        self._file_executor.shutdown(wait=False, cancel_futures=True)
+        self._part_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+동일 요청 합치기(single-flight)
+같은 키의 작업이 이미 진행 중이면 새로 실행하지 않고 진행 중인 작업의 결과를 함께 기다립니다.
+캐시가 비어 있을 때(캐시 삭제 직후, 장 시작 직후) 같은 조회가 몰려도 추출은 한 번만 실행됩니다.
+공유되는 결과는 여러 요청이 함께 읽으므로 호출하는 쪽에서 수정하지 않아야 합니다.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """스레드 간 동일 작업 합치기 (동기 코드용)"""
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        
+        # 통계
+        self.executions = 0
+        self.shared = 0
+    
+    def do(self, key: Hashable, func: Callable, *args, **kwargs):
+        """
+        key의 작업을 실행하거나, 진행 중이면 그 결과를 기다립니다.
+        
+        Returns:
+            func의 결과 (예외도 기다리던 모든 호출에 그대로 전달)
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.executions += 1
+            else:
+                self.shared += 1
+        
+        if not leader:
+            logger.info(f"🔗 진행 중인 동일 작업 결과를 기다립니다: {key}")
+            return future.result()
+        
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    
+    def get_stats(self) -> Dict:
+        """합치기 통계"""
+        with self._lock:
+            return {
+                "inflight": len(self._inflight),
+                "executions": self.executions,
+                "shared": self.shared,
+            }
+
+
+class AsyncSingleFlight:
+    """asyncio 요청 간 동일 작업 합치기"""
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        
+        # 통계
+        self.executions = 0
+        self.shared = 0
+    
+    async def do(self, key: Hashable, func: Callable[..., Awaitable], *args, **kwargs):
+        """
+        key의 코루틴 작업을 실행하거나, 진행 중이면 그 결과를 기다립니다.
+        작업은 별도 Task로 실행하므로 먼저 요청한 클라이언트가 연결을 끊어도 나머지 요청은 결과를 받습니다.
+        """
+        return await asyncio.shield(self.start(key, func, *args, **kwargs))
+    
+    def start(self, key: Hashable, func: Callable[..., Awaitable], *args, **kwargs) -> asyncio.Task:
+        """
+        key의 작업 Task를 시작하거나, 진행 중이면 그 Task를 반환합니다. (이벤트 루프에서 동기 호출)
+        func는 새로 시작할 때만 호출되며, func에서 난 예외는 작업을 등록하지 않고 호출자에게 그대로 전달됩니다.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._forget(key, t))
+            self.executions += 1
+        else:
+            self.shared += 1
+            logger.info(f"🔗 진행 중인 동일 요청 결과를 기다립니다: {key}")
+        return task
+    
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """완료된 작업 제거 (기다리는 요청이 없어도 예외가 로그에 남지 않도록 확인)"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+    
+    def get_stats(self) -> Dict:
+        """합치기 통계"""
+        return {
+            "inflight": len(self._inflight),
+            "executions": self.executions,
+            "shared": self.shared,
+        }
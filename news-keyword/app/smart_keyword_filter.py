@@ -146,27 +146,140 @@ class SmartKeywordFilter:
             filtered_keywords = self._parse_ai_response(ai_response, keywords_dict)
             
             # 결과 정리
-            if filtered_keywords:
-                # 빈도수 순으로 정렬
-                sorted_filtered = sorted(filtered_keywords.items(), key=lambda x: x[1], reverse=True)
-                final_keywords = sorted_filtered[:max_keywords]
-                
-                result_dict = dict(final_keywords)
-                result_list = [keyword for keyword, _ in final_keywords]
-                
-                logger.info(f"AI 필터링 완료: {len(keywords_dict)}개 → {len(result_dict)}개 키워드")
-                return result_dict, result_list
-            else:
-                logger.warning("AI 필터링에서 유효한 키워드를 찾지 못했습니다. 원본 키워드를 반환합니다.")
-                top_keywords = list(keywords_dict.keys())[:max_keywords]
-                filtered_dict = {k: keywords_dict[k] for k in top_keywords}
-                return filtered_dict, top_keywords
+            return self._select_filtered_keywords(filtered_keywords, keywords_dict, max_keywords)
                 
         except Exception as e:
             logger.error(f"AI 키워드 필터링 중 오류 발생: {e}")
             logger.info("규칙 기반 필터링으로 대체합니다.")
             return self._rule_based_filter(keywords_dict, company_name, max_keywords)
     
+    def _select_filtered_keywords(self, filtered_keywords: Dict[str, int], keywords_dict: Dict[str, int],
+                                  max_keywords: int) -> Tuple[Dict[str, int], List[str]]:
+        """AI가 고른 키워드를 빈도순 상위 max_keywords개로 정리 (없으면 원본 상위 키워드)"""
+        if filtered_keywords:
+            # 빈도수 순으로 정렬
+            sorted_filtered = sorted(filtered_keywords.items(), key=lambda x: x[1], reverse=True)
+            final_keywords = sorted_filtered[:max_keywords]
+            
+            result_dict = dict(final_keywords)
+            result_list = [keyword for keyword, _ in final_keywords]
+            
+            logger.info(f"AI 필터링 완료: {len(keywords_dict)}개 → {len(result_dict)}개 키워드")
+            return result_dict, result_list
+        else:
+            logger.warning("AI 필터링에서 유효한 키워드를 찾지 못했습니다. 원본 키워드를 반환합니다.")
+            top_keywords = list(keywords_dict.keys())[:max_keywords]
+            filtered_dict = {k: keywords_dict[k] for k in top_keywords}
+            return filtered_dict, top_keywords
+    
+    def _parse_batch_json(self, ai_response: str) -> Dict:
+        """일괄 요청의 JSON 응답 파싱 (코드 블록으로 감싼 응답도 처리)"""
+        text = ai_response.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            if text.startswith("json"):
+                text = text[len("json"):]
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end == -1:
+            return {}
+        parsed = json.loads(text[start:end + 1])
+        return parsed if isinstance(parsed, dict) else {}
+    
+    def filter_stock_related_keywords_batch(self, company_keywords: Dict[str, Dict[str, int]],
+                                            max_keywords: int = 20) -> Dict[str, Tuple[Dict[str, int], List[str]]]:
+        """
+        여러 기업의 키워드를 기업 AI_BATCH_COMPANIES개(기본 20개)마다 한 번의 API 호출로 필터링합니다.
+        
+        Args:
+            company_keywords: {기업명: {"키워드": 빈도수}}
+            max_keywords: 기업별 최대 키워드 개수
+        
+        Returns:
+            Dict[str, Tuple[Dict[str, int], List[str]]]: 기업명 → (필터링된 키워드 딕셔너리, 상위 키워드 리스트)
+        """
+        if not self.is_available():
+            logger.warning("OpenAI API를 사용할 수 없습니다. 원본 키워드를 반환합니다.")
+            return {
+                company_name: ({k: keywords_dict[k] for k in list(keywords_dict.keys())[:max_keywords]},
+                               list(keywords_dict.keys())[:max_keywords])
+                for company_name, keywords_dict in company_keywords.items()
+            }
+        
+        batch_size = max(1, int(os.getenv('AI_BATCH_COMPANIES', '20')))
+        company_names = list(company_keywords.keys())
+        results = {}
+        
+        for offset in range(0, len(company_names), batch_size):
+            chunk = company_names[offset:offset + batch_size]
+            try:
+                # 기업별 빈도 상위 50개만 분석 (API 비용 절약)
+                candidates = {
+                    company_name: [k for k, _ in sorted(company_keywords[company_name].items(), key=lambda x: x[1], reverse=True)[:50]]
+                    for company_name in chunk
+                }
+                prompt = self._create_batch_filtering_prompt(candidates)
+                
+                logger.info(f"{len(chunk)}개 기업의 키워드를 AI로 일괄 분석 중...")
+                
+                response = self.client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": "당신은 금융 및 주식 시장 전문가입니다. 당신이 아는 한국 기업들의 배경 지식을 활용하여 기업의 뉴스 키워드 중에서 주가에 영향을 미칠 수 있는 키워드만을 선별하는 역할을 합니다. 이때 키워드 간의 조합도 고려하여 선별해주세요. 조합한 키워드가 강력한 경우 합쳐서 보여줘"},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.1,
+                    max_tokens=min(4000, 300 * len(chunk))
+                )
+                
+                selections = self._parse_batch_json(response.choices[0].message.content)
+                for company_name in chunk:
+                    selected = selections.get(company_name, "")
+                    if isinstance(selected, list):
+                        selected = ", ".join(str(k) for k in selected)
+                    filtered_keywords = self._parse_ai_response(str(selected), company_keywords[company_name])
+                    results[company_name] = self._select_filtered_keywords(filtered_keywords, company_keywords[company_name], max_keywords)
+            
+            except Exception as e:
+                logger.error(f"AI 키워드 일괄 필터링 중 오류 발생: {e}")
+                logger.info("규칙 기반 필터링으로 대체합니다.")
+                for company_name in chunk:
+                    if company_name not in results:
+                        results[company_name] = self._rule_based_filter(company_keywords[company_name], company_name, max_keywords)
+        
+        return results
+    
+    def _create_batch_filtering_prompt(self, candidates: Dict[str, List[str]]) -> str:
+        """여러 기업 키워드 필터링용 프롬프트 생성"""
+        companies_str = "\n".join(f"- {company_name}: {', '.join(keywords)}" for company_name, keywords in candidates.items())
+        
+        prompt = f"""
+다음은 기업별 뉴스에서 추출된 키워드 목록입니다. 기업마다 주가에 직접적으로 영향을 미칠 수 있는 키워드만 선별해주세요.
+
+기업별 키워드 목록:
+{companies_str}
+
+주가 관련 키워드 선별 기준:
+✅ 포함할 키워드:
+- 재무/실적: 매출, 이익, 손실, 실적, 영업이익, 순이익, 수익성
+- 사업/투자: 투자, 계약, 신제품, 출시, 기술개발, 특허, R&D
+- 시장: 시장점유율, 경쟁, 점유율, 성장, 확장
+- 경영: 인수합병, 전략, 조직개편, 구조조정
+- 주식시장: 주식, 상장, 증자, 배당, 공시, 소송
+
+❌ 제외할 키워드:
+- 기업명 자체 (해당 기업명과 그룹명)
+- 일반용어: 기업, 회사, 업체, 기자, 뉴스, 보도, 발표
+- 제품명: TV, 냉장고, 스마트폰 (단순 제품명)
+- 지역명: 미국, 해외 (지역만 언급)
+- 기타: 취업, 소비자, 적용 (주가와 무관)
+
+중요: 주가에 실질적 영향을 미치는 키워드만 선택하세요.
+
+응답 형식: 기업명을 키로, 선별된 키워드를 쉼표로 구분한 문자열을 값으로 하는 JSON 객체 (설명 불필요)
+예시: {{"삼성전자": "투자, 주식, 출시", "카카오": "소송, 시장"}}
+"""
+        return prompt
+    
     def _create_filtering_prompt(self, keywords_list: List[str], company_name: str) -> str:
         """OpenAI API 호출을 위한 프롬프트 생성"""
         keywords_str = ', '.join(keywords_list)
@@ -296,3 +409,62 @@ class SmartKeywordFilter:
         except Exception as e:
             logger.error(f"키워드 분석 중 오류: {e}")
             return "키워드 분석 중 오류가 발생했습니다."
+    
+    def get_keyword_analysis_batch(self, company_keywords: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+        """
+        여러 기업의 키워드 분석을 기업 AI_BATCH_COMPANIES개(기본 20개)마다 한 번의 API 호출로 생성합니다.
+        
+        Args:
+            company_keywords: {기업명: 필터링된 키워드 딕셔너리}
+        
+        Returns:
+            Dict[str, str]: 기업명 → 키워드 분석 결과
+        """
+        if not self.is_available():
+            return {company_name: "키워드 분석을 위한 AI 서비스를 사용할 수 없습니다." for company_name in company_keywords}
+        
+        batch_size = max(1, int(os.getenv('AI_BATCH_COMPANIES', '20')))
+        company_names = [c for c, keywords_dict in company_keywords.items() if keywords_dict]
+        analyses = {c: "키워드 분석을 위한 AI 서비스를 사용할 수 없습니다." for c, keywords_dict in company_keywords.items() if not keywords_dict}
+        
+        for offset in range(0, len(company_names), batch_size):
+            chunk = company_names[offset:offset + batch_size]
+            try:
+                companies_str = "\n".join(
+                    f"- {company_name}: {', '.join(list(company_keywords[company_name].keys())[:10])}"
+                    for company_name in chunk
+                )
+                prompt = f"""
+다음 기업들의 주요 뉴스 키워드를 기업별로 분석해주세요.
+
+기업별 키워드:
+{companies_str}
+
+각 기업의 키워드들을 바탕으로 다음 관점에서 간단히 분석해주세요:
+1. 주요 이슈나 트렌드
+2. 긍정적/부정적 요소
+3. 주가에 미칠 수 있는 영향
+
+기업별로 200자 이내로 요약하고, 기업명을 키로, 분석을 값으로 하는 JSON 객체로 응답해주세요.
+"""
+                
+                response = self.client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": "당신은 금융 분석 전문가입니다. 키워드를 바탕으로 간단하고 명확한 분석을 제공합니다."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,
+                    max_tokens=min(4000, 300 * len(chunk))
+                )
+                
+                parsed = self._parse_batch_json(response.choices[0].message.content)
+                for company_name in chunk:
+                    analyses[company_name] = str(parsed.get(company_name) or "키워드 분석 중 오류가 발생했습니다.").strip()
+            
+            except Exception as e:
+                logger.error(f"키워드 일괄 분석 중 오류: {e}")
+                for company_name in chunk:
+                    analyses[company_name] = "키워드 분석 중 오류가 발생했습니다."
+        
+        return analyses
@@ -4,148 +4,251 @@ PySpark를 사용한 키워드 추출 엔진
 """
 
 import os
-import re
-from typing import Dict, List
-from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
+from date_utils import find_date_column
+from keyword_utils import KEYWORD_CLEAN_PATTERN, MIN_KEYWORD_LENGTH, notify_progress
 
 logger = logging.getLogger(__name__)
 
+# 드라이버로 가져올 상위 키워드 최대 개수 (AI 필터링은 상위 50개까지만 분석)
+KEYWORD_COLLECT_LIMIT = 100
+
+# Java 정규식에서도 Python re와 같이 유니코드 공백을 \s로 처리
+SPARK_KEYWORD_CLEAN_PATTERN = f"(?U){KEYWORD_CLEAN_PATTERN.pattern}"
+SPARK_STRIP_PATTERN = r"(?U)^\s+|\s+$"
+
+# BigKinds 뉴스 CSV 컬럼 (모두 문자열로 읽고 날짜는 _parse_date_column에서 파싱)
+BIGKINDS_COLUMNS = [
+    '뉴스 식별자', '일자', '언론사', '기고자', '제목',
+    '통합 분류1', '통합 분류2', '통합 분류3',
+    '사건/사고 분류1', '사건/사고 분류2', '사건/사고 분류3',
+    '인물', '위치', '기관', '키워드', '특성추출(가중치순 상위 50개)',
+    '본문', 'URL', '분석제외 여부',
+]
+
+
+# enforceSchema=false에서 CSV 헤더가 BIGKINDS_COLUMNS와 다를 때 Spark가 내는 오류 메시지
+SCHEMA_MISMATCH_MESSAGE = "CSV header does not conform to the schema"
+
+
+def is_schema_mismatch(error: Exception) -> bool:
+    """CSV 헤더가 선언된 BigKinds 스키마와 달라 실패한 오류인지 확인"""
+    return SCHEMA_MISMATCH_MESSAGE in str(error)
+
+
+def _bigkinds_schema():
+    """BigKinds CSV 스키마 (inferSchema로 인한 추가 전체 스캔을 피하기 위해 명시)"""
+    from pyspark.sql.types import StringType, StructField, StructType
+    
+    return StructType([StructField(name, StringType(), True) for name in BIGKINDS_COLUMNS])
+
+
 class SparkAnalyzer:
     """PySpark를 사용한 키워드 추출 분석기"""
     
-    def __init__(self, spark_session, s3_bucket: str, s3_prefix: str):
+    def __init__(self, spark_session, s3_bucket: str, s3_prefix: str, news_store=None):
         self.spark = spark_session
         self.s3_bucket = s3_bucket
         self.s3_prefix = s3_prefix
+        # 인제스트된 파일은 S3 CSV 대신 로컬 뉴스 저장소 + 기관 역색인으로 읽음
+        self.news_store = news_store
     
-    def extract_keywords_with_spark(self, company_name: str, start_date: str, end_date: str, top_keywords: int, csv_files: List[str]) -> Dict:
+    def read_from_news_store(self, company_name: str, start_date: str, end_date: str, csv_files: List[str]):
+        """
+        모든 파일이 뉴스 저장소에 인제스트되어 있으면 기관 역색인으로 해당 기업의 행만 읽습니다.
+        
+        Returns:
+            Spark DataFrame 또는 None (저장소를 사용할 수 없는 경우)
+        """
+        if self.news_store is None:
+            return None
+        
+        from pyspark.sql.functions import broadcast, col
+        from pyspark.sql.types import LongType, StructField, StructType
+        
+        row_id_schema = StructType([StructField('row_id', LongType(), False)])
+        date_filter = (col('date_key') >= int(start_date)) & (col('date_key') <= int(end_date))
+        
+        df = None
+        empty_df = None
+        for csv_path in csv_files:
+            manifest = self.news_store.get_manifest(csv_path)
+            if manifest is None:
+                return None
+            
+            row_ids = self.news_store.lookup_rows(csv_path, company_name, manifest)
+            if row_ids is None:
+                return None
+            
+            part_df = self.spark.read.parquet(self.news_store.get_data_dir(csv_path))
+            if len(row_ids) == 0:
+                empty_df = part_df.limit(0)
+                continue
+            
+            # 행 번호 목록은 IN 리터럴 대신 작은 브로드캐스트 테이블과 조인 (큰 기업도 실행 계획이 커지지 않도록)
+            row_id_df = self.spark.createDataFrame([(int(row_id),) for row_id in row_ids], row_id_schema)
+            part_df = part_df.filter(date_filter).join(broadcast(row_id_df), on='row_id', how='inner')
+            logger.info(f"🗂️ 저장소 역색인 조회: {os.path.basename(csv_path)} - {len(row_ids):,}개 행")
+            df = part_df if df is None else df.unionByName(part_df)
+        
+        return df if df is not None else empty_df
+    
+    def extract_keywords_with_spark(self, company_name: str, start_date: str, end_date: str, top_keywords: int, csv_files: List[str],
+                                    progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
         PySpark를 사용한 키워드 추출 (대용량 데이터용)
+        progress를 주면 날짜별 개수와 키워드 빈도를 드라이버로 가져오는 즉시 알립니다.
         """
         try:
             if self.spark is None:
                 raise Exception("SparkSession이 초기화되지 않았습니다.")
             
-            logger.info(f"🚀 PySpark 엔진으로 CSV 파일들 읽기 시작: {len(csv_files)}개 파일")
+            df = self.read_from_news_store(company_name, start_date, end_date, csv_files)
+            if df is not None:
+                logger.info(f"🚀 PySpark 엔진으로 뉴스 저장소 읽기 시작: {len(csv_files)}개 파일 (기관 역색인 사용)")
+            else:
+                logger.info(f"🚀 PySpark 엔진으로 CSV 파일들 읽기 시작: {len(csv_files)}개 파일")
+                df = self.read_csv_files(csv_files)
             
-            # 모든 CSV 파일 읽기 및 병합
-            dataframes = []
-            for csv_path in csv_files:
-                try:
-                    logger.info(f"파일 읽는 중: {os.path.basename(csv_path)}")
-                    temp_df = self.spark.read \
-                        .option("header", "true") \
-                        .option("inferSchema", "true") \
-                        .option("encoding", "UTF-8") \
-                        .option("multiline", "true") \
-                        .option("escape", '"') \
-                        .csv(csv_path)
-                    
-                    dataframes.append(temp_df)
-                    logger.info(f"  - 로드된 행 수: {temp_df.count()}")
-                    
-                except Exception as e:
-                    logger.warning(f"CSV 파일 읽기 실패: {csv_path}, 오류: {e}")
-                    continue
-            
-            if not dataframes:
-                raise FileNotFoundError("읽을 수 있는 CSV 파일이 없습니다.")
-            
-            # 모든 데이터프레임 병합
-            df = dataframes[0]
-            for temp_df in dataframes[1:]:
-                df = df.union(temp_df)
-            
-            total_rows = df.count()
-            logger.info(f"총 {len(csv_files)}개 파일에서 {total_rows}개 행 로드 완료")
             logger.info(f"컬럼명: {df.columns}")
             
             # 기업 필터링 (기관 컬럼에서 해당 기업이 포함된 행들을 가져옴)
             if '기관' in df.columns:
-                # 기관 컬럼에 NaN이 아니고 회사명이 포함된 행 필터링
+                # 기관 컬럼에 NaN이 아니고 회사명이 포함된 행 필터링 (이후 단계에서 재사용하도록 한 번만 캐시)
                 company_filtered_df = df.filter(
                     (df['기관'].isNotNull()) & 
                     (df['기관'].contains(company_name))
-                )
-                company_count = company_filtered_df.count()
+                ).persist()
                 
-                logger.info(f"'{company_name}' 관련 뉴스: {company_count}개 (기관 필터링 후)")
-                
-                # 날짜 필터링 적용
-                date_filtered_df = self.apply_date_filter(company_filtered_df, start_date, end_date)
-                total_count = date_filtered_df.count()
-                
-                logger.info(f"날짜 필터링 후 뉴스: {total_count}개 ({start_date}-{end_date})")
-                
-                # 최종 필터링된 데이터프레임 사용
-                filtered_df = date_filtered_df
-                
-                if total_count == 0:
-                    return {
-                        "company_name": company_name,
-                        "period": f"{start_date}-{end_date}",
-                        "total_news_count": 0,
-                        "daily_news_count": {},
-                        "keywords": {},
-                        "message": f"'{company_name}'와 관련된 뉴스를 찾을 수 없습니다."
-                    }
-                
-                # 날짜별 뉴스 개수 계산
-                daily_news_count = self.calculate_daily_news_count(filtered_df, start_date, end_date)
-                
-                # 키워드 추출 (기존 키워드 컬럼 사용)
-                if '키워드' in df.columns:
-                    # 키워드 컬럼에서 키워드 분리 및 정리
-                    keyword_rows = filtered_df.select("키워드").filter(df['키워드'].isNotNull()).collect()
-                    
-                    all_keywords = []
-                    for row in keyword_rows:
-                        keywords_str = row['키워드']
-                        if keywords_str:
-                            keywords = [re.sub(r'[^가-힣a-zA-Z0-9\s]', '', k.strip()) for k in keywords_str.split(',') if k.strip()]
-                            all_keywords.extend([k for k in keywords if len(k) >= 2])
-                    
-                    # 기업명 자체는 키워드에서 제외
-                    all_keywords = [k for k in all_keywords if company_name not in k]
-                    
-                    # 키워드 빈도 계산
-                    keyword_counter = Counter(all_keywords)
-                    
-                    # 빈도순으로 정렬하여 딕셔너리 생성
-                    keywords_dict = dict(keyword_counter.most_common())
-                    
-                    # 상위 키워드가 많이 포함된 뉴스 기사들 추출
-                    top_keywords_list = list(keywords_dict.keys())[:top_keywords]
-                    top_news_articles = self.extract_top_news_articles(filtered_df, top_keywords_list)
-                    
-                    logger.info(f"🚀 PySpark 엔진으로 키워드 추출 완료: {len(keywords_dict)}개 키워드")
-                    
-                    return {
-                        "company_name": company_name,
-                        "period": f"{start_date}-{end_date}",
-                        "total_news_count": total_count,
-                        "daily_news_count": daily_news_count,
-                        "keywords": keywords_dict,
-                        "top_news_articles": top_news_articles,
-                        "message": f"🚀 PySpark 엔진으로 성공적으로 키워드를 추출했습니다. 총 {len(keywords_dict)}개 키워드 발견 (파일 {len(csv_files)}개 처리)"
-                    }
-                else:
-                    return {
-                        "company_name": company_name,
-                        "period": f"{start_date}-{end_date}",
-                        "total_news_count": total_count,
-                        "daily_news_count": daily_news_count,
-                        "keywords": {},
-                        "message": "키워드 컬럼을 찾을 수 없습니다."
-                    }
+                try:
+                    return self._extract_from_company_frame(
+                        company_filtered_df, company_name, start_date, end_date, top_keywords, csv_files, progress
+                    )
+                finally:
+                    company_filtered_df.unpersist()
             else:
                 raise ValueError("기관 컬럼을 찾을 수 없습니다.")
                 
         except Exception as e:
+            if is_schema_mismatch(e):
+                logger.warning(f"⚠️ CSV 헤더가 BigKinds 스키마({len(BIGKINDS_COLUMNS)}개 컬럼)와 달라 Spark 엔진을 사용할 수 없습니다. "
+                               f"Pandas 엔진으로 폴백됩니다. BIGKINDS_COLUMNS와 원본 헤더를 확인하세요: {e}")
             logger.error(f"PySpark로 키워드 추출 중 오류 발생: {str(e)}")
             raise e
     
+    def read_csv_files(self, csv_files: List[str]):
+        """
+        모든 CSV 파일을 선언된 BigKinds 스키마로 한 번에 읽습니다.
+        (파일별 스키마 추론/행 수 계산 없이 단일 스캔으로 처리)
+        
+        Returns:
+            Spark DataFrame
+        """
+        try:
+            # enforceSchema=false: 헤더가 스키마와 다른 파일은 컬럼이 밀리지 않고 오류로 처리됨
+            return self.spark.read \
+                .schema(_bigkinds_schema()) \
+                .option("header", "true") \
+                .option("enforceSchema", "false") \
+                .option("encoding", "UTF-8") \
+                .option("multiline", "true") \
+                .option("escape", '"') \
+                .csv(csv_files)
+        except Exception as e:
+            logger.warning(f"CSV 파일 읽기 실패: {len(csv_files)}개 파일, 오류: {e}")
+            raise FileNotFoundError("읽을 수 있는 CSV 파일이 없습니다.") from e
+    
+    def _extract_from_company_frame(self, company_filtered_df, company_name: str, start_date: str, end_date: str, top_keywords: int, csv_files: List[str],
+                                    progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """캐시된 기업 필터링 데이터프레임에서 날짜 필터링/집계/키워드 추출을 수행합니다."""
+        # 날짜 필터링 적용 (지연 평가)
+        filtered_df = self.apply_date_filter(company_filtered_df, start_date, end_date)
+        
+        # 기업 뉴스 수와 날짜별 뉴스 수를 한 번의 집계로 계산 (이 집계가 캐시를 채움)
+        date_column = find_date_column(company_filtered_df.columns)
+        if date_column is not None:
+            day_counts = self.count_news_by_day(company_filtered_df, date_column)
+            company_count = sum(day_counts.values())
+            daily_news_count = self.calculate_daily_news_count(filtered_df, start_date, end_date, day_counts)
+            total_count = sum(daily_news_count.values())
+        else:
+            company_count = company_filtered_df.count()
+            daily_news_count = {}
+            total_count = company_count
+        
+        logger.info(f"'{company_name}' 관련 뉴스: {company_count}개 (기관 필터링 후)")
+        logger.info(f"날짜 필터링 후 뉴스: {total_count}개 ({start_date}-{end_date})")
+        
+        if total_count == 0:
+            return {
+                "company_name": company_name,
+                "period": f"{start_date}-{end_date}",
+                "total_news_count": 0,
+                "daily_news_count": {},
+                "keywords": {},
+                "message": f"'{company_name}'와 관련된 뉴스를 찾을 수 없습니다."
+            }
+        
+        notify_progress(progress, "daily_counts", {"total_news_count": total_count, "daily_news_count": daily_news_count})
+        
+        # 키워드 추출 (기존 키워드 컬럼 사용)
+        if '키워드' in filtered_df.columns:
+            # 키워드 분리/정제/집계는 Spark에서 수행하고 상위 키워드만 드라이버로 가져옴
+            keywords_dict, unique_keyword_count = self.aggregate_keywords(
+                filtered_df, company_name, max(top_keywords, KEYWORD_COLLECT_LIMIT)
+            )
+            notify_progress(progress, "raw_keywords", {"keywords": keywords_dict})
+            
+            # 상위 키워드가 많이 포함된 뉴스 기사들 추출
+            top_keywords_list = list(keywords_dict.keys())[:top_keywords]
+            top_news_articles = self.extract_top_news_articles(filtered_df, top_keywords_list)
+            
+            logger.info(f"🚀 PySpark 엔진으로 키워드 추출 완료: {unique_keyword_count}개 키워드")
+            
+            return {
+                "company_name": company_name,
+                "period": f"{start_date}-{end_date}",
+                "total_news_count": total_count,
+                "daily_news_count": daily_news_count,
+                "keywords": keywords_dict,
+                "top_news_articles": top_news_articles,
+                "message": f"🚀 PySpark 엔진으로 성공적으로 키워드를 추출했습니다. 총 {unique_keyword_count}개 키워드 발견 (파일 {len(csv_files)}개 처리)"
+            }
+        else:
+            return {
+                "company_name": company_name,
+                "period": f"{start_date}-{end_date}",
+                "total_news_count": total_count,
+                "daily_news_count": daily_news_count,
+                "keywords": {},
+                "message": "키워드 컬럼을 찾을 수 없습니다."
+            }
+    
+    def _parse_date_column(self, df, date_column: str):
+        """날짜 컬럼을 Spark date 타입으로 파싱하는 컬럼 표현식 (저장소 데이터는 date_key 사용)"""
+        from pyspark.sql.functions import col, to_date, when
+        
+        if 'date_key' in df.columns:
+            return to_date(col('date_key').cast('string'), 'yyyyMMdd')
+        
+        date_col = col(date_column)
+        
+        # 다양한 날짜 형식으로 변환 시도
+        return when(
+            date_col.rlike(r'^\d{8}$'),  # YYYYMMDD 형식
+            to_date(date_col, 'yyyyMMdd')
+        ).when(
+            date_col.rlike(r'^\d{4}-\d{2}-\d{2}$'),  # YYYY-MM-DD 형식
+            to_date(date_col, 'yyyy-MM-dd')
+        ).when(
+            date_col.rlike(r'^\d{4}/\d{2}/\d{2}$'),  # YYYY/MM/DD 형식
+            to_date(date_col, 'yyyy/MM/dd')
+        ).when(
+            date_col.rlike(r'^\d{4}\.\d{2}\.\d{2}$'),  # YYYY.MM.DD 형식
+            to_date(date_col, 'yyyy.MM.dd')
+        ).otherwise(None)
+    
     def apply_date_filter(self, df, start_date: str, end_date: str):
         """
         날짜 컬럼을 사용하여 설정된 기간 내의 데이터만 필터링합니다.
@@ -159,15 +262,8 @@ class SparkAnalyzer:
             Spark DataFrame: 날짜 필터링된 데이터프레임
         """
         try:
-            from datetime import datetime
-            from pyspark.sql.functions import col, to_date, when, isnan, isnull
-            
             # 날짜 관련 컬럼 찾기
-            date_column = None
-            for col_name in ['일자', '날짜', 'date', 'Date', 'DATE']:
-                if col_name in df.columns:
-                    date_column = col_name
-                    break
+            date_column = find_date_column(df.columns)
             
             if date_column is None:
                 logger.warning("날짜 관련 컬럼을 찾을 수 없습니다. 날짜 필터링을 건너뜁니다.")
@@ -179,23 +275,8 @@ class SparkAnalyzer:
             start_date_str = f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:8]}"
             end_date_str = f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:8]}"
             
-            # 날짜 컬럼을 다양한 형식으로 파싱 시도
-            date_col = col(date_column)
-            
-            # 다양한 날짜 형식으로 변환 시도
-            parsed_date = when(
-                date_col.rlike(r'^\d{8}$'),  # YYYYMMDD 형식
-                to_date(date_col, 'yyyyMMdd')
-            ).when(
-                date_col.rlike(r'^\d{4}-\d{2}-\d{2}$'),  # YYYY-MM-DD 형식
-                to_date(date_col, 'yyyy-MM-dd')
-            ).when(
-                date_col.rlike(r'^\d{4}/\d{2}/\d{2}$'),  # YYYY/MM/DD 형식
-                to_date(date_col, 'yyyy/MM/dd')
-            ).when(
-                date_col.rlike(r'^\d{4}\.\d{2}\.\d{2}$'),  # YYYY.MM.DD 형식
-                to_date(date_col, 'yyyy.MM.dd')
-            ).otherwise(None)
+            # 날짜 컬럼 파싱
+            parsed_date = self._parse_date_column(df, date_column)
             
             # 날짜 필터링 적용
             filtered_df = df.filter(
@@ -204,15 +285,6 @@ class SparkAnalyzer:
                 (parsed_date <= end_date_str)
             )
             
-            filtered_count = filtered_df.count()
-            logger.info(f"날짜 범위 필터링 완료: {filtered_count}개 뉴스")
-            
-            # 샘플 날짜 값 로그 출력
-            if filtered_count > 0:
-                sample_dates = filtered_df.select(date_column).limit(3).collect()
-                sample_values = [row[date_column] for row in sample_dates]
-                logger.info(f"필터링된 샘플 날짜: {sample_values}")
-            
             return filtered_df
             
         except Exception as e:
@@ -220,14 +292,31 @@ class SparkAnalyzer:
             logger.info("날짜 필터링을 건너뛰고 원본 데이터를 반환합니다.")
             return df
     
-    def calculate_daily_news_count(self, filtered_df, start_date: str, end_date: str) -> Dict[str, int]:
+    def count_news_by_day(self, df, date_column: str) -> Dict[Optional[str], int]:
+        """
+        파싱된 날짜(YYYYMMDD)별 뉴스 개수를 한 번의 groupBy 집계로 계산합니다.
+        (드라이버로는 날짜 수만큼의 행만 수집, 날짜를 파싱할 수 없는 행은 None 키)
+        """
+        from pyspark.sql.functions import date_format
+        
+        day_key = date_format(self._parse_date_column(df, date_column), 'yyyyMMdd')
+        count_rows = df \
+            .select(day_key.alias('day_key')) \
+            .groupBy('day_key') \
+            .count() \
+            .collect()
+        return {row['day_key']: int(row['count']) for row in count_rows}
+    
+    def calculate_daily_news_count(self, filtered_df, start_date: str, end_date: str, day_counts: Optional[Dict[Optional[str], int]] = None) -> Dict[str, int]:
         """
         날짜별 뉴스 개수를 계산합니다.
+        파싱된 날짜에 대한 한 번의 groupBy 집계로 계산하고, 뉴스가 없는 날은 0으로 채웁니다.
         
         Args:
             filtered_df: 필터링된 Spark DataFrame
             start_date: 시작 날짜 (YYYYMMDD)
             end_date: 종료 날짜 (YYYYMMDD)
+            day_counts: 이미 계산된 날짜별 개수 (있으면 재집계하지 않음)
             
         Returns:
             Dict[str, int]: 날짜별 뉴스 개수 {"20210811": 15, "20210812": 23, ...}
@@ -235,75 +324,33 @@ class SparkAnalyzer:
         try:
             from datetime import datetime, timedelta
             
-            # 사용 가능한 컬럼 확인
-            logger.info(f"사용 가능한 컬럼: {filtered_df.columns}")
-            
-            # 날짜 관련 컬럼 찾기
-            date_column = None
-            for col in ['일자', '날짜', 'date', 'Date', 'DATE']:
-                if col in filtered_df.columns:
-                    date_column = col
-                    break
-            
-            if date_column is None:
-                logger.warning("날짜 관련 컬럼을 찾을 수 없습니다. 빈 딕셔너리를 반환합니다.")
-                return {}
-            
-            logger.info(f"날짜 컬럼 사용: {date_column}")
+            if day_counts is None:
+                # 사용 가능한 컬럼 확인
+                logger.info(f"사용 가능한 컬럼: {filtered_df.columns}")
+                
+                # 날짜 관련 컬럼 찾기
+                date_column = find_date_column(filtered_df.columns)
+                if date_column is None:
+                    logger.warning("날짜 관련 컬럼을 찾을 수 없습니다. 빈 딕셔너리를 반환합니다.")
+                    return {}
+                
+                logger.info(f"날짜 컬럼 사용: {date_column}")
+                day_counts = self.count_news_by_day(filtered_df, date_column)
             
-            # 날짜 범위 생성
+            # 기간 내 모든 날짜를 0으로 채움
             start_dt = datetime.strptime(start_date, "%Y%m%d")
             end_dt = datetime.strptime(end_date, "%Y%m%d")
             
             daily_count = {}
             current_date = start_dt
-            
-            # 각 날짜별로 뉴스 개수 계산
             while current_date <= end_dt:
                 date_str = current_date.strftime("%Y%m%d")
-                
-                # 해당 날짜의 뉴스 개수 계산
-                try:
-                    # 다양한 날짜 형식 지원
-                    date_patterns = [
-                        date_str,  # 20210811
-                        f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}",  # 2021-08-11
-                        f"{date_str[:4]}/{date_str[4:6]}/{date_str[6:8]}",  # 2021/08/11
-                        f"{date_str[:4]}.{date_str[4:6]}.{date_str[6:8]}",  # 2021.08.11
-                    ]
-                    
-                    # 각 패턴에 대해 매칭 시도
-                    count = 0
-                    for pattern in date_patterns:
-                        date_count_df = filtered_df.filter(
-                            filtered_df[date_column].cast("string").contains(pattern)
-                        )
-                        pattern_count = date_count_df.count()
-                        if pattern_count > 0:
-                            count = pattern_count
-                            logger.debug(f"{date_str} ({pattern}): {count}개 뉴스 발견")
-                            break
-                    
-                    # 디버깅을 위한 로그
-                    if count == 0:
-                        # 샘플 날짜 값 확인
-                        sample_dates = filtered_df.select(date_column).filter(
-                            filtered_df[date_column].isNotNull()
-                        ).limit(3).collect()
-                        sample_values = [row[date_column] for row in sample_dates]
-                        logger.debug(f"{date_str} 매칭 실패. 샘플 날짜 값: {sample_values}")
-                    
-                except Exception as e:
-                    logger.warning(f"날짜 {date_str} 계산 중 오류: {e}")
-                    count = 0
-                
-                daily_count[date_str] = int(count)
+                daily_count[date_str] = int(day_counts.get(date_str, 0))
                 current_date += timedelta(days=1)
             
             # 총합 검증
             total_daily_count = sum(daily_count.values())
             logger.info(f"날짜별 뉴스 개수 계산 완료: {len(daily_count)}일, 총합: {total_daily_count}개")
-            logger.info(f"daily_news_count 합계: {total_daily_count}, total_news_count: {filtered_df.count()}")
             
             return daily_count
             
@@ -311,9 +358,62 @@ class SparkAnalyzer:
             logger.warning(f"날짜별 뉴스 개수 계산 중 오류: {e}")
             return {}
     
+    def aggregate_keywords(self, filtered_df, company_name: str, limit: int) -> Tuple[Dict[str, int], int]:
+        """
+        키워드 분리/정제/빈도 계산을 Spark에서 수행하고 상위 키워드만 드라이버로 가져옵니다.
+        Counter.most_common과 같은 순서(빈도 내림차순, 동률은 먼저 나온 순)를 유지합니다.
+        
+        Args:
+            filtered_df: 필터링된 Spark DataFrame
+            company_name: 기업명 (기업명이 포함된 키워드는 제외)
+            limit: 드라이버로 가져올 상위 키워드 개수
+        
+        Returns:
+            Tuple[Dict[str, int], int]: ({"키워드": 빈도수} 빈도순 상위 limit개, 전체 고유 키워드 수)
+        """
+        from pyspark.sql.functions import col, count, length, lit, monotonically_increasing_id, posexplode, regexp_replace, split, struct
+        from pyspark.sql.functions import min as spark_min
+        
+        # 기사 순서/기사 내 위치를 함께 펼쳐 동률 키워드의 첫 등장 순서를 보존
+        tokens = filtered_df \
+            .filter(col('키워드').isNotNull()) \
+            .select(
+                monotonically_increasing_id().alias('article_id'),
+                posexplode(split(col('키워드'), ',')).alias('position', 'keyword')
+            ) \
+            .withColumn('keyword', regexp_replace(col('keyword'), SPARK_STRIP_PATTERN, '')) \
+            .filter(col('keyword') != '') \
+            .withColumn('keyword', regexp_replace(col('keyword'), SPARK_KEYWORD_CLEAN_PATTERN, '')) \
+            .filter(length(col('keyword')) >= MIN_KEYWORD_LENGTH) \
+            .filter(~col('keyword').contains(company_name))  # 기업명 자체는 키워드에서 제외
+        
+        keyword_counts = tokens \
+            .groupBy('keyword') \
+            .agg(
+                count(lit(1)).alias('count'),
+                spark_min(struct('article_id', 'position')).alias('first_seen')
+            ) \
+            .persist()
+        
+        try:
+            unique_keyword_count = keyword_counts.count()
+            top_rows = keyword_counts \
+                .orderBy(col('count').desc(), col('first_seen').asc()) \
+                .limit(limit) \
+                .collect()
+        finally:
+            keyword_counts.unpersist()
+        
+        keywords_dict = {row['keyword']: int(row['count']) for row in top_rows}
+        logger.info(f"Spark 키워드 집계 완료: 고유 키워드 {unique_keyword_count}개 중 상위 {len(keywords_dict)}개 수집")
+        
+        return keywords_dict, unique_keyword_count
+    
     def extract_top_news_articles(self, filtered_df, top_keywords_list, max_articles=10):
         """
         상위 키워드가 많이 포함된 뉴스 기사들을 추출합니다.
+        기사 키워드 × 상위 키워드(broadcast) 부분 문자열 매칭과 기사별 집계를 Spark에서 수행하고,
+        상위 max_articles개 기사만 드라이버로 가져옵니다.
         
         Args:
             filtered_df: 필터링된 Spark DataFrame
@@ -327,64 +427,76 @@ class SparkAnalyzer:
             if not top_keywords_list:
                 return []
             
-            # 필요한 컬럼이 있는지 확인
-            required_columns = ['제목', '날짜', 'URL', '키워드']
-            available_columns = [col for col in required_columns if col in filtered_df.columns]
-            
-            if len(available_columns) < 3:  # 최소 3개 컬럼 필요
-                logger.warning(f"필요한 컬럼이 부족합니다. 사용 가능: {available_columns}")
+            if '키워드' not in filtered_df.columns:
+                logger.warning(f"키워드 컬럼이 없습니다. 사용 가능: {filtered_df.columns}")
                 return []
             
-            # 각 기사에서 상위 키워드 매칭 개수 계산
-            articles_with_score = []
+            from pyspark.sql.functions import broadcast, col, collect_set, count, monotonically_increasing_id, posexplode, regexp_replace, split
+            
+            article_columns = [c for c in ['제목', '일자', 'URL', '키워드'] if c in filtered_df.columns]
+            articles = filtered_df \
+                .select(*article_columns) \
+                .withColumn('article_id', monotonically_increasing_id())
+            
+            # 기사 키워드 분리
+            article_tokens = articles \
+                .select('article_id', posexplode(split(col('키워드'), ',')).alias('position', 'article_keyword')) \
+                .withColumn('article_keyword', regexp_replace(col('article_keyword'), SPARK_STRIP_PATTERN, '')) \
+                .filter(col('article_keyword') != '')
             
-            # DataFrame을 collect하여 Python에서 처리
-            articles_data = filtered_df.select(*available_columns).collect()
+            # 상위 키워드는 작으므로 broadcast 후 양방향 부분 문자열 매칭
+            top_keywords_df = self.spark.createDataFrame(
+                list(enumerate(top_keywords_list)), ['keyword_index', 'top_keyword']
+            )
+            matches = article_tokens.join(
+                broadcast(top_keywords_df),
+                col('article_keyword').contains(col('top_keyword')) | col('top_keyword').contains(col('article_keyword'))
+            )
             
-            for row in articles_data:
-                article_keywords = []
-                if row.get('키워드') and str(row['키워드']).strip():
-                    # 기사 키워드 분리
-                    article_keywords = [k.strip() for k in str(row['키워드']).split(',') if k.strip()]
+            # 기사별 매칭 키워드 개수 (키워드당 한 번만 카운트), 동률은 앞선 기사 우선
+            top_scores = matches \
+                .select('article_id', 'keyword_index', 'top_keyword') \
+                .distinct() \
+                .groupBy('article_id') \
+                .agg(
+                    count('keyword_index').alias('matched_keywords_count'),
+                    collect_set('top_keyword').alias('matched_keywords')
+                ) \
+                .orderBy(col('matched_keywords_count').desc(), col('article_id').asc()) \
+                .limit(max_articles)
+            
+            top_rows = top_scores \
+                .join(articles, 'article_id') \
+                .orderBy(col('matched_keywords_count').desc(), col('article_id').asc()) \
+                .collect()
+            
+            top_articles = []
+            for row in top_rows:
+                row = row.asDict()
+                
+                # nan 값 처리
+                title = row.get('제목')
+                if title is None or str(title).lower() == 'nan':
+                    title = '제목 없음'
+                
+                date = row.get('일자')
+                if date is None or str(date).lower() == 'nan':
+                    date = '일자 없음'
+                
+                url = row.get('URL')
+                if url is None or str(url).lower() == 'nan':
+                    url = 'URL 없음'
                 
-                # 상위 키워드와 매칭되는 개수 계산
-                matched_count = 0
-                matched_keywords = []
-                for keyword in top_keywords_list:
-                    for article_keyword in article_keywords:
-                        if keyword in article_keyword or article_keyword in keyword:
-                            matched_count += 1
-                            matched_keywords.append(keyword)
-                            break  # 중복 카운트 방지
+                article_keywords = [k.strip() for k in str(row['키워드']).split(',') if k.strip()]
                 
-                if matched_count > 0:
-                    # nan 값 처리
-                    title = row.get('제목', '제목 없음')
-                    if title is None or str(title).lower() == 'nan':
-                        title = '제목 없음'
-                    
-                    date = row.get('일자', '일자 없음')
-                    if date is None or str(date).lower() == 'nan':
-                        date = '일자 없음'
-                    
-                    url = row.get('URL', 'URL 없음')
-                    if url is None or str(url).lower() == 'nan':
-                        url = 'URL 없음'
-                    
-                    articles_with_score.append({
-                        'title': str(title),
-                        'date': str(date),
-                        'url': str(url),
-                        'matched_keywords_count': matched_count,
-                        'matched_keywords': list(set(matched_keywords)),
-                        'all_keywords': article_keywords
-                    })
-            
-            # 매칭된 키워드 개수 순으로 정렬
-            articles_with_score.sort(key=lambda x: x['matched_keywords_count'], reverse=True)
-            
-            # 상위 기사들만 반환
-            top_articles = articles_with_score[:max_articles]
+                top_articles.append({
+                    'title': str(title),
+                    'date': str(date),
+                    'url': str(url),
+                    'matched_keywords_count': int(row['matched_keywords_count']),
+                    'matched_keywords': list(row['matched_keywords']),
+                    'all_keywords': article_keywords
+                })
             
             logger.info(f"상위 키워드가 포함된 뉴스 기사 {len(top_articles)}개 추출 완료")
             
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+SparkSession 관리 모듈
+API 시작 시 SparkSession을 미리 생성/검증(warm-up)하여
+대용량 요청이 JVM 기동과 jar 의존성 해석 시간을 기다리지 않도록 합니다.
+"""
+
+import glob
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# S3A 접근에 필요한 의존성 (spark.jars.packages 좌표)
+HADOOP_AWS_PACKAGES = [
+    "org.apache.hadoop:hadoop-aws:3.3.4",
+    "com.amazonaws:aws-java-sdk-bundle:1.12.262",
+]
+
+# 로컬 jar 캐시에서 찾을 파일 패턴 (모두 있으면 spark.jars로 바로 사용)
+HADOOP_AWS_JAR_PATTERNS = [
+    "hadoop-aws-*.jar",
+    "aws-java-sdk-bundle-*.jar",
+]
+
+
+class SparkSessionManager:
+    """SparkSession 생성/재사용/상태 확인 매니저"""
+    
+    def __init__(self,
+                 master_url: Optional[str] = None,
+                 jars_dir: Optional[str] = None,
+                 ivy_dir: Optional[str] = None,
+                 s3_region: Optional[str] = None):
+        """
+        초기화
+        
+        Args:
+            master_url: Spark 마스터 URL (기본값: SPARK_MASTER_URL 또는 local[*], 상시 클러스터 연결 시 spark://host:7077)
+            jars_dir: 미리 내려받은 hadoop-aws jar 디렉토리 (기본값: SPARK_JARS_DIR)
+            ivy_dir: jar가 없을 때 spark.jars.packages 해석 결과를 보관할 ivy 캐시 (기본값: SPARK_IVY_DIR)
+            s3_region: S3 리전 (기본값: AWS_DEFAULT_REGION)
+        """
+        self.master_url = master_url or os.getenv('SPARK_MASTER_URL', 'local[*]')
+        self.jars_dir = jars_dir or os.getenv('SPARK_JARS_DIR', '/opt/spark-jars')
+        self.ivy_dir = ivy_dir or os.getenv('SPARK_IVY_DIR', os.path.expanduser('~/.ivy2'))
+        self.s3_region = s3_region or os.getenv('AWS_DEFAULT_REGION', 'ap-northeast-2')
+        
+        self.spark = None
+        self.created_at = None
+        self.last_health_check = None
+        self._lock = threading.Lock()
+    
+    def _find_local_jars(self) -> Optional[List[str]]:
+        """로컬 jar 캐시에서 필요한 jar를 모두 찾으면 경로 목록을, 하나라도 없으면 None을 반환합니다."""
+        jars = []
+        for pattern in HADOOP_AWS_JAR_PATTERNS:
+            matches = sorted(glob.glob(os.path.join(self.jars_dir, pattern)))
+            if not matches:
+                return None
+            jars.append(matches[-1])
+        return jars
+    
+    def _dependency_config(self) -> Dict[str, str]:
+        """hadoop-aws 의존성 설정 (로컬 jar 우선, 없으면 ivy 캐시를 지정한 패키지 해석)"""
+        local_jars = self._find_local_jars()
+        if local_jars:
+            logger.info(f"📦 로컬 jar 캐시 사용: {', '.join(os.path.basename(j) for j in local_jars)}")
+            return {"spark.jars": ",".join(local_jars)}
+        
+        logger.info(f"📦 로컬 jar 없음 - 패키지 해석 (ivy 캐시: {self.ivy_dir})")
+        return {
+            "spark.jars.packages": ",".join(HADOOP_AWS_PACKAGES),
+            "spark.jars.ivy": self.ivy_dir,
+        }
+    
+    def _set_environment(self):
+        """Java/PySpark 환경 변수 설정 (Java 11과 PySpark 3.3.0 호환성 최적화)"""
+        # Java 환경 변수 확인 및 설정 (Java 8 사용)
+        java_home = os.environ.get('JAVA_HOME')
+        if not java_home:
+            os.environ['JAVA_HOME'] = '/usr/lib/jvm/java-8-openjdk-amd64'
+            logger.info(f"JAVA_HOME 설정: {os.environ['JAVA_HOME']}")
+        
+        # SPARK_HOME 환경 변수 설정
+        spark_home = os.environ.get('SPARK_HOME')
+        if not spark_home:
+            os.environ['SPARK_HOME'] = '/usr/local/lib/python3.9/dist-packages/pyspark'
+            logger.info(f"SPARK_HOME 설정: {os.environ['SPARK_HOME']}")
+        
+        # PySpark Python 실행 파일 설정
+        os.environ['PYSPARK_PYTHON'] = '/usr/bin/python'
+        os.environ['PYSPARK_DRIVER_PYTHON'] = '/usr/bin/python'
+    
+    def _create_session(self):
+        """SparkSession 생성"""
+        from pyspark.sql import SparkSession
+        
+        self._set_environment()
+        
+        print(f"AWS_ACCESS_KEY_ID: {os.getenv('AWS_ACCESS_KEY_ID', 'NOT_SET')}")
+        print(f"AWS_SECRET_ACCESS_KEY: {'SET' if os.getenv('AWS_SECRET_ACCESS_KEY') else 'NOT_SET'}")
+        
+        start_time = time.time()
+        
+        builder = SparkSession.builder \
+            .appName("NewsKeywordAPI") \
+            .master(self.master_url) \
+            .config("spark.driver.memory", "2g") \
+            .config("spark.driver.maxResultSize", "1g") \
+            .config("spark.executor.memory", "2g") \
+            .config("spark.sql.adaptive.enabled", "true") \
+            .config("spark.sql.adaptive.coalescePartitions.enabled", "true") \
+            .config("spark.serializer", "org.apache.spark.serializer.KryoSerializer") \
+            .config("spark.sql.adaptive.skewJoin.enabled", "true") \
+            .config("spark.sql.execution.arrow.pyspark.enabled", "false") \
+            .config("spark.sql.execution.arrow.enabled", "false") \
+            .config("spark.sql.shuffle.partitions", "200") \
+            .config("spark.default.parallelism", "4") \
+            .config("spark.ui.enabled", "false") \
+            .config("spark.ui.showConsoleProgress", "false") \
+            .config("spark.hadoop.fs.s3a.access.key", os.getenv('AWS_ACCESS_KEY_ID')) \
+            .config("spark.hadoop.fs.s3a.secret.key", os.getenv('AWS_SECRET_ACCESS_KEY')) \
+            .config("spark.hadoop.fs.s3a.endpoint", f"s3.{self.s3_region}.amazonaws.com") \
+            .config("spark.hadoop.fs.s3a.impl", "org.apache.hadoop.fs.s3a.S3AFileSystem")
+        
+        # 로컬 모드에서만 드라이버 주소를 localhost로 고정 (클러스터 모드는 executor가 드라이버에 접속해야 함)
+        if self.master_url.startswith('local'):
+            builder = builder \
+                .config("spark.driver.host", "localhost") \
+                .config("spark.driver.bindAddress", "0.0.0.0")
+        
+        for key, value in self._dependency_config().items():
+            builder = builder.config(key, value)
+        
+        spark = builder.getOrCreate()
+        
+        # 로그 레벨 설정 (너무 많은 로그 방지)
+        spark.sparkContext.setLogLevel("WARN")
+        
+        # Java 버전 확인
+        java_version = spark.sparkContext._jvm.System.getProperty("java.version")
+        logger.info(f"SparkSession 초기화 성공! 마스터: {self.master_url}, Java 버전: {java_version}, "
+                    f"소요 시간: {time.time() - start_time:.1f}초")
+        
+        return spark
+    
+    def is_alive(self) -> bool:
+        """SparkContext가 중지되지 않았는지 확인합니다. (작업 실행 없이)"""
+        try:
+            return self.spark is not None and self.spark.sparkContext._jsc is not None
+        except Exception:
+            return False
+    
+    def health_check(self) -> bool:
+        """작은 작업을 실행하여 SparkSession이 정상 동작하는지 확인합니다."""
+        try:
+            if not self.is_alive():
+                return False
+            
+            if self.spark.range(1).count() != 1:
+                return False
+            
+            self.last_health_check = time.time()
+            return True
+        
+        except Exception as e:
+            logger.warning(f"SparkSession 상태 확인 실패: {e}")
+            return False
+    
+    def get_session(self):
+        """
+        SparkSession을 반환합니다. (없거나 중지된 경우 새로 생성)
+        
+        Returns:
+            SparkSession
+        """
+        with self._lock:
+            if not self.is_alive():
+                if self.spark is not None:
+                    logger.warning("중지된 SparkSession 감지 - 다시 생성합니다.")
+                self.spark = self._create_session()
+                self.created_at = time.time()
+            return self.spark
+    
+    def warm_up(self) -> bool:
+        """
+        SparkSession을 미리 생성하고 상태를 확인합니다. (실패 시 한 번 재생성)
+        
+        Returns:
+            bool: warm-up 성공 여부
+        """
+        start_time = time.time()
+        
+        for attempt in range(2):
+            try:
+                self.get_session()
+                if self.health_check():
+                    logger.info(f"🔥 SparkSession warm-up 완료: {time.time() - start_time:.1f}초")
+                    return True
+                
+                logger.warning(f"SparkSession 상태 확인 실패 (시도 {attempt + 1}/2)")
+                self.stop()
+            
+            except Exception as e:
+                logger.error(f"SparkSession warm-up 실패 (시도 {attempt + 1}/2): {e}")
+                self.stop()
+        
+        return False
+    
+    def stop(self):
+        """SparkSession 정리"""
+        with self._lock:
+            if self.spark:
+                try:
+                    self.spark.stop()
+                    logger.info("SparkSession이 정리되었습니다.")
+                except Exception as e:
+                    logger.warning(f"SparkSession 정리 중 오류: {e}")
+                finally:
+                    self.spark = None
+                    self.created_at = None
+                    self.last_health_check = None
+    
+    def get_stats(self) -> Dict:
+        """SparkSession 상태 정보"""
+        return {
+            "master_url": self.master_url,
+            "active": self.is_alive(),
+            "created_at": self.created_at,
+            "last_health_check": self.last_health_check,
+            "local_jars": self._find_local_jars() is not None,
+        }
+
+
+# 전역 SparkSession 매니저 인스턴스
+spark_session_manager = None
+
+def get_spark_session_manager() -> SparkSessionManager:
+    """SparkSession 매니저 인스턴스 반환"""
+    global spark_session_manager
+    if spark_session_manager is None:
+        spark_session_manager = SparkSessionManager()
+    return spark_session_manager
@@ -0,0 +1,58 @@
+"""
+테스트 공통 설정
+앱 모듈은 app 디렉토리를 기준으로 서로 import하므로 경로에 추가합니다.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memory_table_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_workdir(tmp_path, monkeypatch):
+    """캐시/저장소 디렉토리(./csv_cache, ./news_store 등)와 메모리 테이블 캐시를 테스트마다 새로 만듭니다."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(memory_table_cache, "memory_table_cache", None)
+    return tmp_path
+
+
+@pytest.fixture
+def sample_news() -> pd.DataFrame:
+    """
+    BigKinds 형식의 작은 뉴스 프레임
+    부분 문자열 관계인 기관명(삼성/삼성전자/삼성전자우), 겹치는 키워드(반도체/AI반도체),
+    동률 빈도, 여러 날짜 형식과 결측값을 포함합니다.
+    """
+    rows = [
+        # 기관, 일자, 키워드, 제목, URL, 본문
+        ("삼성전자", "20240102", "반도체,메모리,HBM", "삼성 HBM 양산", "u01", "본문1"),
+        ("삼성전자,SK하이닉스", "2024-01-02", "메모리,반도체,D램", "메모리 업황 반등", "u02", "본문2"),
+        ("삼성", "20240103", "갤럭시,스마트폰", "갤럭시 신제품", "u03", "본문3"),
+        ("삼성SDI", "20240103", "배터리,전기차", "배터리 수주", "u04", "본문4"),
+        ("LG전자", "20240103", "가전,AI", "AI 가전", "u05", "본문5"),
+        (np.nan, "20240104", "반도체", "기관 없음", "u06", "본문6"),
+        ("삼성전자", np.nan, "반도체,메모리", "날짜 없음", "u07", "본문7"),
+        ("삼성전자우", "2024-01-04", "배당,우선주,삼성전자우", "우선주 배당", "u08", "본문8"),
+        ("삼성전자", "20240104", "AI반도체,AI,반도체장비", "AI 반도체 투자", "u09", "본문9"),
+        ("SK하이닉스", "20240105", "HBM,메모리", "하이닉스 HBM", "u10", "본문10"),
+        ("삼성전자,LG전자", "2024-01-05", "AI,가전, 반도체 ", "AI 가전 경쟁", "u11", "본문11"),
+        ("삼성전자", "20240106", "파운드리,반도체,삼성전자", "파운드리 수주", "u12", "본문12"),
+        ("삼성전자", "20240101", "반도체,메모리", "기간 밖", "u13", "본문13"),
+        ("삼성전자", "20240105", "HBM,D램,@#,공급망", "HBM 공급", np.nan, "본문14"),
+        ("삼성전자", "2024-01-06", np.nan, np.nan, "u15", "본문15"),
+        ("삼성전자,SK하이닉스", "20240106", "메모리,HBM,D램,반도체", "메모리 3사", "u16", "본문16"),
+    ]
+    return pd.DataFrame(rows, columns=['기관', '일자', '키워드', '제목', 'URL', '본문'])
+
+
+@pytest.fixture
+def sample_shards(sample_news):
+    """sample_news를 여러 파일로 나눈 샤드 (파일 순서대로 이어 붙이면 sample_news)"""
+    return [sample_news.iloc[0:5], sample_news.iloc[5:11], sample_news.iloc[11:]]
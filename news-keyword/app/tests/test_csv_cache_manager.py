@@ -0,0 +1,118 @@
+"""CSV 디스크 캐시 / 메모리 테이블 캐시 테스트"""
+
+import pandas as pd
+
+from csv_cache_manager import CSVCacheManager, FORMAT_IPC, FORMAT_PARQUET
+from memory_table_cache import get_memory_table_cache
+from pandas_analyzer import ANALYSIS_COLUMNS, PandasAnalyzer
+
+SOURCE = "s3a://bucket/news/20240101_20240106.csv"
+
+
+def test_projected_read_is_served_from_memory_on_second_request(sample_news):
+    """분석 경로와 같은 컬럼 선택 조회는 두 번째부터 메모리 캐시에서 읽습니다."""
+    cache = CSVCacheManager(cache_format=FORMAT_PARQUET)
+    assert cache.save_to_cache(SOURCE, sample_news)
+    
+    first = cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS)
+    assert cache.memory_hits == 0
+    
+    second = cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS)
+    assert cache.memory_hits == 1
+    assert second.equals(first)
+    assert list(second.columns) == [c for c in ANALYSIS_COLUMNS if c in sample_news.columns]
+    
+    # 기간/기관 조건이 있는 조회도 같은 컬럼 구성의 메모리 테이블에서 필터링
+    filtered = cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS, start_date="20240103",
+                                     end_date="20240105", company_name="삼성전자")
+    assert cache.memory_hits == 2
+    expected = sample_news[
+        sample_news['기관'].str.contains("삼성전자", na=False, regex=False)
+        & sample_news['일자'].str.replace('-', '').between("20240103", "20240105")
+    ][filtered.columns].reset_index(drop=True)
+    assert filtered.equals(expected)
+
+
+def test_second_identical_request_hits_memory(sample_news, tmp_path):
+    """같은 요청을 두 번 보내면 두 번째 요청은 디스크를 읽지 않고 메모리 테이블 캐시에서 처리됩니다."""
+    csv_path = str(tmp_path / "20240101_20240106.csv")
+    sample_news.to_csv(csv_path, index=False, encoding='utf-8')
+    
+    analyzer = PandasAnalyzer()
+    memory_cache = get_memory_table_cache()
+    
+    first = analyzer.extract_keywords_with_pandas("삼성전자", "20240102", "20240106", 5, [csv_path])
+    hits_before = memory_cache.hits
+    
+    second = analyzer.extract_keywords_with_pandas("삼성전자", "20240102", "20240106", 5, [csv_path])
+    assert memory_cache.hits > hits_before
+    assert second == first
+
+
+def test_hot_entry_is_promoted_to_ipc_on_projected_reads(sample_news):
+    """조회 수가 기준을 넘은 Parquet 항목은 컬럼 선택 조회만으로도 IPC로 변환됩니다."""
+    cache = CSVCacheManager(cache_format="auto")
+    cache.ipc_small_bytes = 0
+    cache.ipc_promote_hits = 2
+    cache.memory_cache.max_bytes = 0  # 매 조회가 디스크를 읽도록
+    assert cache.save_to_cache(SOURCE, sample_news)
+    assert cache._entries[cache._get_cache_key(SOURCE)]["format"] == FORMAT_PARQUET
+    
+    expected = cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS)
+    assert cache.promotions == 0
+    
+    promoted = cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS, start_date="20240102", end_date="20240106")
+    assert cache.promotions == 1
+    entry = cache._entries[cache._get_cache_key(SOURCE)]
+    assert entry["format"] == FORMAT_IPC
+    assert not cache._get_data_path(cache._get_cache_key(SOURCE), FORMAT_PARQUET).exists()
+    
+    # 변환 후에도 원본 행 순서와 조건 결과가 같음
+    assert cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS).equals(expected)
+    assert cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS, start_date="20240102",
+                                 end_date="20240106").equals(promoted)
+
+
+def test_promotion_applies_the_size_budget(sample_news):
+    """변환으로 커진 IPC 파일까지 포함해 용량 한도를 다시 적용합니다. (변환한 항목은 유지)"""
+    cache = CSVCacheManager(cache_format="auto")
+    cache.ipc_small_bytes = 0
+    cache.ipc_promote_hits = 1
+    cache.memory_cache.max_bytes = 0
+    
+    # 반복되는 문자열은 Parquet에서 잘 압축되므로 압축하지 않은 IPC 파일이 더 커짐
+    news = pd.concat([sample_news] * 500, ignore_index=True)
+    other = "s3a://bucket/news/other.csv"
+    assert cache.save_to_cache(other, news)
+    assert cache.save_to_cache(SOURCE, news)
+    
+    # 두 Parquet 항목은 들어가지만, 한쪽이 IPC로 커지면 한도를 넘도록 설정
+    entry = cache._entries[cache._get_cache_key(SOURCE)]
+    cache.max_bytes = entry["table_bytes"] + cache._entries[cache._get_cache_key(other)]["size_bytes"] // 2
+    assert sum(entry["size_bytes"] for entry in cache._entries.values()) <= cache.max_bytes
+    
+    cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS)
+    assert cache.promotions == 1
+    assert cache._get_cache_key(SOURCE) in cache._entries
+    assert cache._get_cache_key(other) not in cache._entries
+    assert sum(entry["size_bytes"] for entry in cache._entries.values()) <= cache.max_bytes
+
+
+def test_legacy_files_without_manifest_are_dropped(sample_news, tmp_path):
+    """매니페스트가 없던 시절의 캐시 파일은 캐시 키와 맞지 않으므로 등록하지 않고 삭제합니다."""
+    cache_dir = tmp_path / "csv_cache"
+    cache_dir.mkdir()
+    legacy = CSVCacheManager(cache_dir=str(cache_dir), cache_format=FORMAT_PARQUET)
+    legacy_path = legacy._get_data_path(legacy._get_cache_key(SOURCE))
+    sample_news.to_parquet(legacy_path)
+    legacy.manifest_path.unlink()
+    
+    cache = CSVCacheManager(cache_dir=str(cache_dir), cache_format=FORMAT_PARQUET)
+    
+    assert not legacy_path.exists()
+    assert cache._entries == {}
+    assert cache.load_from_cache(SOURCE) is None
+    
+    # 새로 저장한 항목은 정상 조회
+    assert cache.save_to_cache(SOURCE, sample_news)
+    assert cache.load_from_cache(SOURCE, columns=ANALYSIS_COLUMNS) is not None
@@ -0,0 +1,72 @@
+"""일별 부분 집계 병합 결과와 PandasAnalyzer 결과 비교 테스트"""
+
+import pytest
+
+from daily_aggregate_store import DailyAggregateStore, iter_date_keys, merge_daily_partials
+from pandas_analyzer import PandasAnalyzer
+
+COMPANY = "삼성전자"
+START_DATE = "20240102"
+END_DATE = "20240106"
+
+
+def _write_shards(sample_shards, tmp_path):
+    """샤드를 파일 키 순서의 CSV 파일로 저장"""
+    csv_files = []
+    for i, shard in enumerate(sample_shards):
+        csv_path = str(tmp_path / f"news_{i}.csv")
+        shard.to_csv(csv_path, index=False, encoding='utf-8')
+        csv_files.append(csv_path)
+    return csv_files
+
+
+def _normalize_articles(articles):
+    return [dict(article, matched_keywords=sorted(article['matched_keywords'])) for article in articles]
+
+
+@pytest.mark.parametrize("top_keywords", [3, 20])
+def test_merged_partials_match_pandas_analyzer(sample_shards, tmp_path, top_keywords):
+    """
+    날짜 구간을 나눠 계산/저장한 일별 집계를 합친 결과가 PandasAnalyzer와 같습니다.
+    (키워드 동률 순서와 기사 동률 순서는 날짜 순이 아니라 원본 파일/행 순서)
+    """
+    csv_files = _write_shards(sample_shards, tmp_path)
+    analyzer = PandasAnalyzer()
+    store = DailyAggregateStore(str(tmp_path / "daily.db"))
+    source_versions = {d: store.make_source_version([]) for d in iter_date_keys(START_DATE, END_DATE)}
+    
+    # 뒤 구간을 먼저 계산해 저장 순서가 날짜 순과 다르게 함
+    for run_start, run_end in [("20240104", END_DATE), (START_DATE, "20240103")]:
+        computed = analyzer.compute_daily_partials(COMPANY, run_start, run_end, csv_files)
+        assert store.save_partials(COMPANY, computed.values(), source_versions)
+    
+    partials = store.get_partials(COMPANY, source_versions)
+    total_count, keywords = merge_daily_partials([partials[d] for d in iter_date_keys(START_DATE, END_DATE)])
+    top_keywords_list = list(keywords)[:top_keywords]
+    candidates = store.select_top_articles(COMPANY, START_DATE, END_DATE, top_keywords_list)
+    articles = analyzer.extract_top_news_articles(candidates, top_keywords_list)
+    
+    expected = analyzer.extract_keywords_with_pandas(COMPANY, START_DATE, END_DATE, top_keywords, csv_files)
+    
+    assert total_count == expected["total_news_count"]
+    assert {str(d): p.news_count for d, p in sorted(partials.items())} == expected["daily_news_count"]
+    assert list(keywords.items()) == list(expected["keywords"].items())
+    assert _normalize_articles(articles) == _normalize_articles(expected["top_news_articles"])
+    
+    # 상위 N개 경계의 동률도 원본 위치 순으로 잘림
+    candidates = store.select_top_articles(COMPANY, START_DATE, END_DATE, top_keywords_list, max_articles=3)
+    assert len(candidates) <= 3
+    articles = analyzer.extract_top_news_articles(candidates, top_keywords_list, max_articles=3)
+    assert _normalize_articles(articles) == _normalize_articles(expected["top_news_articles"][:3])
+
+
+def test_keyword_ties_follow_file_order_not_date_order(sample_shards, tmp_path):
+    """같은 빈도의 키워드는 먼저 나온 날짜가 아니라 원본 파일에서 먼저 나온 순서로 정렬됩니다."""
+    csv_files = _write_shards(sample_shards, tmp_path)
+    partials = PandasAnalyzer().compute_daily_partials(COMPANY, START_DATE, END_DATE, csv_files)
+    _, keywords = merge_daily_partials(list(partials.values()))
+    
+    # 파운드리(01-06)는 공급망(01-05)보다 날짜는 늦지만 마지막 파일에서 먼저 나옴
+    order = list(keywords)
+    assert keywords["파운드리"] == keywords["공급망"] == 1
+    assert order.index("파운드리") < order.index("공급망")
@@ -0,0 +1,100 @@
+"""상위 기사 선택(KeywordMatcher.score_rows / select_top_rows)과 기존 iterrows 구현 비교 테스트"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from keyword_matcher import KeywordMatcher, select_top_rows
+from keyword_utils import explode_keywords
+from pandas_analyzer import PandasAnalyzer
+
+# 겹치는 키워드(반도체 ⊂ AI반도체/반도체장비, AI ⊂ AI반도체), 중복 키워드, 매칭 없는 키워드 포함
+TOP_KEYWORD_LISTS = [
+    ["반도체"],
+    ["반도체", "메모리", "HBM"],
+    ["AI반도체", "반도체", "AI", "D램", "배당"],
+    ["반도체", "반도체", "없는키워드", "가전"],
+    ["HBM", "메모리", "D램", "반도체", "AI", "가전", "배터리", "갤럭시"],
+]
+
+
+def _reference_top_articles(filtered_df, top_keywords_list, max_articles=10):
+    """기존 extract_top_news_articles (행마다 iterrows로 이중 루프)"""
+    if not top_keywords_list:
+        return []
+    
+    articles_with_score = []
+    for idx, row in filtered_df.iterrows():
+        article_keywords = []
+        if pd.notna(row.get('키워드', '')):
+            article_keywords = [k.strip() for k in str(row['키워드']).split(',') if k.strip()]
+        
+        matched_count = 0
+        matched_keywords = []
+        for keyword in top_keywords_list:
+            for article_keyword in article_keywords:
+                if keyword in article_keyword or article_keyword in keyword:
+                    matched_count += 1
+                    matched_keywords.append(keyword)
+                    break
+        
+        if matched_count > 0:
+            title = row.get('제목', '제목 없음')
+            if pd.isna(title):
+                title = '제목 없음'
+            date = row.get('일자', '일자 없음')
+            if pd.isna(date):
+                date = '일자 없음'
+            url = row.get('URL', 'URL 없음')
+            if pd.isna(url):
+                url = 'URL 없음'
+            
+            articles_with_score.append({
+                'title': str(title),
+                'date': str(date),
+                'url': str(url),
+                'matched_keywords_count': matched_count,
+                'matched_keywords': list(set(matched_keywords)),
+                'all_keywords': article_keywords
+            })
+    
+    articles_with_score.sort(key=lambda x: x['matched_keywords_count'], reverse=True)
+    return articles_with_score[:max_articles]
+
+
+def _normalize(articles):
+    return [dict(article, matched_keywords=sorted(article['matched_keywords'])) for article in articles]
+
+
+@pytest.mark.parametrize("top_keywords_list", TOP_KEYWORD_LISTS)
+@pytest.mark.parametrize("max_articles", [1, 3, 10, 100])
+def test_top_articles_match_iterrows_loop(sample_news, top_keywords_list, max_articles):
+    """상위 기사와 점수, 동률 순서가 기존 구현과 같습니다."""
+    expected = _reference_top_articles(sample_news, top_keywords_list, max_articles)
+    actual = PandasAnalyzer().extract_top_news_articles(sample_news, top_keywords_list, max_articles)
+    
+    assert _normalize(actual) == _normalize(expected)
+
+
+@pytest.mark.parametrize("top_keywords_list", TOP_KEYWORD_LISTS)
+def test_score_rows_matches_pairwise_count(sample_news, top_keywords_list):
+    """행별 매칭 개수가 (상위 키워드마다 기사 키워드 하나라도 양방향 포함이면 1) 합과 같습니다."""
+    tokens = explode_keywords(sample_news['키워드'].reset_index(drop=True))
+    counts, _, _ = KeywordMatcher(top_keywords_list).score_rows(tokens, len(sample_news))
+    
+    expected = []
+    for value in sample_news['키워드']:
+        article_keywords = [] if pd.isna(value) else [k.strip() for k in str(value).split(',') if k.strip()]
+        expected.append(sum(
+            any(keyword in ak or ak in keyword for ak in article_keywords) for keyword in top_keywords_list
+        ))
+    assert counts.tolist() == expected
+
+
+def test_select_top_rows_matches_stable_sort():
+    """개수 내림차순, 동률은 앞선 행 우선(안정 정렬 후 자르기)이며 개수 0인 행은 제외합니다."""
+    rng = np.random.default_rng(0)
+    counts = rng.integers(0, 4, size=200)
+    for limit in (0, 1, 5, 37, 200, 500):
+        expected = [i for i in sorted(range(len(counts)), key=lambda i: -counts[i]) if counts[i] > 0][:limit]
+        assert select_top_rows(counts, limit) == expected
@@ -0,0 +1,45 @@
+"""멀티프로세스 엔진과 PandasAnalyzer 결과 비교 테스트"""
+
+import pytest
+
+from multiprocess_analyzer import MultiprocessAnalyzer
+from pandas_analyzer import PandasAnalyzer
+
+START_DATE = "20240102"
+END_DATE = "20240106"
+
+
+def _normalize(articles):
+    return [dict(article, matched_keywords=sorted(article['matched_keywords'])) for article in articles]
+
+
+@pytest.fixture
+def shard_files(sample_shards, tmp_path):
+    """샤드를 파일 키 순서의 CSV 파일로 저장"""
+    csv_files = []
+    for i, shard in enumerate(sample_shards):
+        csv_path = str(tmp_path / f"news_{i}.csv")
+        shard.to_csv(csv_path, index=False, encoding='utf-8')
+        csv_files.append(csv_path)
+    return csv_files
+
+
+@pytest.fixture
+def multiprocess_analyzer():
+    """워커 1개 프로세스 풀 (테스트가 끝나면 정리)"""
+    analyzer = MultiprocessAnalyzer(max_workers=1, pandas_analyzer=PandasAnalyzer())
+    yield analyzer
+    analyzer.shutdown()
+
+
+@pytest.mark.parametrize("company_name", ["삼성전자", "SK하이닉스", "없는기업"])
+def test_multiprocess_matches_pandas(multiprocess_analyzer, shard_files, company_name):
+    """여러 샤드를 워커에서 나눠 계산해 병합한 결과가 한 번에 처리한 PandasAnalyzer 결과와 같습니다."""
+    expected = PandasAnalyzer().extract_keywords_with_pandas(company_name, START_DATE, END_DATE, 3, shard_files)
+    actual = multiprocess_analyzer.extract_keywords_multiprocess(company_name, START_DATE, END_DATE, 3, shard_files)
+    
+    for key in ("total_news_count", "daily_news_count"):
+        assert actual[key] == expected[key]
+    assert list(actual["keywords"].items()) == list(expected["keywords"].items())
+    
+    assert _normalize(actual.get("top_news_articles", [])) == _normalize(expected.get("top_news_articles", []))
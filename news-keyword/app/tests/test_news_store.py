@@ -0,0 +1,60 @@
+"""뉴스 저장소 용량 한도 / 정리 테스트"""
+
+import os
+import time
+
+from news_store import NewsStore, UNCACHEABLE_TRACK_SIZE
+
+
+def _ingest(store, name, df):
+    source = f"s3a://bucket/news/{name}.csv"
+    assert store.ingest(source, df)
+    return source
+
+
+def test_store_evicts_least_recently_loaded_dataset(sample_news):
+    """용량 한도를 넘으면 가장 오래 조회하지 않은 데이터셋부터 제거합니다."""
+    store = NewsStore(max_bytes=0, idle_days=0)
+    first = _ingest(store, "first", sample_news)
+    entry_bytes = store.get_manifest(first)['size_bytes']
+    assert entry_bytes > 0
+    
+    store.max_bytes = entry_bytes * 2 + entry_bytes // 2
+    second = _ingest(store, "second", sample_news)
+    
+    # first를 더 최근에 조회
+    past = time.time() - 60
+    os.utime(store._get_entry_dir(first) / "manifest.json", (past, past))
+    os.utime(store._get_entry_dir(second) / "manifest.json", (past - 60, past - 60))
+    assert store.load(first, "20240101", "20240106") is not None
+    
+    third = _ingest(store, "third", sample_news)
+    assert store.is_ingested(first)
+    assert not store.is_ingested(second)
+    assert store.is_ingested(third)
+    assert store.evictions == 1
+
+
+def test_store_removes_idle_datasets(sample_news):
+    """오래 조회하지 않은 데이터셋은 다음 인제스트 때 제거합니다."""
+    store = NewsStore(max_bytes=0, idle_days=1)
+    idle = _ingest(store, "idle", sample_news)
+    past = time.time() - 2 * 24 * 3600
+    os.utime(store._get_entry_dir(idle) / "manifest.json", (past, past))
+    
+    fresh = _ingest(store, "fresh", sample_news)
+    assert not store.is_ingested(idle)
+    assert store.is_ingested(fresh)
+
+
+def test_uncacheable_tracking_is_bounded(sample_news):
+    """메모리 캐시 한도보다 큰 데이터셋 기록은 최근 UNCACHEABLE_TRACK_SIZE개만 유지합니다."""
+    store = NewsStore(max_bytes=0, idle_days=0)
+    store.memory_cache.max_bytes = 1
+    source = _ingest(store, "large", sample_news)
+    
+    for i in range(UNCACHEABLE_TRACK_SIZE + 10):
+        store._uncacheable[f"old-{i}"] = float(i)
+    assert store.load(source, "20240101", "20240106") is not None
+    assert len(store._uncacheable) == UNCACHEABLE_TRACK_SIZE
+    assert store._get_store_key(source) in store._uncacheable
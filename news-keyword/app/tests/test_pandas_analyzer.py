@@ -0,0 +1,91 @@
+"""PandasAnalyzer 기업 분할/날짜 필터 테스트"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from date_utils import DATE_FORMATS, DATE_KEY_COLUMN, to_date_key
+from pandas_analyzer import PandasAnalyzer
+
+# 서로 부분 문자열인 기업명(삼성 ⊂ 삼성전자 ⊂ 삼성전자우) 포함
+COMPANY_NAMES = ["삼성", "삼성전자", "삼성전자우", "SK하이닉스", "LG전자", "전자", "없는기업"]
+
+
+@pytest.mark.parametrize("company_names", [COMPANY_NAMES, ["삼성전자"], ["삼성전자우", "삼성"], []])
+def test_partition_by_company_matches_str_contains(sample_news, company_names):
+    """기관 컬럼 한 번의 순회로 나눈 기업별 행이 기업별 str.contains 결과와 같습니다."""
+    orgs = pd.concat([sample_news['기관'], pd.Series([None, 123, "", "삼성전자우선주"])], ignore_index=True)
+    
+    rows = PandasAnalyzer().partition_by_company(orgs, company_names)
+    
+    assert list(rows) == company_names
+    for company_name in company_names:
+        expected = np.flatnonzero(orgs.notna() & orgs.str.contains(company_name, na=False, regex=False))
+        assert rows[company_name].tolist() == expected.tolist()
+
+
+def _reference_date_filter(df, start_date, end_date, date_column='일자'):
+    """기존 apply_date_filter (행마다 strptime으로 형식을 순서대로 시도)"""
+    def parse_date(value):
+        if pd.isna(value):
+            return None
+        value = str(value).strip()
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+        return None
+    
+    parsed = df[date_column].apply(parse_date)
+    start_dt = datetime.strptime(start_date, "%Y%m%d")
+    end_dt = datetime.strptime(end_date, "%Y%m%d")
+    mask = parsed.notna() & parsed.apply(lambda d: d is not None and start_dt <= d <= end_dt)
+    return df[mask]
+
+
+# 종료일에 시각이 있는 값은 기존 구현이 종료일 0시와 비교해 제외하던 경우라 비교 대상에서 뺌
+# (현재는 종료일 전체를 포함, test_date_filter_includes_whole_end_day 참고)
+MIXED_DATES = [
+    "20240102", "2024-01-02", "2024/01/03", "2024.01.04", " 20240105 ", "2024-01-03 10:30:00",
+    "2024/01/03 23:59:59", np.nan, None, "", "날짜 아님", "20241301", "20231231", "2024-01-07", 20240104, "20240106",
+]
+
+
+@pytest.mark.parametrize("dates", [
+    MIXED_DATES,
+    # 감지 형식(YYYY-MM-DD)이 앞쪽 샘플과 다른 행이 섞인 경우
+    ["2024-01-02"] * 5 + ["20240103", "2024/01/04", np.nan, "20240106", "2024-01-08"],
+    # YYYYMMDD 위주에 YYYY-MM-DD 행이 섞인 경우
+    ["20240102"] * 5 + ["2024-01-05", np.nan, "20240101", "2024-01-06"],
+    [np.nan, None],
+])
+@pytest.mark.parametrize("date_range", [("20240102", "20240106"), ("20240104", "20240104")])
+def test_date_filter_matches_row_parser(dates, date_range):
+    """혼합 형식/결측 날짜에서도 걸러지는 행이 기존 행 단위 파서와 같습니다."""
+    df = pd.DataFrame({'일자': pd.Series(dates, dtype=object), '키워드': [f"k{i}" for i in range(len(dates))]})
+    df.index = df.index * 10  # 위치가 아닌 원래 인덱스가 유지되는지 확인
+    
+    expected = _reference_date_filter(df, *date_range)
+    actual = PandasAnalyzer().apply_date_filter(df, *date_range)
+    
+    pd.testing.assert_frame_equal(actual.drop(columns=[DATE_KEY_COLUMN], errors='ignore'), expected)
+
+
+def test_to_date_key_parses_mixed_formats():
+    """형식이 섞인 값도 각 행의 형식으로 YYYYMMDD 정수가 되고, 파싱할 수 없는 값은 결측입니다."""
+    values = pd.Series(["20240102", "2024-01-03", "2024/01/04", "2024.01.05", "2024-01-06 09:00:00",
+                        np.nan, "날짜 아님", 20240107], dtype=object)
+    
+    assert to_date_key(values).tolist() == [20240102, 20240103, 20240104, 20240105, 20240106, pd.NA, pd.NA, 20240107]
+
+
+def test_date_filter_includes_whole_end_day():
+    """종료일의 시각이 있는 뉴스도 날짜 단위로 비교해 포함합니다."""
+    df = pd.DataFrame({'일자': ["2024-01-04 00:00:00", "2024-01-04 23:59:59", "2024-01-05 00:00:00"]})
+    
+    actual = PandasAnalyzer().apply_date_filter(df, "20240104", "20240104")
+    
+    assert actual['일자'].tolist() == ["2024-01-04 00:00:00", "2024-01-04 23:59:59"]
@@ -0,0 +1,41 @@
+"""Spark 엔진 BigKinds 스키마 테스트 (pyspark 없이 확인 가능한 부분)"""
+
+import csv
+import os
+
+import pandas as pd
+
+from news_store import STORE_COLUMNS
+from spark_analyzer import BIGKINDS_COLUMNS, SCHEMA_MISMATCH_MESSAGE, is_schema_mismatch
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "bigkinds_sample.csv")
+
+
+def test_bigkinds_columns_match_export_header():
+    """선언된 스키마가 BigKinds 내보내기 CSV 헤더(19개 컬럼)와 순서까지 같습니다."""
+    with open(FIXTURE_PATH, encoding='utf-8', newline='') as f:
+        header = next(csv.reader(f))
+    
+    assert len(BIGKINDS_COLUMNS) == 19
+    assert header == BIGKINDS_COLUMNS
+
+
+def test_fixture_rows_fit_the_schema():
+    """여러 줄 본문과 따옴표가 있어도 모든 행이 19개 컬럼으로 읽히고 분석 컬럼이 모두 있습니다."""
+    df = pd.read_csv(FIXTURE_PATH, dtype=str, encoding='utf-8')
+    
+    assert list(df.columns) == BIGKINDS_COLUMNS
+    assert len(df) == 2
+    assert df['기관'].tolist() == ["삼성전자,SK하이닉스", "LG전자"]
+    assert set(STORE_COLUMNS) <= set(BIGKINDS_COLUMNS)
+
+
+def test_schema_mismatch_error_is_detected():
+    """헤더 불일치 오류(enforceSchema=false)는 구분하고, 다른 오류는 구분하지 않습니다."""
+    spark_error = RuntimeError(
+        f"java.lang.IllegalArgumentException: {SCHEMA_MISMATCH_MESSAGE}.\n"
+        " Header: 뉴스 식별자, 일자, 언론사\n Schema: 뉴스 식별자, 일자, 언론사, 기고자\n"
+    )
+    
+    assert is_schema_mismatch(spark_error)
+    assert not is_schema_mismatch(RuntimeError("Path does not exist: s3a://bucket/news.csv"))
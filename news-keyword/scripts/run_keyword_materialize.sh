@@ -0,0 +1,38 @@
+#!/usr/bin/env bash
+
+# 뉴스 키워드 야간 사전 계산 스크립트 (뉴스 수집 후 실행)
+# 사용: bash scripts/run_keyword_materialize.sh [--date YYYYMMDD]
+# 환경변수로 조정 가능:
+#   KEYWORD_API_SERVICE (기본: keyword-api)  # app/docker-compose.yml 서비스명
+#   MATERIALIZE_WINDOWS (기본: 1,7,30)
+#   MATERIALIZE_TOP_KEYWORDS (기본: 20)
+
+set -Eeuo pipefail
+IFS=$'\n\t'
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "${SCRIPT_DIR}/.." && pwd)"
+APP_DIR="${PROJECT_ROOT}/app"
+KEYWORD_API_SERVICE="${KEYWORD_API_SERVICE:-keyword-api}"
+
+cd "${APP_DIR}" || exit 1
+
+# docker compose 명령(v1/v2 호환)
+if command -v docker-compose >/dev/null 2>&1; then
+  DC="docker-compose"
+else
+  DC="docker compose"
+fi
+
+echo "[INFO] 서비스: ${KEYWORD_API_SERVICE}"
+echo "[INFO] 기간: ${MATERIALIZE_WINDOWS:-1,7,30}"
+
+# API와 같은 컨테이너에서 실행해 결과 캐시/일별 집계 DB를 공유
+$DC exec -T \
+  -e MATERIALIZE_WINDOWS="${MATERIALIZE_WINDOWS:-1,7,30}" \
+  -e MATERIALIZE_TOP_KEYWORDS="${MATERIALIZE_TOP_KEYWORDS:-20}" \
+  "${KEYWORD_API_SERVICE}" python keyword_materializer.py "$@"
+
+echo "[INFO] 완료"
+
+exit 0
@@ -56,6 +56,11 @@ batch_last_run_success ${success}
 batch_runs_total 1
 EOF
 
+# 수집 성공 시 뉴스 키워드 야간 사전 계산 (실패해도 수집 결과에는 영향 없음)
+if [ $status -eq 0 ] && [ "${MATERIALIZE_KEYWORDS:-true}" = "true" ]; then
+  bash "${SCRIPT_DIR}/run_keyword_materialize.sh" || echo "[WARN] 키워드 사전 계산 실패"
+fi
+
 # 실행 후 downloads 디렉토리 정리
 if [[ -d "${NEWS_CRAWL_DIR}/downloads" ]]; then
   # 내부 파일/폴더만 삭제하고 디렉토리는 유지